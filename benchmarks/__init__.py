@@ -0,0 +1 @@
+#Benchmarks and the synthetic Snowflake they (and the tests) run on, not imported by the app unless IGLOO_SYNTHETIC is set
@@ -0,0 +1,78 @@
+#Micro-benchmark for utils/ddl_parser.py on very large view/dynamic table DDLs
+#Run from the repo root: python benchmarks/bench_ddl_parser.py [--columns 1000 10000 50000] [--json out.json]
+import os
+import sys
+import json
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.ddl_parser import tokenize, parse_ddl
+
+
+def build_ddl(n_columns):
+    #Realistic-ish GET_DDL output: casts, function calls, literals with commas/parens, comments, a join
+    header = ",\n\t".join(f"COL_{i}" for i in range(n_columns))
+    items = []
+    for i in range(n_columns):
+        if i % 4 == 0:
+            items.append(f"LEFT(SRC_{i}, 2)::VARCHAR(10) AS COL_{i}")
+        elif i % 4 == 1:
+            items.append(f"COALESCE(SRC_{i}, 'n/a, (none)')::VARCHAR AS COL_{i} /* keep, FROM here */")
+        elif i % 4 == 2:
+            items.append(f"EXTRACT(YEAR FROM SRC_{i})::NUMBER(38,0) AS COL_{i}")
+        else:
+            items.append(f"SRC_{i}::NUMBER(38,0)")
+    projection = ",\n\t".join(items)
+    return (
+        f"create or replace dynamic table BENCH_DT(\n\t{header}\n) target_lag = '1 minute' refresh_mode = AUTO "
+        f"initialize = ON_CREATE warehouse = COMPUTE_WH\n as SELECT\n\t{projection}\n"
+        f"FROM ANALYTICS.BIG_SOURCE s LEFT JOIN ANALYTICS.LOOKUP l ON s.ID = l.ID\nWHERE s.ID IN (SELECT ID FROM ANALYTICS.FILTER);"
+    )
+
+
+def time_it(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the DDL tokenizer/parser")
+    parser.add_argument("--columns", type=int, nargs="+", default=[100, 1000, 10000, 50000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args()
+
+    results = []
+    for n_columns in args.columns:
+        ddl = build_ddl(n_columns)
+        tokenize_s = time_it(lambda: tokenize(ddl), args.repeat)
+        parse_s = time_it(lambda: parse_ddl(ddl), args.repeat)
+
+        definition = parse_ddl(ddl)
+        assert len(definition.projection) == n_columns
+        assert definition.warehouse == "COMPUTE_WH"
+
+        mb = len(ddl) / 1_000_000
+        results.append({
+            "columns": n_columns,
+            "ddl_bytes": len(ddl),
+            "tokenize_s": round(tokenize_s, 5),
+            "parse_s": round(parse_s, 5),
+            "parse_mb_per_s": round(mb / parse_s, 2) if parse_s else None,
+        })
+        print(f"{n_columns:>7} cols  {len(ddl):>10} bytes  tokenize {tokenize_s * 1000:9.2f} ms  parse {parse_s * 1000:9.2f} ms  ({results[-1]['parse_mb_per_s']} MB/s)")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"benchmark": "ddl_parser", "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
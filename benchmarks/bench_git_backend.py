@@ -0,0 +1,59 @@
+#Offline benchmark of the Git backends with utils/git_manager.py::LocalGitBackend
+#Compares one commit per file (the old push_to_github behaviour) with one commit for the whole batch
+#Run from the repo root: python benchmarks/bench_git_backend.py [--files 10 100 500] [--json out.json]
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.git_manager import LocalGitBackend
+
+
+def make_files(n_files):
+    return {
+        f"snowflake_objects/analytics/view/view_{i}.sql": f"CREATE OR REPLACE VIEW ANALYTICS.VIEW_{i}(\n\tID\n)\nAS SELECT\n\tID::NUMBER\nFROM ANALYTICS.SRC_{i};"
+        for i in range(n_files)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-file commits vs one batch commit")
+    parser.add_argument("--files", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args()
+
+    results = []
+    for n_files in args.files:
+        files = make_files(n_files)
+        with tempfile.TemporaryDirectory() as tmp:
+            per_file = LocalGitBackend(os.path.join(tmp, "per_file.git"))
+            started = time.perf_counter()
+            for path, content in files.items():
+                per_file.commit_files({path: content}, f"Deploy {path}")
+            per_file_s = time.perf_counter() - started
+
+            batch = LocalGitBackend(os.path.join(tmp, "batch.git"))
+            started = time.perf_counter()
+            message = batch.commit_files(files, "Batch deploy")
+            batch_s = time.perf_counter() - started
+            assert message.startswith("Success!"), message
+
+        results.append({
+            "files": n_files,
+            "per_file_commits_s": round(per_file_s, 4),
+            "single_commit_s": round(batch_s, 4),
+            "speedup": round(per_file_s / batch_s, 1) if batch_s else None,
+        })
+        print(f"{n_files:>5} files  per-file {per_file_s:8.3f} s  single commit {batch_s:8.3f} s  ({results[-1]['speedup']}x)")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"benchmark": "git_backend", "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
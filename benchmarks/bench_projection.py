@@ -0,0 +1,136 @@
+#Projection (select list + column list) from the editors' grid DataFrame: the old iterrows loop vs projection_specs over
+#to_dict('records') vs projection_frame_specs (vectorized cleaning) vs the SQL built over whole columns with no ColumnSpecs
+#('frame_sql', what the editors ran before the models held specs), on wide grids (about a third of the columns transformed/renamed)
+#'rerun' is a whole rerun with an unchanged grid: specs + create_ddl, which returns the memoized DDL
+#Run from the repo root: python benchmarks/bench_projection.py [--columns 100 1000 5000] [--repeat 20] [--json out.json]
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.ddl_builder import projection_rows, projection_specs, projection_frame_specs
+from models.column_spec import select_list_sql, column_names_sql
+from models.view import View
+from benchmarks.synthetic_provider import COLUMN_TYPES
+
+
+def make_grid(n_columns):
+    #The grid the modify editors start from, then edited: every 3rd column gets a rule, every 5th a new name
+    #(no blank row: in a DataFrame it's NaN, which the old loop took for a column name)
+    source_cols = [(f"COL_{j:05d}", COLUMN_TYPES[j % len(COLUMN_TYPES)][0], "Y") for j in range(n_columns)]
+    rows = projection_rows(source_cols)
+    for j, row in enumerate(rows):
+        if j % 3 == 0:
+            row["transformation"] = f"UPPER({row['src_col_nm']})"
+        if j % 5 == 0:
+            row["new_col_nm"] = f"{row['src_col_nm']}_NEW"
+    return pd.DataFrame(rows)
+
+
+def iterrows_sql(editor_result):
+    #The loop the view/dynamic table editors used to run
+    col_definitions = []
+    col_names_only = []
+    for index, row in editor_result.iterrows():
+        if row["src_col_nm"]:
+            rule = row['transformation'] if row['transformation'] else row['src_col_nm']
+            if rule != row["new_col_nm"]:
+                col_str = f"{rule}::{row['data_type']} AS {row['new_col_nm']}"
+            else:
+                col_str = f"{row['src_col_nm']}::{row['data_type']}"
+            col_definitions.append(col_str)
+            col_names_only.append(row["new_col_nm"])
+    return ",\n\t".join(col_definitions), ",\n\t".join(col_names_only)
+
+
+def frame_sql(editor_result):
+    #The whole-column builder the editors used before the models held ColumnSpecs: no per-row Python, but no specs either
+    src, new, transformation, data_type = (
+        editor_result[key].fillna("").astype(str) for key in ("src_col_nm", "new_col_nm", "transformation", "data_type")
+    )
+    keep = src != ""
+    rule = transformation.where(transformation != "", src)
+    cast = "::" + data_type
+    col_definitions = (rule + cast + " AS " + new).where(rule != new, src + cast)
+    return ",\n\t".join(col_definitions[keep]), ",\n\t".join(new[keep])
+
+
+def render(columns):
+    return select_list_sql(columns), column_names_sql(columns)
+
+
+VARIANTS = {
+    "iterrows": iterrows_sql,
+    "records": lambda frame: render(projection_specs(frame.to_dict("records"))),
+    "vectorized": lambda frame: render(projection_frame_specs(frame)),
+    "frame_sql": frame_sql,
+}
+
+
+def rerun(frame):
+    return View("BENCH", "GRID", projection_frame_specs(frame), "BENCH.SOURCE").create_ddl()
+
+
+def best_of(function, frame, repeat):
+    #Best wall time of `repeat` runs (least disturbed by the rest of the machine)
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function(frame)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the projection builders on wide editor grids")
+    parser.add_argument("--columns", type=int, nargs="+", default=[100, 1000, 5000], help="grid rows (source columns)")
+    parser.add_argument("--repeat", type=int, default=20, help="runs per variant, the best one counts")
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args()
+
+    results = []
+    for n_columns in args.columns:
+        frame = make_grid(n_columns)
+        timings = {}
+        outputs = {}
+        for name, function in VARIANTS.items():
+            timings[name], outputs[name] = best_of(function, frame, args.repeat)
+        #All variants must build the same SQL, a faster wrong answer is no answer
+        for name, output in outputs.items():
+            if output != outputs["iterrows"]:
+                raise SystemExit(f"{name} differs from iterrows at {n_columns} columns")
+
+        rerun(frame) #renders once, the timed runs get the memoized DDL
+        timings["rerun"], _ = best_of(rerun, frame, args.repeat)
+
+        baseline = timings["iterrows"]
+        for name, seconds in timings.items():
+            results.append({
+                "columns": n_columns, "variant": name, "ms": round(seconds * 1000, 3),
+                "speedup": round(baseline / seconds, 1) if seconds else None,
+            })
+        print(f"{n_columns:>6} columns  " + "  ".join(
+            f"{name} {seconds * 1000:.2f}ms (x{baseline / seconds:.1f})" for name, seconds in timings.items()
+        ))
+
+    if args.json:
+        report = {
+            "meta": {
+                "python": platform.python_version(), "pandas": pd.__version__, "platform": platform.platform(),
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "args": vars(args),
+            },
+            "results": results,
+        }
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+#End-to-end benchmark of the metadata layer on a synthetic catalog (benchmarks/synthetic_provider.py), no Snowflake needed
+#Times catalog browsing (per mode, cold + warm), DDL parsing (get_transform/get_source), editor row building, DDL generation
+#the dependency graph (bulk load from ACCOUNT_USAGE / parsed definitions, "who depends on this" lookups)
+#and loading every definition of a schema: GET_DDL per object vs one GET_DDL('SCHEMA')
+#Run from the repo root: python benchmarks/bench_provider.py [--scales 10 1000 10000] [--latency 0.02] [--json out.json]
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic_provider import SyntheticCatalog, SyntheticDataProvider, SyntheticSession
+from utils.dependency_graph import DependencyGraph
+from utils.ddl_builder import projection_rows, projection_specs
+from models.dynamic_table import DynamicTable
+from models.view import View
+
+
+def spread(items, n):
+    #n items evenly spread over the list (all of them if n >= len)
+    if n >= len(items):
+        return list(items)
+    step = len(items) / n
+    return [items[int(k * step)] for k in range(n)]
+
+
+def bench_browse(catalog, catalog_mode, latency, jitter, sample):
+    #What the Modify page does: schemas, tables (all/normal/dynamic) and views of every schema, then columns of some objects
+    provider = SyntheticDataProvider(catalog, latency=latency, jitter=jitter, catalog_mode=catalog_mode)
+    objects = spread(sorted(catalog.objects.items()), sample)
+
+    def browse():
+        for schema in provider.get_schemas(catalog.database):
+            for obj_type in ("all", "normal", "dynamic"):
+                provider.get_tables(schema, obj_type)
+            provider.get_views(schema)
+        for (schema, name), obj_type in objects:
+            provider.get_columns(schema, name, obj_type)
+
+    started = time.perf_counter()
+    browse()
+    cold = time.perf_counter() - started
+    cold_queries = provider.session.queries
+
+    provider.session.reset_stats()
+    started = time.perf_counter()
+    browse()
+    warm = time.perf_counter() - started
+
+    return {
+        "catalog_mode": catalog_mode or "none", "objects_described": len(objects),
+        "cold_seconds": round(cold, 4), "cold_queries": cold_queries,
+        "warm_seconds": round(warm, 4), "warm_queries": provider.session.queries,
+    }
+
+
+def bench_definitions(catalog, sample):
+    #CPU side only (no latency): GET_DDL + parse, editor rows, DDL generation for views/dynamic tables
+    provider = SyntheticDataProvider(catalog)
+    objects = spread(sorted(item for item in catalog.objects.items() if item[1] != "Table"), sample)
+    if not objects:
+        return None
+
+    started = time.perf_counter()
+    for (schema, name), obj_type in objects:
+        provider.get_transform(schema, name, obj_type)
+        provider.get_source(schema, name, obj_type)
+    parse_s = time.perf_counter() - started
+
+    #Columns + definitions are cached now, this times only the row building
+    inputs = [
+        (schema, name, obj_type, provider.get_columns(schema, name, obj_type), provider.get_object_definition(schema, name, obj_type))
+        for (schema, name), obj_type in objects
+    ]
+    started = time.perf_counter()
+    all_rows = [projection_rows(columns, definition["transformations"]) for _, _, _, columns, definition in inputs]
+    rows_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for (schema, name, obj_type, _, definition), rows in zip(inputs, all_rows):
+        columns = projection_specs(rows)
+        source_object = ".".join(definition["source"])
+        if obj_type == "View":
+            View(schema, name, columns, source_object).create_ddl()
+        else:
+            DynamicTable(schema, name, columns, source_object, definition["warehouse"], definition["target_lag"]).create_ddl()
+    generate_s = time.perf_counter() - started
+
+    count = len(objects)
+    return {
+        "objects": count,
+        "parse_seconds": round(parse_s, 4), "parse_ms_per_object": round(parse_s / count * 1000, 3),
+        "rows_seconds": round(rows_s, 4), "rows_ms_per_object": round(rows_s / count * 1000, 3),
+        "generate_seconds": round(generate_s, 4), "generate_ms_per_object": round(generate_s / count * 1000, 3),
+    }
+
+
+def bench_dependencies(catalog, sample):
+    #Bulk load both ways, then transitive up + downstream of a spread of objects (what the modify page panel asks)
+    result = {}
+    for source, account_usage in (("account_usage", True), ("ddl", False)):
+        graph = DependencyGraph(catalog.database)
+        started = time.perf_counter()
+        stats = graph.load(SyntheticSession(catalog, account_usage=account_usage))
+        result[f"{source}_load_seconds"] = round(time.perf_counter() - started, 4)
+    result["edges"] = stats["edges"]
+
+    nodes = [graph.node(schema, name) for schema, name in spread(sorted(catalog.objects), sample)]
+    started = time.perf_counter()
+    for node in nodes:
+        graph.transitive_downstream(node)
+        graph.transitive_upstream(node)
+    lookup_s = time.perf_counter() - started
+    result["lookup_ms_per_object"] = round(lookup_s / len(nodes) * 1000, 4)
+
+    started = time.perf_counter()
+    result["cycles"] = len(graph.cycles())
+    result["cycles_seconds"] = round(time.perf_counter() - started, 4)
+    return result
+
+
+def bench_schema_ddl(catalog, latency, jitter):
+    #All definitions of the first schema, round trips are what matters here
+    schema = catalog.schemas[0]
+    objects = [(name, obj_type) for obj_type in ("Table", "View", "Dynamic Table") for name in catalog.names(schema, obj_type)]
+    result = {"objects": len(objects)}
+
+    for mode in ("per_object", "bulk"):
+        provider = SyntheticDataProvider(catalog, latency=latency, jitter=jitter)
+        started = time.perf_counter()
+        if mode == "bulk":
+            provider.get_schema_ddls(schema)
+        for name, obj_type in objects:
+            provider.get_ddl(schema, name, obj_type)
+        result[f"{mode}_seconds"] = round(time.perf_counter() - started, 4)
+        result[f"{mode}_queries"] = provider.session.queries
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the data provider on a synthetic catalog")
+    parser.add_argument("--scales", type=int, nargs="+", default=[10, 1000, 10000], help="total objects in the catalog")
+    parser.add_argument("--columns", type=int, default=20, help="columns per object")
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds per query (browsing only)")
+    parser.add_argument("--jitter", type=float, default=0.01, help="extra random seconds per query (browsing only)")
+    parser.add_argument("--browse-sample", type=int, default=200, help="objects whose columns are fetched while browsing")
+    parser.add_argument("--sample", type=int, default=1000, help="views/dynamic tables parsed and generated")
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args()
+
+    results = []
+    for scale in args.scales:
+        catalog = SyntheticCatalog.for_scale(scale, columns=args.columns)
+        for catalog_mode in (None, "schema", "database"):
+            browse = bench_browse(catalog, catalog_mode, args.latency, args.jitter, args.browse_sample)
+            results.append({"scale": scale, "benchmark": "browse", **browse})
+            print(f"{scale:>6} objects  browse[{browse['catalog_mode']:>8}]  cold {browse['cold_seconds']:.3f}s "
+                  f"({browse['cold_queries']} queries)  warm {browse['warm_seconds']:.4f}s ({browse['warm_queries']} queries)")
+
+        definitions = bench_definitions(catalog, args.sample)
+        if definitions:
+            results.append({"scale": scale, "benchmark": "definitions", **definitions})
+            print(f"{scale:>6} objects  parse {definitions['parse_ms_per_object']:.3f}ms  rows {definitions['rows_ms_per_object']:.3f}ms  "
+                  f"generate {definitions['generate_ms_per_object']:.3f}ms per object ({definitions['objects']} objects)")
+
+        schema_ddl = bench_schema_ddl(catalog, args.latency, args.jitter)
+        results.append({"scale": scale, "benchmark": "schema_ddl", **schema_ddl})
+        print(f"{scale:>6} objects  definitions of one schema ({schema_ddl['objects']} objects): "
+              f"per object {schema_ddl['per_object_seconds']:.3f}s ({schema_ddl['per_object_queries']} queries)  "
+              f"GET_DDL('SCHEMA') {schema_ddl['bulk_seconds']:.3f}s ({schema_ddl['bulk_queries']} queries)")
+
+        dependencies = bench_dependencies(catalog, args.sample)
+        results.append({"scale": scale, "benchmark": "dependencies", **dependencies})
+        print(f"{scale:>6} objects  dependencies: load {dependencies['account_usage_load_seconds']:.3f}s (account usage) / "
+              f"{dependencies['ddl_load_seconds']:.3f}s (parsed)  lookup {dependencies['lookup_ms_per_object']:.4f}ms  "
+              f"cycles {dependencies['cycles_seconds']:.3f}s ({dependencies['edges']} edges)")
+
+    if args.json:
+        report = {
+            "meta": {
+                "python": platform.python_version(), "platform": platform.platform(),
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "args": vars(args),
+            },
+            "results": results,
+        }
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,493 @@
+"""
+Synthetic Snowflake for load testing: a generated catalog of any size behind a fake session that answers
+the exact SQL RealDataProvider/CatalogSnapshot send (SHOW, DESCRIBE, GET_DDL, INFORMATION_SCHEMA), with injected latency.
+SyntheticDataProvider is a RealDataProvider on top of it, so caching, catalog snapshots and parsing run the real code paths.
+"""
+import re
+import json
+import time
+import random
+import threading
+from datetime import datetime, timezone, timedelta
+
+from utils.data_provider import RealDataProvider
+from utils.query_profiler import instrument
+from utils.disk_cache import DiskCache
+
+
+#(DESCRIBE type, INFORMATION_SCHEMA DATA_TYPE, length, precision, scale, datetime precision), cycled over the columns
+COLUMN_TYPES = (
+    ("NUMBER(38,0)", "NUMBER", None, 38, 0, None),
+    ("VARCHAR(16777216)", "TEXT", 16777216, None, None, None),
+    ("TIMESTAMP_NTZ(9)", "TIMESTAMP_NTZ", None, None, None, 9),
+    ("FLOAT", "FLOAT", None, None, None, None),
+    ("VARCHAR(100)", "TEXT", 100, None, None, None),
+    ("BOOLEAN", "BOOLEAN", None, None, None, None),
+    ("DATE", "DATE", None, None, None, None),
+    ("NUMBER(12,2)", "NUMBER", None, 12, 2, None),
+)
+
+
+class SyntheticSqlError(Exception):
+    pass
+
+
+class SyntheticCatalog:
+    """
+    Deterministic catalog: every schema has tables, views and dynamic tables (split by view_ratio/dynamic_ratio).
+    Views and dynamic tables select from a table of their schema, about a third of their columns are transformations.
+    touch()/drop()/add() change it like a deploy would (LAST_ALTERED moves), to exercise incremental refreshes.
+    """
+
+    CREATED = datetime(2024, 1, 1, tzinfo=timezone.utc) #LAST_ALTERED of every object that was never touched
+
+    def __init__(self, schemas=3, objects_per_schema=10, columns=8, view_ratio=0.25, dynamic_ratio=0.15, database="SYNTHETIC_DB"):
+        self.database = database
+        self.columns_per_object = columns
+        self.schemas = [f"SCHEMA_{s:03d}" for s in range(schemas)]
+        self.objects = {} #(SCHEMA, NAME) -> 'Table' | 'View' | 'Dynamic Table'
+        self.altered = {} #(SCHEMA, NAME) -> LAST_ALTERED, only for touched/added objects
+        self._by_schema = {}
+
+        n_views = int(objects_per_schema * view_ratio)
+        n_dynamic = int(objects_per_schema * dynamic_ratio)
+        n_tables = max(1, objects_per_schema - n_views - n_dynamic)
+        for schema in self.schemas:
+            names = {"Table": [], "View": [], "Dynamic Table": []}
+            for obj_type, prefix, count in (("Table", "TBL", n_tables), ("View", "VW", n_views), ("Dynamic Table", "DT", n_dynamic)):
+                for i in range(count):
+                    name = f"{prefix}_{i:05d}"
+                    names[obj_type].append(name)
+                    self.objects[(schema, name)] = obj_type
+            self._by_schema[schema] = names
+        self._n_tables = n_tables
+
+    @classmethod
+    def for_scale(cls, n_objects, columns=20, objects_per_schema=500):
+        #n_objects in total, spread over schemas of at most objects_per_schema
+        schemas = max(1, -(-n_objects // objects_per_schema))
+        return cls(schemas=schemas, objects_per_schema=max(1, n_objects // schemas), columns=columns)
+
+    def last_altered(self, schema, name):
+        return self.altered.get((schema, name), self.CREATED)
+
+    def touch(self, schema, name):
+        self.type_of(schema, name)
+        self.altered[(schema, name)] = datetime.now(timezone.utc)
+
+    def drop(self, schema, name):
+        obj_type = self.type_of(schema, name)
+        del self.objects[(schema, name)]
+        self.altered.pop((schema, name), None)
+        self._by_schema[schema][obj_type].remove(name)
+
+    def add(self, schema, obj_type):
+        prefix = {"Table": "TBL", "View": "VW", "Dynamic Table": "DT"}[obj_type]
+        names = self._by_schema[schema][obj_type]
+        name = f"{prefix}_{int(names[-1].rsplit('_', 1)[1]) + 1 if names else 0:05d}"
+        names.append(name)
+        self.objects[(schema, name)] = obj_type
+        self.altered[(schema, name)] = datetime.now(timezone.utc)
+        return name
+
+    def names(self, schema, obj_type):
+        return list(self._by_schema[schema][obj_type])
+
+    def type_of(self, schema, name):
+        obj_type = self.objects.get((schema.upper(), name.upper()))
+        if obj_type is None:
+            raise SyntheticSqlError(f"Object '{schema}.{name}' does not exist or not authorized.")
+        return obj_type
+
+    def columns(self, schema, name):
+        #[(name, COLUMN_TYPES entry)], the same list for an object and its source, so the projections line up
+        self.type_of(schema, name)
+        return [(f"COL_{j:04d}", COLUMN_TYPES[j % len(COLUMN_TYPES)]) for j in range(self.columns_per_object)]
+
+    def source_of(self, schema, name):
+        index = int(name.rsplit("_", 1)[1])
+        return schema, f"TBL_{index % self._n_tables:05d}"
+
+    def ddl(self, schema, name):
+        obj_type = self.type_of(schema, name)
+        columns = self.columns(schema, name)
+        if obj_type == "Table":
+            body = ",\n\t".join(f"{col} {types[0]}" for col, types in columns)
+            return f"create or replace TABLE {name} (\n\t{body}\n);"
+
+        header = ",\n\t".join(col for col, _ in columns)
+        items = []
+        for j, (col, types) in enumerate(columns):
+            describe_type = types[0]
+            if j % 3 != 0:
+                items.append(f"{col}::{describe_type}")
+            elif types[1] == "TEXT":
+                items.append(f"LEFT(TRIM({col}), 10)::{describe_type} AS {col}")
+            elif types[1] in ("NUMBER", "FLOAT"):
+                items.append(f"COALESCE({col}, 0)::{describe_type} AS {col}")
+            else:
+                items.append(f"IFF({col} IS NULL, NULL, {col})::{describe_type} AS {col}")
+        projection = ",\n\t".join(items)
+        source_schema, source_name = self.source_of(schema, name)
+
+        if obj_type == "View":
+            return f"create or replace view {schema}.{name}(\n\t{header}\n) as SELECT\n\t{projection}\nFROM {source_schema}.{source_name};"
+        return (
+            f"create or replace dynamic table {name}(\n\t{header}\n) target_lag = '1 minute' refresh_mode = AUTO "
+            f"initialize = ON_CREATE warehouse = COMPUTE_WH\n as SELECT\n\t{projection}\nFROM {source_schema}.{source_name};"
+        )
+
+
+class _Row(dict):
+    #Snowpark Rows answer row["NAME"] and row[0]
+    def __getitem__(self, key):
+        if isinstance(key, int):
+            return list(self.values())[key]
+        return dict.__getitem__(self, key)
+
+
+class SyntheticSession:
+    """
+    Answers sql(...).collect() from a SyntheticCatalog.
+    Every query sleeps latency + uniform(0, jitter) seconds, like a round trip to Snowflake.
+    """
+
+    def __init__(self, catalog, latency=0.0, jitter=0.0, seed=0, account_usage=True):
+        self.catalog = catalog
+        self.latency = latency
+        self.jitter = jitter
+        self.account_usage = account_usage #False: the role can't read SNOWFLAKE.ACCOUNT_USAGE
+        self.queries = 0
+        self.query_seconds = 0.0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def get_current_account(self):
+        return "SYNTHETIC"
+
+    def get_current_role(self):
+        return "SYNTHETIC_ROLE"
+
+    def get_current_database(self):
+        return self.catalog.database
+
+    def sql(self, query):
+        return _SyntheticQuery(self, query)
+
+    def reset_stats(self):
+        with self._lock:
+            self.queries = 0
+            self.query_seconds = 0.0
+
+    def _wait(self):
+        with self._lock:
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+            self.queries += 1
+            self.query_seconds += delay
+        if delay:
+            time.sleep(delay)
+
+    def _answer(self, query):
+        catalog = self.catalog
+        text = " ".join(query.split())
+        upper = text.upper()
+
+        if upper.startswith("SHOW SCHEMAS"):
+            return [_Row(name=schema) for schema in ["INFORMATION_SCHEMA", "PUBLIC", *catalog.schemas]]
+
+        if upper.startswith("SHOW DYNAMIC TABLES IN DATABASE"):
+            return [
+                _Row(name=name, schema_name=schema, text=catalog.ddl(schema, name))
+                for schema in catalog.schemas for name in catalog.names(schema, "Dynamic Table")
+            ]
+
+        match = re.match(r"SHOW (TABLES|DYNAMIC TABLES|VIEWS) IN SCHEMA (\w+)", upper)
+        if match:
+            kind, schema = match.groups()
+            _check_schema(catalog, schema)
+            if kind == "VIEWS":
+                names = catalog.names(schema, "View")
+            elif kind == "DYNAMIC TABLES":
+                names = catalog.names(schema, "Dynamic Table")
+            else:
+                names = sorted(catalog.names(schema, "Table") + catalog.names(schema, "Dynamic Table"))
+            return [_Row(name=name) for name in names]
+
+        match = re.match(r"DESCRIBE (?:TABLE|VIEW) (\w+)\.(\w+)", upper)
+        if match:
+            return [_Row(name=col, type=types[0], **{"null?": "Y"}) for col, types in catalog.columns(*match.groups())]
+
+        match = re.match(r"SELECT GET_DDL\('SCHEMA', '(\w+)'", upper)
+        if match:
+            schema = match.group(1)
+            _check_schema(catalog, schema)
+            objects = [name for obj_type in ("Table", "View", "Dynamic Table") for name in catalog.names(schema, obj_type)]
+            return [_Row(DDL="\n\n".join([f"create or replace schema {schema};"] + [catalog.ddl(schema, name) for name in objects]))]
+
+        match = re.match(r"SELECT GET_DDL\('(\w+)', '(\w+)\.(\w+)'\)", upper)
+        if match:
+            return [_Row(DDL=catalog.ddl(match.group(2), match.group(3)))]
+
+        if "ACCOUNT_USAGE.OBJECT_DEPENDENCIES" in upper:
+            if not self.account_usage:
+                raise SyntheticSqlError("Object 'SNOWFLAKE.ACCOUNT_USAGE.OBJECT_DEPENDENCIES' does not exist or not authorized.")
+            domains = {"View": "VIEW", "Dynamic Table": "DYNAMIC TABLE"}
+            return [
+                _Row(REFERENCING_SCHEMA=schema, REFERENCING_OBJECT_NAME=name, REFERENCING_OBJECT_DOMAIN=domains[obj_type],
+                     REFERENCED_DATABASE=catalog.database, REFERENCED_SCHEMA=source_schema, REFERENCED_OBJECT_NAME=source_name,
+                     REFERENCED_OBJECT_DOMAIN="TABLE")
+                for (schema, name), obj_type in catalog.objects.items() if obj_type != "Table"
+                for source_schema, source_name in [catalog.source_of(schema, name)]
+            ]
+
+        if "INFORMATION_SCHEMA.VIEWS" in upper:
+            return [
+                _Row(TABLE_SCHEMA=schema, TABLE_NAME=name, VIEW_DEFINITION=catalog.ddl(schema, name))
+                for schema in catalog.schemas for name in catalog.names(schema, "View")
+            ]
+
+        if "INFORMATION_SCHEMA.TABLES" in upper:
+            return [
+                _Row(TABLE_SCHEMA=schema, TABLE_NAME=name, TABLE_TYPE="VIEW" if obj_type == "View" else "BASE TABLE",
+                     IS_DYNAMIC="YES" if obj_type == "Dynamic Table" else "NO", LAST_ALTERED=catalog.last_altered(schema, name))
+                for schema, name, obj_type in _information_schema_objects(catalog, upper)
+            ]
+
+        if "INFORMATION_SCHEMA.COLUMNS" in upper:
+            return [
+                _Row(TABLE_SCHEMA=schema, TABLE_NAME=name, COLUMN_NAME=col, DATA_TYPE=types[1], IS_NULLABLE="YES",
+                     CHARACTER_MAXIMUM_LENGTH=types[2], NUMERIC_PRECISION=types[3], NUMERIC_SCALE=types[4], DATETIME_PRECISION=types[5])
+                for schema, name, _ in _information_schema_objects(catalog, upper)
+                for col, types in catalog.columns(schema, name)
+            ]
+
+        if "DYNAMIC_TABLE_REFRESH_HISTORY" in upper:
+            start = int(re.search(r"DATA_TIMESTAMP_START => TO_TIMESTAMP_LTZ\((\d+)\)", upper).group(1))
+            end = int(re.search(r"DATA_TIMESTAMP_END => TO_TIMESTAMP_LTZ\((\d+)\)", upper).group(1))
+            limit = int(re.search(r"RESULT_LIMIT => (\d+)", upper).group(1))
+            return _refresh_history(catalog, start, end)[:limit]
+
+        if upper.startswith("EXPLAIN USING JSON"):
+            return [_Row(content=json.dumps(_synthetic_plan(catalog, query)))]
+
+        if upper.startswith("SELECT 1"):
+            return [_Row(**{"1": 1})]
+
+        raise SyntheticSqlError(f"Synthetic session can't answer: {text[:80]}")
+
+
+class _SyntheticQuery:
+    def __init__(self, session, query):
+        self.session = session
+        self.query = query
+
+    def collect(self, statement_params=None):
+        self.session._wait()
+        return self.session._answer(self.query)
+
+    def to_pandas_batches(self, statement_params=None):
+        #Source previews (utils/source_preview.py): generated rows in PREVIEW_BATCH_ROWS batches, like Arrow result chunks
+        import pandas as pd
+        self.session._wait()
+        data = _preview_data(self.session.catalog, self.query)
+        n_rows = len(next(iter(data.values()))) if data else 0
+        for start in range(0, n_rows, PREVIEW_BATCH_ROWS):
+            yield pd.DataFrame({name: values[start:start + PREVIEW_BATCH_ROWS] for name, values in data.items()})
+
+
+def _refresh_history(catalog, start, end):
+    #Hourly refreshes per dynamic table with a data timestamp in [start, end) (epoch seconds): mostly incremental,
+    #every 12th a full one, some skipped (NO_DATA), a few failures. Seeded per table and hour, any window reads the same refreshes
+    #Durations grow with the table number, so the dashboard has clear credit burners
+    rows = []
+    for schema in catalog.schemas:
+        for name in sorted(catalog.names(schema, "Dynamic Table")):
+            index = int(name.rsplit("_", 1)[1])
+            base = 2 + index % 40
+            for hour in range(-(-start // 3600), -(-end // 3600)):
+                rng = random.Random(index * 1000003 + hour)
+                data_ts = datetime.fromtimestamp(hour * 3600, tz=timezone.utc)
+                roll = rng.random()
+                action = "FULL" if hour % 12 == 0 else "NO_DATA" if roll < 0.2 else "INCREMENTAL"
+                state = "FAILED" if roll > 0.98 else "SUCCEEDED"
+                duration = 0.3 if action == "NO_DATA" else base * (8 if action == "FULL" else 1) * rng.uniform(0.6, 1.8)
+                refresh_start = data_ts + timedelta(seconds=rng.uniform(1, 20))
+                changed = 0 if action == "NO_DATA" else int(rng.uniform(0.5, 1.5) * (index % 7 + 1) * 1000)
+                rows.append(_Row(
+                    SCHEMA_NAME=schema, NAME=name, STATE=state, STATE_MESSAGE="Synthetic failure" if state == "FAILED" else "",
+                    REFRESH_ACTION=action, REFRESH_TRIGGER="SCHEDULED", DATA_TIMESTAMP=data_ts, REFRESH_START_TIME=refresh_start,
+                    REFRESH_END_TIME=refresh_start + timedelta(seconds=duration), COMPLETION_TARGET=data_ts + timedelta(seconds=60),
+                    STATISTICS=json.dumps({"numInsertedRows": changed, "numDeletedRows": changed // 10}),
+                    TARGET_LAG_SEC=60, TARGET_LAG_TYPE="USER_DEFINED", REFRESH_MODE="INCREMENTAL",
+                ))
+    return rows
+
+
+#Enough of Snowflake's compiler for the validation tests: unknown types and columns fail with the line they're on
+_KNOWN_TYPES = {
+    "NUMBER", "DECIMAL", "NUMERIC", "INT", "INTEGER", "BIGINT", "SMALLINT", "FLOAT", "DOUBLE", "REAL", "VARCHAR", "STRING",
+    "TEXT", "CHAR", "BOOLEAN", "DATE", "TIME", "TIMESTAMP", "TIMESTAMP_NTZ", "TIMESTAMP_LTZ", "TIMESTAMP_TZ",
+    "VARIANT", "OBJECT", "ARRAY", "BINARY", "GEOGRAPHY",
+}
+_SQL_WORDS = {"NULL", "IS", "NOT", "AND", "OR", "AS", "CASE", "WHEN", "THEN", "ELSE", "END", "TRUE", "FALSE", "SELECT", "DISTINCT", "IN", "LIKE"}
+
+
+def _compile_check(catalog, query, sources):
+    #Raises like Snowflake: 'SQL compilation error: error line L at position P\ninvalid identifier 'X''
+    select_part = re.split(r"\bFROM\b", query, maxsplit=1, flags=re.IGNORECASE)[0]
+    known_columns = {column for schema, name in sources for column, _ in catalog.columns(schema, name)}
+    for line_no, line in enumerate(select_part.split("\n"), start=1):
+        text = re.sub(r"'[^']*'", lambda m: " " * len(m.group(0)), line) #no words inside string literals
+        for match in re.finditer(r"(::|\bAS\s+)?\b([A-Za-z_]\w*)\b(\s*\()?", text):
+            cast, word, call = match.groups()
+            word = word.upper()
+            if cast:
+                #'x::TYPE' or 'CAST(x AS TYPE)' (the AS right before the closing paren), 'AS alias' is no type
+                if cast == "::" or re.match(r"\s*(\([\d, ]*\))?\s*\)", text[match.end(2):]):
+                    if word not in _KNOWN_TYPES:
+                        raise SyntheticSqlError(
+                            f"SQL compilation error: error line {line_no} at position {match.start(2)}\nUnsupported data type '{word}'."
+                        )
+                continue
+            if call or word in _SQL_WORDS or word in _KNOWN_TYPES:
+                continue
+            if sources and word not in known_columns:
+                raise SyntheticSqlError(
+                    f"SQL compilation error: error line {line_no} at position {match.start(2)}\ninvalid identifier '{word}'"
+                )
+
+
+def _synthetic_plan(catalog, query):
+    #Every source is scanned whole (no filters in generated views), partition counts vary per table
+    operations = [{"id": 0, "operation": "Result"}]
+    stats = {"partitionsTotal": 0, "partitionsAssigned": 0, "bytesAssigned": 0}
+    sources = [(schema.upper(), name.upper()) for schema, name in re.findall(r"(?:FROM|JOIN) (\w+)\.(\w+)", query, re.IGNORECASE)]
+    for schema, name in sources:
+        catalog.type_of(schema, name)
+    _compile_check(catalog, re.sub(r"^\s*EXPLAIN USING JSON ", "", query, flags=re.IGNORECASE), sources) #same line on line 1
+    for schema, name in sources:
+        partitions = 20 + (int(name.rsplit("_", 1)[1]) * 37) % 400
+        size = partitions * 16 * 1024 * 1024
+        operations.append({
+            "id": len(operations), "parentOperators": [0], "operation": "TableScan",
+            "objects": [f"{catalog.database}.{schema}.{name}"],
+            "partitionsTotal": partitions, "partitionsAssigned": partitions, "bytesAssigned": size,
+        })
+        for key, value in (("partitionsTotal", partitions), ("partitionsAssigned", partitions), ("bytesAssigned", size)):
+            stats[key] += value
+    return {"GlobalStats": stats, "Operations": [operations]}
+
+
+PREVIEW_BATCH_ROWS = 64
+
+#FROM SCHEMA.NAME SAMPLE (n ROWS) | LIMIT n, raw rows or wrapped in the transformed select list
+_PREVIEW_SOURCE_RE = re.compile(r"FROM (\w+)\.(\w+) (?:SAMPLE \((\d+) ROWS\)|LIMIT (\d+))", re.IGNORECASE)
+_PREVIEW_ITEM_RE = re.compile(r"^(.*?)::[\w(), ]+? AS (\w+)$", re.DOTALL)
+
+
+def _preview_value(data_type, row):
+    #Deterministic values per INFORMATION_SCHEMA DATA_TYPE
+    if data_type == "NUMBER":
+        return row
+    if data_type == "FLOAT":
+        return row * 0.5
+    if data_type == "BOOLEAN":
+        return row % 2 == 0
+    if data_type == "DATE":
+        return (datetime(2024, 1, 1) + timedelta(days=row)).date()
+    if data_type == "TIMESTAMP_NTZ":
+        return datetime(2024, 1, 1) + timedelta(minutes=row)
+    return f"VALUE_{row:05d}"
+
+
+def _preview_data(catalog, query):
+    match = _PREVIEW_SOURCE_RE.search(query)
+    if not match:
+        raise SyntheticSqlError(f"Synthetic session can't stream: {' '.join(query.split())[:80]}")
+    schema, name = match.group(1).upper(), match.group(2).upper()
+    n_rows = int(match.group(3) or match.group(4))
+    source = {
+        column: [_preview_value(types[1], row) for row in range(n_rows)]
+        for column, types in catalog.columns(schema, name)
+    }
+    select_list = query.split("FROM", 1)[0].strip()[len("SELECT"):].strip()
+    if select_list == "*":
+        return source
+
+    #Transformed preview: bare columns keep their values, expressions show as text over the first column they read
+    data = {}
+    for item in re.split(r",\s*\n", select_list):
+        item_match = _PREVIEW_ITEM_RE.match(item.strip())
+        if not item_match:
+            raise SyntheticSqlError(f"SQL compilation error: syntax error near '{item.strip()[:40]}'")
+        expression, alias = item_match.groups()
+        identifiers = [word.upper() for word in re.findall(r"[A-Za-z_]\w*", expression) if word.upper() in source]
+        if not identifiers:
+            raise SyntheticSqlError(f"SQL compilation error: invalid identifier in '{expression.strip()[:40]}'")
+        values = source[identifiers[0]]
+        data[alias.upper()] = values if expression.strip().upper() == identifiers[0] else [f"{expression.strip()}({value})" for value in values]
+    return data
+
+
+def _check_schema(catalog, schema):
+    if schema not in catalog.schemas:
+        raise SyntheticSqlError(f"Schema '{schema}' does not exist or not authorized.")
+
+
+#(TABLE_SCHEMA = '..' [AND LAST_ALTERED >= '..'::TIMESTAMP_LTZ] [AND TABLE_NAME IN (..)]) groups of the incremental refresh
+_FILTER_GROUP_RE = re.compile(
+    r"\(TABLE_SCHEMA = '(\w+)'(?: AND LAST_ALTERED >= '([^']+)'::TIMESTAMP_LTZ)?(?: AND TABLE_NAME IN \(([^)]*)\))?\)"
+)
+
+
+def _information_schema_objects(catalog, upper_query):
+    #Honours the optional AND TABLE_SCHEMA = '...' filter of the catalog queries (or the refresh's OR-ed groups), same ORDER BY schema, name
+    groups = _FILTER_GROUP_RE.findall(upper_query)
+    if not groups:
+        match = re.search(r"TABLE_SCHEMA = '(\w+)'", upper_query)
+        groups = [(match.group(1), "", "")] if match else [(schema, "", "") for schema in catalog.schemas]
+
+    for schema, since, names_in in sorted(groups):
+        if schema not in catalog.schemas:
+            continue
+        since = datetime.fromisoformat(since) if since else None
+        wanted = set(re.findall(r"'(\w+)'", names_in)) if names_in else None
+        names = sorted(
+            (name, obj_type) for obj_type in ("Table", "View", "Dynamic Table") for name in catalog.names(schema, obj_type)
+        )
+        for name, obj_type in names:
+            if wanted is not None and name not in wanted:
+                continue
+            if since is not None and catalog.last_altered(schema, name) < since:
+                continue
+            yield schema, name, obj_type
+
+
+class SyntheticDataProvider(RealDataProvider):
+    """RealDataProvider over a SyntheticSession: same caching/catalog code, no Snowflake."""
+
+    def __init__(self, catalog, latency=0.0, jitter=0.0, catalog_mode=None, disk_cache=None):
+        super().__init__(catalog_mode=catalog_mode, disk_cache=disk_cache)
+        self.synthetic_session = SyntheticSession(catalog, latency=latency, jitter=jitter)
+
+    @property
+    def session(self):
+        #Profiled like a real session, so the query panel works on the synthetic catalog too
+        return instrument(self.synthetic_session)
+
+
+def from_spec(spec):
+    """
+    Provider from a 'key=value,...' string, e.g. IGLOO_SYNTHETIC="objects=1000,columns=50,latency=0.05,jitter=0.02,catalog=schema"
+    Keys: objects, columns, latency, jitter, catalog (None/schema/database), disk (path of a persistent cache file)
+    """
+    options = dict(part.split("=", 1) for part in spec.split(",") if "=" in part)
+    catalog = SyntheticCatalog.for_scale(int(options.get("objects", 100)), columns=int(options.get("columns", 20)))
+    catalog_mode = options.get("catalog", "schema")
+    return SyntheticDataProvider(
+        catalog,
+        latency=float(options.get("latency", 0.0)),
+        jitter=float(options.get("jitter", 0.0)),
+        catalog_mode=None if catalog_mode in ("", "none", "None") else catalog_mode,
+        disk_cache=DiskCache(options["disk"]) if options.get("disk") else None,
+    )
@@ -0,0 +1,153 @@
+import streamlit as st
+from utils.snowflake_connector import get_session
+from utils.data_provider import get_data_provider
+from utils.change_detection import check_changes, fetch_deployed_ddls, fetch_git_contents
+from utils.ddl_parser import identifier_key
+from utils.deploy_engine import DeployItem, deploy_batch, build_graph, topological_waves, DEFAULT_MAX_WORKERS
+from utils.ddl_builder import object_file_path
+
+
+def batch_deploy():
+    st.markdown("### Batch Deploy")
+    st.markdown("Objects queued with **Add to batch** are deployed together: in dependency order, independent objects in parallel.")
+
+    batch = st.session_state.get("deploy_batch", {})
+    if not batch:
+        st.info("The batch is empty. Design an object on the Create/Modify pages and press 'Add to batch'.")
+        return None
+
+    items = [
+        DeployItem(obj["schema"], obj["name"], obj["obj_type"], obj["ddl"], obj["commitmsg"], obj.get("deploy_sql"))
+        for obj in batch.values()
+    ]
+
+    #PLAN
+    with st.container(border=True):
+        st.markdown("#### 1. Deployment Plan")
+        graph = build_graph(items)
+        waves, cycle = topological_waves(graph)
+
+        wave_of = {name: wave_no for wave_no, wave in enumerate(waves, start=1) for name in wave}
+        st.dataframe(
+            [
+                {
+                    "Object": item.fq_name,
+                    "Type": item.obj_type,
+                    "Wave": wave_of.get(item.fq_name),
+                    "Depends on (in batch)": ", ".join(sorted(graph[item.fq_name])),
+                }
+                for item in items
+            ],
+            use_container_width=True,
+        )
+        st.caption(f"{len(items)} objects in {len(waves)} waves.")
+        if cycle:
+            st.warning(f"Dependency cycle, these objects won't be deployed: {', '.join(sorted(cycle))}")
+
+        c1, c2 = st.columns([1, 4])
+        with c1:
+            if st.button("Clear batch", key="batch_clear_btn"):
+                st.session_state["deploy_batch"] = {}
+                st.rerun()
+        with c2:
+            to_remove = st.multiselect("Remove from batch", list(batch.keys()), key="batch_remove")
+            if to_remove and st.button("Remove selected", key="batch_remove_btn"):
+                for name in to_remove:
+                    batch.pop(name, None)
+                st.rerun()
+
+
+    #VALIDATE
+    with st.container(border=True):
+        st.markdown("#### 2. Validate")
+        st.caption("Compiles every object without creating anything (EXPLAIN), all at once. Unchanged definitions are answered from the cache.")
+        if st.button("Validate batch", key="batch_validate_btn"):
+            provider = get_data_provider()
+            with st.spinner(f"Compiling {len(items)} objects..."):
+                results = provider.validate_ddls(items)
+
+            invalid = [result for result in results if result["status"] == "invalid"]
+            if invalid:
+                st.error(f"{len(invalid)} of {len(results)} objects don't compile.")
+                #Row/column = the editor grid row that caused it, when the error could be traced back
+                st.dataframe(
+                    [
+                        {"Object": result["name"], "Type": result["obj_type"], "Grid row": result["row"],
+                         "Column": result["column"], "Error": result["error"]}
+                        for result in invalid
+                    ],
+                    use_container_width=True,
+                    hide_index=True,
+                )
+            else:
+                st.success(f"All {len(results)} objects compile.")
+            compiled = [result for result in results if not result["cached"]]
+            st.caption(f"{len(compiled)} compiled ({sum(result['seconds'] for result in compiled):.1f}s of query time), "
+                       f"{len(results) - len(compiled)} from the cache.")
+
+
+    #DEPLOY
+    with st.container(border=True):
+        st.markdown("#### 3. Deploy")
+        max_workers = st.slider("Parallel deployments", min_value=1, max_value=16, value=DEFAULT_MAX_WORKERS,
+                                help="How many independent objects run at the same time")
+        commitmsg = st.text_input("Commit message", value="Batch deploy", key="batch_commitmsg")
+
+        if st.button("Deploy batch to Snowflake", type="primary", key="batch_deploy_btn"):
+            session = get_session()
+            if not session:
+                st.error("No active Snowflake connection found. Check your connection settings.")
+                return None
+
+            #No-op detection: same normalized hash as GET_DDL -> not executed, same as the Git file -> not committed
+            #One GET_DDL per schema and the Git reads in parallel, not 2 round trips per object
+            with st.spinner("Comparing with the deployed definitions..."):
+                provider = get_data_provider()
+                deployed = fetch_deployed_ddls(provider, items)
+                git_paths = {item.fq_name: object_file_path(item.schema, item.obj_type, item.name) for item in items}
+                git_contents = fetch_git_contents(git_paths.values())
+                changes = {
+                    item.fq_name: check_changes(
+                        item.ddl,
+                        deployed_ddl=deployed[(identifier_key(item.schema), identifier_key(item.name))],
+                        git_content=git_contents[git_paths[item.fq_name]],
+                    )
+                    for item in items
+                }
+            unchanged = {name for name, change in changes.items() if not change["snowflake_changed"]}
+            unchanged |= {item.fq_name for item in items if item.deploy_sql is not None and not item.deploy_sql.strip()}
+
+            with st.spinner(f"Deploying {len(items) - len(unchanged)} objects..."):
+                results = deploy_batch(session, items, max_workers=max_workers, unchanged=unchanged)
+
+            succeeded = [item for item, result in zip(items, results) if result["status"] in ("success", "unchanged")]
+            for item, result in zip(items, results):
+                if result["status"] == "success":
+                    provider.invalidate(item.schema, item.name, item.obj_type)
+
+            failed = [result for result in results if result["status"] not in ("success", "unchanged")]
+            if failed:
+                st.error(f"{len(failed)} of {len(results)} objects were not deployed.")
+            else:
+                st.success(f"All {len(results)} objects deployed ({len(unchanged)} skipped as unchanged).")
+            st.dataframe(results, use_container_width=True)
+
+            #Git push of what actually got deployed, as one commit (files Git already has are left out)
+            to_commit = [item for item in succeeded if changes[item.fq_name]["git_changed"]]
+            if to_commit:
+                with st.spinner("Pushing to GitHub..."):
+                    from utils.git_manager import push_files
+                    git_result = push_files(
+                        {object_file_path(item.schema, item.obj_type, item.name): item.ddl for item in to_commit},
+                        commitmsg,
+                    )
+                    if "Success!" in git_result:
+                        st.success(git_result)
+                    else:
+                        st.error(git_result)
+
+            #Keep only what still has to be deployed
+            for item in succeeded:
+                batch.pop(f"{item.schema}.{item.name}".upper(), None)
+
+    return None
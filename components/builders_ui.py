@@ -1,6 +1,4 @@
 import streamlit as st
-import pandas as pd
-from utils.snowflake_connector import get_session
 from utils.data_provider import get_data_provider
 from components.table_editor import create_table
 from components.table_editor import modify_table
@@ -9,14 +7,16 @@ from components.view_editor import modify_view
 from components.dynamictable_editor import create_dynamic_table
 from components.dynamictable_editor import modify_dynamic_table
 from components.deploy_ui import display_deploy_button
+from components.dependency_ui import display_dependencies
+from components.plan_check_ui import display_plan_check
+from components.dt_monitor_ui import display_refresh_performance
 
 
 
-session = get_session()
-database = session.get_current_database()
 provider = get_data_provider()
 
 def create_object():
+    database = provider.session.get_current_database() #connect only when the page is actually rendered
     st.markdown("### Create new object")
     st.markdown("Configure your new Snowflake object below.")
 
@@ -89,6 +89,8 @@ def create_object():
         st.markdown("#### Review & Deploy")
         
         st.code(final_ddl, language='sql')
+        #Scan cost of the SELECT (EXPLAIN), flags full scans before they're deployed
+        display_plan_check(final_ddl, obj_type)
         commitmsg = st.text_input("Commit message", value="Commit msg")
         #Deployment Button
         display_deploy_button(final_ddl,target_schema,obj_type,target_name,commitmsg)
@@ -100,6 +102,7 @@ def create_object():
 
 
 def modify_object():
+    database = provider.session.get_current_database()
     st.markdown("### Modify an existing object")
     st.markdown("Configure your Snowflake object below.")
 
@@ -123,23 +126,29 @@ def modify_object():
             elif obj_type == "Dynamic Table":
                 object_name = st.selectbox("Select Object", provider.get_tables(selected_schema, 'dynamic'))
 
+        #Impact of the change before designing it
+        display_dependencies(selected_schema, object_name)
+        if obj_type == "Dynamic Table":
+            #How it refreshes today (durations, lag misses), same data as the Dynamic Table Monitor page
+            display_refresh_performance(selected_schema, object_name)
     
     
     #EDITORS:
     st.subheader(f"Design {obj_type} Columns")
     
     final_ddl = None # Initialize variable
+    migration = None #Tables/dynamic tables are changed with ALTERs where possible, final_ddl is then only the definition that goes to Git
 
     if obj_type == 'Table':
         
-        final_ddl = modify_table(selected_schema, object_name)
+        final_ddl, migration = modify_table(selected_schema, object_name)
 
     if obj_type == 'View':
         
         final_ddl = modify_view(selected_schema, object_name)
 
     if obj_type == 'Dynamic Table':
-        final_ddl = modify_dynamic_table(selected_schema, object_name)
+        final_ddl, migration = modify_dynamic_table(selected_schema, object_name)
 
 
     
@@ -151,10 +160,29 @@ def modify_object():
         st.divider()
         st.markdown("#### Review & Deploy")
         
-        st.code(final_ddl, language='sql')
+        if migration is not None and migration.mode != "replace":
+            if migration.mode == "none":
+                st.info("No changes, nothing to run in Snowflake.")
+            else:
+                st.caption("In place (metadata only) migration:" if migration.mode == "alter"
+                           else f"Rebuild (copy + SWAP WITH) needed because: {'; '.join(migration.reasons)}")
+                st.code(migration.sql(), language='sql')
+            for warning in migration.warnings:
+                st.warning(warning)
+            with st.expander("New definition (committed to Git)"):
+                st.code(final_ddl, language='sql')
+        else:
+            #View, or a dynamic table whose query changed: the full CREATE OR REPLACE is what runs
+            st.code(final_ddl, language='sql')
+            for warning in (migration.warnings if migration is not None else []):
+                st.warning(warning)
+
+        #Scan cost of the SELECT (EXPLAIN), flags full scans before they're deployed
+        display_plan_check(final_ddl, obj_type)
         
         commitmsg = st.text_input("Commit message", value="Commit msg")
         #Deployment Button
-        display_deploy_button(final_ddl,selected_schema,obj_type,object_name,commitmsg)
+        deploy_sql = migration.sql() if migration is not None and migration.mode != "replace" else None
+        display_deploy_button(final_ddl,selected_schema,obj_type,object_name,commitmsg,deploy_sql=deploy_sql)
     
     return None
\ No newline at end of file
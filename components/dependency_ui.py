@@ -0,0 +1,59 @@
+import time
+import streamlit as st
+from utils.data_provider import get_data_provider
+
+
+provider = get_data_provider()
+
+
+def display_dependencies(schema_name, obj_name):
+    #"Who depends on this": impact of changing the object, straight from the in-memory graph (no query per object)
+    if not obj_name:
+        return None
+
+    with st.expander("Who depends on this?"):
+        #Expander bodies always run: indexing the whole database waits until asked for once, after that the graph is in memory
+        if not st.session_state.get("dependencies_on"):
+            st.caption("Indexes the dependencies of every view and dynamic table in the database once, then answers from memory.")
+            if st.button("Load dependencies", key="dependencies_load"):
+                st.session_state["dependencies_on"] = True
+                st.rerun()
+            return None
+
+        reload = st.button("Reload dependencies", key="dependencies_reload", help="Rebuild the graph, e.g. after changes made outside this app")
+        with st.spinner("Indexing the dependencies of the database..."):
+            graph = provider.get_dependency_graph(reload=reload)
+
+        started = time.perf_counter()
+        node = graph.node(schema_name, obj_name)
+        downstream = graph.transitive_downstream(node)
+        upstream = graph.transitive_upstream(node)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        c1, c2, c3 = st.columns(3)
+        c1.metric("Direct dependents", sum(1 for depth in downstream.values() if depth == 1))
+        c2.metric("All dependents", len(downstream))
+        c3.metric("Reads from", len(upstream))
+
+        if node in downstream:
+            st.error(f"{node} is part of a dependency cycle.")
+
+        if downstream:
+            #Deepest last: the order a change ripples through
+            st.dataframe(
+                [
+                    {"Object": name, "Type": graph.kind(name), "Depth": depth}
+                    for name, depth in sorted(downstream.items(), key=lambda item: (item[1], item[0])) if name != node
+                ],
+                use_container_width=True,
+                hide_index=True,
+            )
+        else:
+            st.info("Nothing reads this object.")
+
+        if upstream:
+            st.caption("Reads from: " + ", ".join(sorted(name for name in upstream if name != node)))
+
+        stats = graph.stats()
+        st.caption(f"{stats['nodes']} objects, {stats['edges']} dependencies (from {stats['source']}), answered in {elapsed_ms:.1f} ms")
+    return None
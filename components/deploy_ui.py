@@ -1,17 +1,45 @@
+import time
 import streamlit as st
 from utils.snowflake_connector import get_session
-from utils.git_manager import push_to_github
+from utils.data_provider import get_data_provider
+from utils.change_detection import check_changes, fetch_deployed_ddl, fetch_git_content
+from utils.ddl_parser import as_single_statement
+from utils.ddl_builder import object_file_path
 
 
-def display_deploy_button(ddl_sql,schema_name,object_type,object_name,commitmsg):
+#The batch lives in the user's session state, keyed by SCHEMA.NAME so re-adding an object replaces the old DDL
+def add_to_batch(ddl_sql, schema_name, object_type, object_name, commitmsg, deploy_sql=None):
+    batch = st.session_state.setdefault("deploy_batch", {})
+    batch[f"{schema_name}.{object_name}".upper()] = {
+        "schema": schema_name,
+        "obj_type": object_type,
+        "name": object_name,
+        "ddl": ddl_sql,
+        "commitmsg": commitmsg,
+        "deploy_sql": deploy_sql,
+    }
 
-    #Renders a 'Deploy' button. When clicked, it executes the provided SQL using the active Snowflake session.
+
+def display_deploy_button(ddl_sql,schema_name,object_type,object_name,commitmsg,deploy_sql=None):
+
+    #Renders a 'Deploy' button. When clicked, it submits the provided SQL asynchronously using the active Snowflake session.
+    #ddl_sql is the object's definition (compared and committed to Git), deploy_sql what runs in Snowflake if it differs (e.g. an ALTER migration)
     # Don't show anything if there is no SQL
     if not ddl_sql:
         return
     
-    # Using 'type="primary"' makes the button "stand out" - so user will know TO PRESS THIS!
-    if st.button("Deploy to Snowflake", type="primary", key="global_deploy_btn"):
+    c1, c2 = st.columns([1, 4])
+    with c2:
+        #Queue it for the Batch Deploy page instead of deploying right now
+        if st.button("Add to batch", key="global_add_batch_btn"):
+            add_to_batch(ddl_sql, schema_name, object_type, object_name, commitmsg, deploy_sql)
+            st.info(f"{schema_name}.{object_name} added to the batch ({len(st.session_state['deploy_batch'])} objects queued).")
+
+    with c1:
+        # Using 'type="primary"' makes the button "stand out" - so user will know TO PRESS THIS!
+        deploy_clicked = st.button("Deploy to Snowflake", type="primary", key="global_deploy_btn")
+
+    if deploy_clicked:
         
         session = get_session()
         
@@ -19,33 +47,120 @@ def display_deploy_button(ddl_sql,schema_name,object_type,object_name,commitmsg)
             st.error("No active Snowflake connection found. Check your connection settings.")
             return
         
+        #Skip no-op deploys: CREATE OR REPLACE of an identical definition throws away state (full DT re-initialization)
+        file_path = object_file_path(schema_name, object_type, object_name)
+        with st.spinner("Comparing with the deployed definition..."):
+            changes = check_changes(
+                ddl_sql,
+                deployed_ddl=fetch_deployed_ddl(get_data_provider(), schema_name, object_name, object_type),
+                git_content=fetch_git_content(file_path),
+            )
+        if deploy_sql is not None and not deploy_sql.strip():
+            changes["snowflake_changed"] = False #empty migration, the deployed object already matches
+
+        if not changes["snowflake_changed"]:
+            if not changes["git_changed"]:
+                st.info(f"Skipped: {schema_name}.{object_name} is unchanged in Snowflake and Git (hash {changes['hash'][:12]}).")
+                return
+
+            st.info(f"Skipped Snowflake: {schema_name}.{object_name} is already deployed with this definition, only Git is updated.")
+            from utils.git_manager import push_to_github
+            git_result = push_to_github(file_path=file_path, file_content=ddl_sql, commit_message=commitmsg)
+            if "Success!" in git_result:
+                st.success(git_result)
+            else:
+                st.error(git_result)
+            return
+
         try:
-            with st.spinner("Executing DDL on Snowflake..."):
-                # .collect() actually runs the query and returns the result
-                result_df = session.sql(ddl_sql).collect()
-            
-            st.success("Deployment Successful!")
-            
-            # Show the feedback from Snowflake (e.g. "View TEST_VIEW successfully created.")
-            st.dataframe(result_df)
-            
-            
+            #collect_nowait() submits the query and returns right away, the script (and the app) doesn't block on it
+            #A migration has several statements, they go as one scripting block so it's still one job
+            job = session.sql(as_single_statement(deploy_sql or ddl_sql)).collect_nowait()
         except Exception as e:
             st.error(f"Deployment Failed: {e}")
+            return
 
-        #Git push
-        with st.spinner("Pushing to GitHub..."):
-            #Construct a clean path: objects/SCHEMA/TYPE/NAME.sql
-            #file_path = f"snowflake_objects/testschema/testtype/testname.sql".lower()
-            file_path = f"snowflake_objects/{schema_name}/{object_type}/{object_name}.sql".lower()
-            
-            git_result = push_to_github(
-                file_path=file_path, 
-                file_content=ddl_sql, 
-                commit_message=commitmsg
-            )
-            
-            if "Success!" in git_result:
-                st.success(git_result)
+        st.session_state.setdefault("deploy_jobs", {})[job.query_id] = {
+            "query_id": job.query_id,
+            "schema": schema_name,
+            "obj_type": object_type,
+            "name": object_name,
+            "ddl": ddl_sql,
+            "commitmsg": commitmsg,
+            "submitted": time.time(),
+            "status": "running",
+            "message": None,
+            "push_git": changes["git_changed"],
+        }
+        st.info(f"Deployment submitted (query id: {job.query_id}). You can keep working, progress is shown in the sidebar.")
+
+
+POLL_SECONDS = 2
+
+
+@st.fragment(run_every=POLL_SECONDS)
+def display_deploy_jobs():
+    """
+    Status of the submitted deploys, polled every POLL_SECONDS without rerunning the whole page.
+    The jobs live in session state by query id, so after a rerun/page switch we simply reattach to them.
+    """
+    jobs = st.session_state.get("deploy_jobs", {})
+    if not jobs:
+        return
+
+    session = get_session()
+    if not session:
+        return
+
+    for query_id, info in list(jobs.items()):
+        if info["status"] == "running":
+            _poll_job(session, info)
+
+        with st.container(border=True):
+            elapsed = int(time.time() - info["submitted"])
+            label = f"**{info['schema']}.{info['name']}** ({info['obj_type']})"
+
+            if info["status"] == "running":
+                st.markdown(f"{label} - running for {elapsed}s")
+                if st.button("Cancel", key=f"cancel_{query_id}"):
+                    session.create_async_job(query_id).cancel()
+                    info["status"] = "cancelled"
+                    info["message"] = "Cancelled by user"
+            elif info["status"] == "success":
+                st.success(f"{label} deployed. {info['message'] or ''}")
             else:
-                st.error(git_result)
\ No newline at end of file
+                st.error(f"{label} {info['status']}: {info['message']}")
+
+            if info["status"] != "running" and st.button("Dismiss", key=f"dismiss_{query_id}"):
+                del jobs[query_id]
+
+
+def _poll_job(session, info):
+    job = session.create_async_job(info["query_id"])
+    if not job.is_done():
+        return
+
+    try:
+        job.result()
+    except Exception as e:
+        info["status"] = "failed"
+        info["message"] = str(e)
+        return
+
+    #Set the status first, so the next poll can't push the same deploy twice
+    info["status"] = "success"
+
+    #The object (and the schema listings) changed, so the cached metadata is stale now
+    get_data_provider().invalidate(info["schema"], info["name"], info["obj_type"])
+
+    if not info.get("push_git", True):
+        info["message"] = "Git already has this definition, nothing to commit."
+        return
+
+    #Git push
+    from utils.git_manager import push_to_github #PyGithub is only needed once someone actually deploys
+    info["message"] = push_to_github(
+        file_path=object_file_path(info["schema"], info["obj_type"], info["name"]),
+        file_content=info["ddl"],
+        commit_message=info["commitmsg"]
+    )
@@ -0,0 +1,118 @@
+import streamlit as st
+from utils.data_provider import get_data_provider
+from utils.dt_monitor import DEFAULT_DAYS, summarize, refresh_details, page, round_seconds
+
+
+provider = get_data_provider()
+
+PAGE_SIZE = 25
+_DAY_OPTIONS = [1, 3, DEFAULT_DAYS, 14]
+
+
+def dt_monitor():
+    database = provider.session.get_current_database()
+    st.markdown("### Dynamic Table Monitor")
+    st.markdown("Refresh performance of every dynamic table in the database: where the refresh time (and the credits) go.")
+
+    c1, c2, c3 = st.columns([1, 1, 2])
+    with c1:
+        days = st.selectbox("History", _DAY_OPTIONS, index=_DAY_OPTIONS.index(DEFAULT_DAYS), format_func=lambda d: f"Last {d} days")
+    #One query for the whole database, cached for a few minutes: filtering and paging below don't query again
+    with st.spinner("Loading the refresh history..."):
+        history = provider.get_refresh_history(database, days)
+    records = history["records"]
+    _warn_truncated(history)
+    summaries = summarize(records)
+
+    with c2:
+        schemas = sorted({summary["object"].split(".")[0] for summary in summaries})
+        schema_filter = st.selectbox("Schema", ["All"] + schemas)
+    with c3:
+        only_problems = st.checkbox("Only tables with lag misses or failures")
+
+    if schema_filter != "All":
+        summaries = [summary for summary in summaries if summary["object"].startswith(f"{schema_filter}.")]
+    if only_problems:
+        summaries = [summary for summary in summaries if summary["lag_misses"] or summary["failed"]]
+
+    if not summaries:
+        st.info("No dynamic table refreshes in this period.")
+        return None
+
+    k1, k2, k3, k4 = st.columns(4)
+    k1.metric("Dynamic tables", len(summaries))
+    k2.metric("Refresh time (h)", round(sum(summary["busy_s"] or 0 for summary in summaries) / 3600, 1))
+    k3.metric("Full refreshes", sum(summary["full"] for summary in summaries))
+    k4.metric("Lag misses", sum(summary["lag_misses"] for summary in summaries))
+
+    #Sorted by total refresh time: the credit burners are on the first page
+    pages = max(1, -(-len(summaries) // PAGE_SIZE))
+    page_no = st.number_input("Page", min_value=1, max_value=pages, value=1, step=1) if pages > 1 else 1
+    rows, pages = page(summaries, page_no, PAGE_SIZE)
+    st.dataframe(rows, use_container_width=True, hide_index=True)
+    st.caption(f"Page {page_no} of {pages}, {len(records)} refreshes in total. Durations in seconds, busy_s = summed refresh time.")
+
+    selected = st.selectbox("Drill down", [summary["object"] for summary in summaries])
+    if selected:
+        schema_name, obj_name = selected.split(".", 1)
+        _display_details(records, schema_name, obj_name, days)
+    return None
+
+
+def display_refresh_performance(schema_name, obj_name):
+    #Drill-down from the modify flow: the same numbers for one dynamic table (the history query is shared and cached)
+    if not obj_name:
+        return None
+    with st.expander("Refresh performance"):
+        #The history query covers the whole database: only run it once asked for (expander bodies always execute)
+        if not st.session_state.get("refresh_performance_on"):
+            st.caption(f"Refresh history of the last {DEFAULT_DAYS} days, one query for the database, cached for a few minutes.")
+            if st.button("Load refresh history", key="refresh_performance_load"):
+                st.session_state["refresh_performance_on"] = True
+                st.rerun()
+            return None
+
+        history = provider.get_refresh_history(provider.session.get_current_database(), DEFAULT_DAYS)
+        _warn_truncated(history)
+        _display_details(history["records"], schema_name, obj_name, DEFAULT_DAYS)
+    return None
+
+
+def _warn_truncated(history):
+    if history["truncated"]:
+        st.warning("Some refreshes are missing: even a one minute window had more refreshes than one history query returns. "
+                   "Pick a shorter period or a schema with fewer dynamic tables.")
+    return None
+
+
+def _display_details(records, schema_name, obj_name, days):
+    own = [record for record in records if record["schema"].upper() == schema_name.upper() and record["name"].upper() == obj_name.upper()]
+    if not own:
+        st.info(f"No refreshes of {schema_name}.{obj_name} in the last {days} days.")
+        return None
+
+    summary = summarize(own)[0]
+    c1, c2, c3, c4, c5 = st.columns(5)
+    c1.metric("p50 (s)", summary["p50_s"])
+    c2.metric("p90 (s)", summary["p90_s"])
+    c3.metric("p99 (s)", summary["p99_s"])
+    c4.metric("Incremental / full", f"{summary['incremental']} / {summary['full']}")
+    c5.metric("Lag misses", summary["lag_misses"], delta=f"of {summary['refreshes']}", delta_color="off")
+    if summary["refresh_mode"] == "FULL":
+        st.warning("Refresh mode is FULL: every refresh recomputes the whole table.")
+
+    details = refresh_details(own)
+    st.line_chart({"Duration (s)": [detail["duration"] for detail in details]})
+    st.dataframe(
+        [
+            {
+                "Action": detail["action"], "State": detail["state"], "Duration (s)": round_seconds(detail["duration"]),
+                "Lag at completion (s)": round_seconds(detail["lag_at_completion"]), "Lag missed": detail["lag_missed"],
+                "Rows changed": detail["rows_inserted"] + detail["rows_deleted"], "Message": detail["message"],
+            }
+            for detail in reversed(details) #newest first
+        ],
+        use_container_width=True,
+        hide_index=True,
+    )
+    return None
@@ -3,6 +3,8 @@ import streamlit as st
 import pandas as pd
 from models.dynamic_table import DynamicTable  
 from utils.data_provider import get_data_provider
+from utils.ddl_builder import projection_rows, projection_frame_specs
+from components.source_preview_ui import display_source_preview
 
 #Base Types 
 sf_types = ["NUMBER", "VARCHAR", "BOOLEAN", "TIMESTAMP", "DATE", "VARIANT", "FLOAT"]
@@ -17,19 +19,13 @@ def create_dynamic_table(editor_source_schema,editor_source_table,target_schema,
     #1. Create dynamic col_type options (both standard and already existing)
     #need this because i gave the coice to select the base types, but already existing can have more precies ones like NUMBER(38,0)
     #Fetch ALL columns at once
-    rows_list = []
     source_cols = provider.get_columns(editor_source_schema, editor_source_table, 'Dynamic Table')
     #Build the rows from source 
     #rows_list is a list, and the result of get_columns is also a list with 2 stuffs in it. first is the column name, second is the type. So with this for loop i can build the required list
+    rows_list = projection_rows(source_cols)
+
+    #Add the specific/more precise types to the list if they are not there
     for col_name, col_type, nullable in source_cols:
-        rows_list.append({
-            "src_col_nm": col_name,
-            "new_col_nm": col_name,
-            "transformation": "",
-            "data_type": col_type #This can be 'NUMBER(38,0)', wich is not part of the base types
-        })
-
-        #Add this specific/more precise type to list if it's not there
         if col_type not in sf_types:
             sf_types.append(col_type)
 
@@ -59,22 +55,11 @@ def create_dynamic_table(editor_source_schema,editor_source_table,target_schema,
 
 
     #4. Generate DDL   
-    col_definitions = []
-    col_names_only = [] #For view DDL
-
-    for index, row in editor_result.iterrows(): #need index to have string as a result, not tuple
-        if row["src_col_nm"]: 
-            
-            rule = row['transformation'] if row['transformation'] else row['src_col_nm']    #Check that we have rule or not. if not, use the original column name
+    #Same builder as the headless spec compiler (utils/ddl_builder.py)
+    columns = projection_frame_specs(editor_result)      #ColumnSpecs, the model renders "ID::NUMBER, ..." and "ID, NAME"
 
-            if rule != row["new_col_nm"]:  #If we have rule that means we need to build the string in a different way, we need alias anyways with this method
-                col_str = f"{rule}::{row['data_type']} AS {row['new_col_nm']}"
-            else:
-                col_str = f"{row['src_col_nm']}::{row['data_type']}"
-            col_definitions.append(col_str) 
-            col_names_only.append(row["new_col_nm"])   
-    cols_sql = ",\n\t".join(col_definitions)          #Result: "ID NUMBER, NAME VARCHAR"
-    cols_names_str = ",\n\t".join(col_names_only)      #Result: "ID, NAME"   
+    #Sample of the source + the grid's transformations run on it (bounded, see utils/source_preview.py)
+    display_source_preview(editor_source_schema, editor_source_table, columns, key="dynamictable_create")
 
 
 
@@ -82,8 +67,7 @@ def create_dynamic_table(editor_source_schema,editor_source_table,target_schema,
     result = DynamicTable(
         schema = target_schema, 
         name = target_name, 
-        columns=cols_sql,
-        col_names=cols_names_str,
+        columns=columns,
         source_object=f"{editor_source_schema}.{editor_source_table}",
         warehouse=warehouse,
         target_lag=target_lag)
@@ -96,20 +80,24 @@ def modify_dynamic_table(selected_schema,selected_object_name):
     #1. Create dynamic col_type options (both standard and already existing)
     #need this because i gave the coice to select the base types, but already existing can have more precies ones like NUMBER(38,0)
     #Fetch ALL columns at once
-    rows_list = []
     source_cols = provider.get_columns(selected_schema, selected_object_name, 'Dynamic Table')
+    #GET_DDL + parse only once for the whole object, not once per column
+    definition = provider.get_object_definition(selected_schema, selected_object_name, 'Dynamic Table')
+    transformations = definition['transformations']
+    
+    #Refresh settings: changing only these is an ALTER, the table keeps its data
+    c1, c2 = st.columns(2)
+    with c1:
+        warehouse = st.text_input("Warehouse", value=definition['warehouse'] or "", help="WH used for the refresh", key="dt_modify_warehouse")
+    with c2:
+        target_lag = st.text_input("Refresh Lag", value=definition['target_lag'] or "", help="e.g. '1 minute', '1 hour', 'DOWNSTREAM'", key="dt_modify_lag")
     
     #Build the rows from source 
     #rows_list is a list, and the result of get_columns is also a list with 2 stuffs in it. first is the column name, second is the type. So with this for loop i can build the required list
+    rows_list = projection_rows(source_cols, transformations)
+
+    #Add the specific/more precise types to the list if they are not there
     for col_name, col_type, nullable in source_cols:
-        rows_list.append({
-            "src_col_nm": col_name,
-            "new_col_nm": col_name,
-            "transformation": provider.get_transform_by_alias(selected_schema,selected_object_name,'Dynamic Table',col_name),
-            "data_type": col_type #This can be 'NUMBER(38,0)', wich is not part of the base types
-        })
-    
-        #Add this specific/more precise type to list if it's not there
         if col_type not in sf_types:
             sf_types.append(col_type)
     
@@ -139,37 +127,47 @@ def modify_dynamic_table(selected_schema,selected_object_name):
 
 
     #4. Generate DDL   
-    col_definitions = []
-    col_names_only = [] #For view DDL
-
-    for index, row in editor_result.iterrows(): #need index to have string as a result, not tuple
-        if row["src_col_nm"]: 
-            
-            rule = row['transformation'] if row['transformation'] else row['src_col_nm']    #Check that we have rule or not. if not, use the original column name
-
-            if rule != row["new_col_nm"]:  #If we have rule that means we need to build the string in a different way, we need alias anyways with this method
-                col_str = f"{rule}::{row['data_type']} AS {row['new_col_nm']}"
-            else:
-                col_str = f"{row['src_col_nm']}::{row['data_type']}"
-            col_definitions.append(col_str) 
-            col_names_only.append(row["new_col_nm"])   
-    cols_sql = ",\n\t".join(col_definitions)          #Result: "ID NUMBER, NAME VARCHAR"
-    cols_names_str = ",\n\t".join(col_names_only)      #Result: "ID, NAME"  
+    #Same builder as the headless spec compiler (utils/ddl_builder.py)
+    columns = projection_frame_specs(editor_result)      #ColumnSpecs, the model renders "ID::NUMBER, ..." and "ID, NAME"
 
     #the function returns both, but if i only need one, i can use _ so that will be ignored, like: schemaname, _ = fun()
-    source_schema_name, source_obj_name = provider.get_source(selected_schema,selected_object_name,'Dynamic Table')
+    source_schema_name, source_obj_name = definition['source']
     source_object = f"{source_schema_name}.{source_obj_name}"
-    warehouse, target_lag = provider.get_dynamic_table_config(selected_schema,selected_object_name)
+
+    #Sample of the source + the grid's transformations run on it (bounded, see utils/source_preview.py)
+    display_source_preview(source_schema_name, source_obj_name, columns, key="dynamictable_modify")
+
+    #An empty field keeps the deployed setting: 'WAREHOUSE = ' / "TARGET_LAG = ''" is not valid DDL
+    warehouse = warehouse.strip() or definition['warehouse']
+    target_lag = target_lag.strip() or definition['target_lag']
+    if not warehouse or not target_lag:
+        st.error("A dynamic table needs a warehouse and a refresh lag.")
+        return None, None
 
     #5. Object display  
     result = DynamicTable(
         schema = selected_schema, 
         name = selected_object_name, 
-        columns=cols_sql,
-        col_names=cols_names_str,
+        columns=columns,
         source_object = source_object,
         warehouse=warehouse,
         target_lag=target_lag)
+
+    #6. Operations on the deployed table, they run right away and don't change the definition
+    action_cols = st.columns(len(DynamicTable.ACTIONS) + 1)
+    for col, action in zip(action_cols, DynamicTable.ACTIONS):
+        with col:
+            if st.button(action.capitalize(), key=f"dt_action_{action}"):
+                try:
+                    provider.session.sql(result.action_ddl(action)).collect()
+                    #Its state (and a REFRESH's data) changed: cached metadata of the table goes
+                    provider.invalidate(selected_schema, selected_object_name, 'Dynamic Table')
+                    st.success(f"{selected_schema}.{selected_object_name}: {action} done.")
+                except Exception as e:
+                    st.error(f"{action} failed: {e}")
+
+    #7. Same query -> ALTER DYNAMIC TABLE ... SET, a different query is the only reason for a full replace
+    #Fresh GET_DDL like the deploy's no-op check, so the plan shown is the plan that runs
+    plan = result.plan_changes(provider.get_ddl.uncached(provider, selected_schema, selected_object_name, 'Dynamic Table'))
     
-    
-    return result.create_ddl()
\ No newline at end of file
+    return result.create_ddl(), plan
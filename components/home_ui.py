@@ -1,5 +1,5 @@
 import streamlit as st
-from utils.snowflake_connector import get_session
+from utils.snowflake_connector import get_session, get_session_stats
 
 def home():
     st.markdown("## Home Page")
@@ -44,6 +44,19 @@ def home():
             
             st.caption("Environment is healthy and ready for deployment.")
 
+            pool = get_session_stats()
+            if pool["open"]:
+                st.caption(f"Session pool: {pool['open']} open, {pool['idle']} idle, {pool['reused']} reuses, {pool['reconnects']} reconnects")
+
+            #Pick up objects changed outside the app: only what was altered/dropped since the last load is queried again
+            from utils.data_provider import get_data_provider
+            provider = get_data_provider()
+            if getattr(provider, "catalog", None) is not None:
+                if st.button("Sync catalog", help="Re-read only the objects altered or dropped since the last load"):
+                    result = provider.refresh_catalog()
+                    st.caption(f"Catalog synced in {result['seconds']}s ({result['queries']} queries): "
+                               f"{len(result['changed'])} changed, {len(result['dropped'])} dropped")
+
     else:
         #warning card if disconnected s
         with st.container(border=True):
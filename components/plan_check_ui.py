@@ -0,0 +1,63 @@
+import hashlib
+import streamlit as st
+from utils.data_provider import get_data_provider
+from utils.ddl_parser import parse_ddl
+from utils.plan_check import parse_explain_json, check_plan, thresholds_from_env, format_bytes
+from utils.ddl_validation import compile_statement, locate_error
+
+
+provider = get_data_provider()
+
+
+def display_plan_check(ddl, obj_type):
+    #Scan cost of the generated SELECT before it's deployed (EXPLAIN compiles it, nothing runs on the warehouse)
+    if obj_type not in ("View", "Dynamic Table"):
+        return None
+
+    query = parse_ddl(ddl).query
+    if not query:
+        return None
+
+    with st.container(border=True):
+        st.markdown("##### Plan check")
+        #EXPLAIN on request only: every grid edit is a new query (a cache miss), the check stays shown until the query changes
+        checked = hashlib.sha1(query.encode("utf-8")).hexdigest()
+        if st.button("Check plan", key="plan_check_btn", help="EXPLAIN the SELECT: partitions and bytes it would scan, its joins"):
+            st.session_state["plan_check_hash"] = checked
+        if st.session_state.get("plan_check_hash") != checked:
+            st.caption("Compiles the query without running it, nothing is read on the warehouse.")
+            return None
+
+        try:
+            estimate = parse_explain_json(provider.get_plan(query))
+        except Exception as e:
+            #Point at the grid row when the error says which line it's on (or quotes the column)
+            _, items = compile_statement(ddl, obj_type)
+            row, column = locate_error(str(e), items)
+            where = f" (grid row {row}, column {column})" if row else ""
+            st.error(f"EXPLAIN failed, the query doesn't compile{where}: {e}")
+            return None
+
+        c1, c2, c3 = st.columns(3)
+        c1.metric("Partitions scanned", f"{estimate.partitions_assigned:,} / {estimate.partitions_total:,}")
+        c2.metric("Bytes scanned", format_bytes(estimate.bytes_assigned))
+        c3.metric("Joins", len(estimate.joins))
+
+        findings = check_plan(estimate, thresholds_from_env())
+        for level, message in findings:
+            if level == "error":
+                st.error(message)
+            else:
+                st.warning(message)
+        if not findings:
+            st.caption("No full scans above the thresholds.")
+        if obj_type == "Dynamic Table":
+            st.caption("This is what a full refresh reads. Incremental refreshes only read the changed partitions.")
+
+        if estimate.scans or estimate.joins:
+            with st.expander("Plan details"):
+                if estimate.scans:
+                    st.dataframe(estimate.scans, use_container_width=True, hide_index=True)
+                if estimate.joins:
+                    st.dataframe(estimate.joins, use_container_width=True, hide_index=True)
+    return None
@@ -0,0 +1,58 @@
+import streamlit as st
+from utils.data_provider import get_data_provider
+from utils.source_preview import DEFAULT_ROWS, MAX_ROWS
+
+
+provider = get_data_provider()
+
+
+def display_source_preview(source_schema, source_name, columns, key):
+    #What the source data looks like, and what the grid's transformations make of it, on a bounded sample
+    if not source_name:
+        return None
+
+    with st.expander("Preview source data"):
+        c1, c2, c3 = st.columns([1, 1, 2])
+        with c1:
+            rows = st.number_input("Rows", min_value=10, max_value=MAX_ROWS, value=DEFAULT_ROWS, step=10, key=f"{key}_preview_rows")
+        with c2:
+            sample = st.checkbox("Random sample", key=f"{key}_preview_sample",
+                                 help="SAMPLE (n ROWS): random rows, but can read the whole table. Off: LIMIT, the first rows only")
+        with c3:
+            #Nothing is queried until asked for once, after that every rerun refreshes it (the raw sample comes from the cache)
+            if st.button("Load preview", key=f"{key}_preview_load"):
+                st.session_state[f"{key}_preview_on"] = True
+
+        if not st.session_state.get(f"{key}_preview_on"):
+            st.caption(f"Reads at most {MAX_ROWS} rows of {source_schema}.{source_name}, never a full table scan unless sampling.")
+            return None
+
+        source_tab, transformed_tab = st.tabs(["Source sample", "Transformed output"])
+        with source_tab:
+            _stream(provider.stream_preview(source_schema, source_name, rows=rows, sample=sample))
+        with transformed_tab:
+            if columns:
+                _stream(provider.stream_preview(source_schema, source_name, columns, rows=rows, sample=sample), transformed=True)
+            else:
+                st.info("No columns mapped yet.")
+    return None
+
+
+def _stream(frames, transformed=False):
+    #Each Arrow batch redraws the same placeholder, so the first rows show up before the last ones are fetched
+    placeholder = st.empty()
+    frame, capped = None, False
+    try:
+        for frame, capped in frames:
+            placeholder.dataframe(frame, use_container_width=True, hide_index=True)
+    except Exception as e:
+        if transformed:
+            placeholder.error(f"The transformations don't run on this sample: {e}")
+        else:
+            placeholder.error(f"Could not read the source: {e}")
+        return None
+
+    if frame is not None:
+        note = " (memory cap reached, fewer rows than asked)" if capped else ""
+        st.caption(f"{len(frame)} rows, {len(frame.columns)} columns{note}")
+    return None
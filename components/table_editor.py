@@ -2,6 +2,8 @@ import streamlit as st
 import pandas as pd
 from models.table import Table  
 from utils.data_provider import get_data_provider
+from utils.ddl_builder import table_specs
+from utils.table_migration import plan_table_migration
 
 #Base Types 
 sf_types = ["NUMBER", "VARCHAR", "BOOLEAN", "TIMESTAMP", "DATE", "VARIANT", "FLOAT"]
@@ -32,22 +34,14 @@ def create_table(target_schema,target_name):
     )
 
     #2. Create the DDL
-    col_definitions = []
-
-    for index, row in editor_result.iterrows(): #need index to have string as a result, not tuple
-        if row["col_nm"]: 
-            col_str = f"{row['col_nm']} {row['data_type']}"
-            if not row["nullable"]:
-                col_str += " NOT NULL"
-            col_definitions.append(col_str)
-    cols_sql = ",\n\t".join(col_definitions)          #Result: "ID NUMBER, NAME VARCHAR"
+    columns = table_specs(editor_result.to_dict("records"))          #ColumnSpecs, the model renders "ID NUMBER, NAME VARCHAR"
     
 
     #3. Display the DDL
     result = Table(
         schema = target_schema, 
         name = target_name, 
-        columns=cols_sql)
+        columns=columns)
 
 
     return result.create_ddl()
@@ -66,9 +60,10 @@ def modify_table(selected_schema,selected_object_name):
     #rows_list is a list, and the result of get_columns is also a list with 2 stuffs in it. first is the column name, second is the type. So with this for loop i can build the required list
     for col_name, col_type, nullable in source_cols:
         rows_list.append({
+            "current_col_nm": col_name, #read-only, tells the migration which deployed column a row is (renames), empty for new rows
             "src_col_nm": col_name,
             "data_type": col_type, #This can be 'NUMBER(38,0)', wich is not part of the base types
-            "nullable": nullable,
+            "nullable": nullable != 'N', #DESCRIBE gives Y/N, the checkbox needs a bool
         })
 
         #Add this specific/more precise type to list if it's not there
@@ -86,6 +81,7 @@ def modify_table(selected_schema,selected_object_name):
         default_data,
         num_rows="dynamic",
         column_config={
+            "current_col_nm": st.column_config.TextColumn("Current Column", disabled=True),
             "src_col_nm": st.column_config.TextColumn("Source Column", required=True),
             "data_type": st.column_config.SelectboxColumn(
                 "Data Type", 
@@ -99,20 +95,23 @@ def modify_table(selected_schema,selected_object_name):
     )   
 
     #4. Generate DDL   
-    col_definitions = []
-    
-    for index, row in editor_result.iterrows(): #need index to have string as a result, not tuple
-        if row["src_col_nm"]: 
-            col_str = f"{row['src_col_nm']} {row['data_type']}"
-            if row["nullable"] in ('N', 'False'):               #nullable can be 'N/Y' from DESC TABLE command (so init data, first run), or True/False once it was modified in the editor
-                col_str += " NOT NULL"
-            col_definitions.append(col_str)
-    cols_sql = ",\n\t".join(col_definitions)          #Result: "ID NUMBER, NAME VARCHAR"
+    columns = table_specs(editor_result.to_dict("records"), name_key="src_col_nm", source_key="current_col_nm")
+    desired_columns = [
+        {"source": column.source, "name": column.name, "type": column.data_type, "nullable": column.nullable}
+        for column in columns
+    ]
 
     #5. Display the DDL
     result = Table(
         schema = selected_schema, 
         name = selected_object_name, 
-        columns=cols_sql)
+        columns=columns)
+
+    #6. What actually gets executed: ALTERs (or a rebuild swapped in) instead of CREATE OR REPLACE, which would drop every row
+    try:
+        migration = plan_table_migration(selected_schema, selected_object_name, source_cols, desired_columns)
+    except ValueError as e:
+        st.error(str(e))
+        return None, None
     
-    return result.create_ddl()
\ No newline at end of file
+    return result.create_ddl(), migration
\ No newline at end of file
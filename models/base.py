@@ -1,4 +1,14 @@
+import threading
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+from utils.change_detection import ddl_hash
+
+
+#Rendered DDL by definition key, shared by all instances: every rerun builds new objects from the same grid
+RENDER_CACHE_SIZE = 256
+_rendered = OrderedDict() #definition key -> DDL, oldest first
+_rendered_lock = threading.Lock()
 
 
 class DatabaseObject(ABC):
@@ -6,8 +16,32 @@ class DatabaseObject(ABC):
     def __init__(self, schema, name, columns):
         self.schema = schema
         self.name = name
-        self.columns = columns
+        self.columns = tuple(columns) #ColumnSpec (models/column_spec.py)
+
+    def definition_key(self):
+        #Everything the DDL is rendered from, hashable: equal keys -> equal DDL. Subclasses add their own settings
+        return (type(self).__name__, self.schema, self.name, self.columns)
 
     @abstractmethod
+    def render_ddl(self):
+        pass
+
     def create_ddl(self):
-        pass
\ No newline at end of file
+        #Rendered once per distinct definition, an unchanged grid gets the DDL of the previous rerun
+        key = self.definition_key()
+        with _rendered_lock:
+            ddl = _rendered.get(key)
+            if ddl is not None:
+                _rendered.move_to_end(key)
+                return ddl
+
+        ddl = self.render_ddl()
+        with _rendered_lock:
+            _rendered[key] = ddl
+            while len(_rendered) > RENDER_CACHE_SIZE:
+                _rendered.popitem(last=False)
+        return ddl
+
+    #Normalized hash of the generated DDL, equal hash = nothing to deploy
+    def content_hash(self):
+        return ddl_hash(self.create_ddl())
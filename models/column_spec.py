@@ -0,0 +1,63 @@
+class ColumnSpec:
+    """
+    One column of an object definition, immutable and hashable (models hold tuples of these, not joined SQL text).
+    Tables: name, data_type, nullable (+ source: the current name of a column being modified, for migrations)
+    Views/dynamic tables: name (alias), data_type, source (source column), transformation (expression, None = the source as-is)
+    """
+    __slots__ = ("name", "data_type", "nullable", "source", "transformation", "_hash")
+
+    def __init__(self, name, data_type, nullable=True, source=None, transformation=None):
+        set_ = object.__setattr__ #frozen: __setattr__ below refuses every change
+        set_(self, "name", name)
+        set_(self, "data_type", data_type)
+        set_(self, "nullable", bool(nullable))
+        set_(self, "source", source or None)
+        set_(self, "transformation", transformation or None)
+        set_(self, "_hash", hash(self.key()))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"ColumnSpec is immutable, can't set {name}")
+
+    def __reduce__(self):
+        #pickle/copy go through __init__, __setattr__ is closed
+        return ColumnSpec, self.key()
+
+    def key(self):
+        return (self.name, self.data_type, self.nullable, self.source, self.transformation)
+
+    def __eq__(self, other):
+        return isinstance(other, ColumnSpec) and self.key() == other.key()
+
+    def __hash__(self):
+        return self._hash
+
+    def __repr__(self):
+        return (f"ColumnSpec({self.name!r}, {self.data_type!r}, nullable={self.nullable}, "
+                f"source={self.source!r}, transformation={self.transformation!r})")
+
+    def select_sql(self):
+        #'ID::NUMBER' or 'UPPER(NAME)::VARCHAR AS NAME_UP'
+        source = self.source or self.name
+        rule = self.transformation or source #no rule -> the original column
+        if rule != self.name: #a rule or a rename needs the alias
+            return f"{rule}::{self.data_type} AS {self.name}"
+        return f"{source}::{self.data_type}"
+
+    def definition_sql(self):
+        #'ID NUMBER NOT NULL'
+        return f"{self.name} {self.data_type}" if self.nullable else f"{self.name} {self.data_type} NOT NULL"
+
+
+def select_list_sql(columns):
+    #"ID::NUMBER,\n\tUPPER(NAME)::VARCHAR AS NAME_UP"
+    return ",\n\t".join(column.select_sql() for column in columns)
+
+
+def column_names_sql(columns):
+    #"ID,\n\tNAME_UP"
+    return ",\n\t".join(column.name for column in columns)
+
+
+def column_definitions_sql(columns):
+    #"ID NUMBER NOT NULL,\n\tNAME VARCHAR"
+    return ",\n\t".join(column.definition_sql() for column in columns)
@@ -1,19 +1,74 @@
 from models.base import DatabaseObject
+from models.column_spec import select_list_sql, column_names_sql
+from utils.ddl_parser import parse_ddl, identifier_key
+from utils.change_detection import normalize_ddl
+from utils.table_migration import MigrationPlan
 
 
 class DynamicTable(DatabaseObject):
 
-    def __init__(self, schema, name, columns, col_names, source_object, warehouse, target_lag):
+    #Operations that don't change the definition, run straight away (not deployed, not committed)
+    ACTIONS = ("SUSPEND", "RESUME", "REFRESH")
+
+    def __init__(self, schema, name, columns, source_object, warehouse, target_lag):
         # super(): pass the standard stuff to the Parent (base.py - DatabaseObject)
         super().__init__(schema, name, columns)
         
         # Save the new specific stuff to self
-        self.col_names = col_names #to store only the name of the columns, withput the types
         self.sourceobject = source_object
         self.warehouse = warehouse
         self.target_lag = target_lag
 
-    def create_ddl(self):
-            ddl = f"""CREATE OR REPLACE DYNAMIC TABLE {self.schema}.{self.name}\nTARGET_LAG = '{self.target_lag}'\nWAREHOUSE = {self.warehouse}\n(\n\t{self.col_names}\n)\nAS SELECT\n\t{self.columns}\nFROM {self.sourceobject};
+    @property
+    def col_names(self):
+        return column_names_sql(self.columns) #only the name of the columns, without the types
+
+    def definition_key(self):
+        return super().definition_key() + (self.sourceobject, self.warehouse, self.target_lag)
+
+    def render_ddl(self):
+            ddl = f"""CREATE OR REPLACE DYNAMIC TABLE {self.schema}.{self.name}\nTARGET_LAG = {_lag_sql(self.target_lag)}\nWAREHOUSE = {self.warehouse}\n(\n\t{self.col_names}\n)\nAS SELECT\n\t{select_list_sql(self.columns)}\nFROM {self.sourceobject};
             """
-            return ddl.strip() # strip() removes extra whitespace from the start/end
\ No newline at end of file
+            return ddl.strip() # strip() removes extra whitespace from the start/end
+
+    def plan_changes(self, deployed_ddl):
+        """
+        Diff against the deployed definition (GET_DDL).
+        Same columns + query -> 'alter': ALTER DYNAMIC TABLE ... SET TARGET_LAG/WAREHOUSE (or 'none'), keeps the materialized data.
+        Different query -> 'replace': CREATE OR REPLACE, which re-materializes the whole table.
+        """
+        plan = MigrationPlan(self.schema, self.name)
+        if normalize_ddl(self.create_ddl(), properties=()) != normalize_ddl(deployed_ddl, properties=()):
+            plan.mode = "replace"
+            plan.reasons.append("The query changed")
+            plan.warnings.append("CREATE OR REPLACE re-materializes the dynamic table (full refresh).")
+            return plan
+
+        deployed = parse_ddl(deployed_ddl)
+        settings = []
+        if _normalize_lag(deployed.target_lag) != _normalize_lag(self.target_lag):
+            settings.append(f"TARGET_LAG = {_lag_sql(self.target_lag)}")
+        if identifier_key(deployed.warehouse or "") != identifier_key(self.warehouse or ""):
+            settings.append(f"WAREHOUSE = {self.warehouse}")
+
+        if settings:
+            plan.mode = "alter"
+            plan.statements.append(f"ALTER DYNAMIC TABLE {self.schema}.{self.name} SET {' '.join(settings)}")
+        return plan
+
+    def action_ddl(self, action):
+        if action not in self.ACTIONS:
+            raise ValueError(f"Unknown dynamic table action: {action}")
+        return f"ALTER DYNAMIC TABLE {self.schema}.{self.name} {action}"
+
+
+def _normalize_lag(target_lag):
+    #'1  Minute' and '1 minute' are the same lag
+    return " ".join((target_lag or "").lower().split())
+
+
+def _lag_sql(target_lag):
+    #DOWNSTREAM is a keyword, every other lag is a string
+    if _normalize_lag(target_lag) == "downstream":
+        return "DOWNSTREAM"
+    return f"'{target_lag}'"
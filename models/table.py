@@ -1,11 +1,12 @@
 from models.base import DatabaseObject
+from models.column_spec import column_definitions_sql
 
 
 class Table(DatabaseObject):
 
-    def create_ddl(self):
+    def render_ddl(self):
         # f-strings handle the spacing and variables cleanly
         #ddl = f"CREATE OR REPLACE TABLE {self.schema}.{self.name} ({self.columns})"
-        ddl = f"CREATE OR REPLACE TABLE {self.schema}.{self.name}(\n\t{self.columns}\n);"
+        ddl = f"CREATE OR REPLACE TABLE {self.schema}.{self.name}(\n\t{column_definitions_sql(self.columns)}\n);"
         return ddl
-    
+
@@ -1,18 +1,24 @@
 from models.base import DatabaseObject
+from models.column_spec import select_list_sql, column_names_sql
 
 
 class View(DatabaseObject):
 
-    def __init__(self, schema, name, columns,col_names,source_object):
+    def __init__(self, schema, name, columns, source_object):
         # super(): pass the standard stuff to the Parent (base.py - DatabaseObject)
         super().__init__(schema, name, columns)
-        
+
         # Save the new specific stuff to self
-        self.col_names = col_names #to store only the name of the columns, withput the types
         self.sourceobject = source_object
 
+    @property
+    def col_names(self):
+        return column_names_sql(self.columns) #only the name of the columns, without the types
+
+    def definition_key(self):
+        return super().definition_key() + (self.sourceobject,)
 
-    def create_ddl(self):       
-        ddl = f"""CREATE OR REPLACE VIEW {self.schema}.{self.name}(\n\t{self.col_names}\n)\nAS SELECT\n\t{self.columns}\nFROM {self.sourceobject};
+    def render_ddl(self):
+        ddl = f"""CREATE OR REPLACE VIEW {self.schema}.{self.name}(\n\t{self.col_names}\n)\nAS SELECT\n\t{select_list_sql(self.columns)}\nFROM {self.sourceobject};
         """
-        return ddl
\ No newline at end of file
+        return ddl
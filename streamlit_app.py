@@ -1,11 +1,10 @@
+from utils import startup_timer
+from utils import query_profiler
 import streamlit as st
-import pandas as pd
-from utils.snowflake_connector import get_session
-from utils.data_provider import get_data_provider
-from components.builders_ui import create_object
-from components.builders_ui import modify_object
-from components.home_ui import home
 
+#Heavy stuff (pandas, Snowpark, PyGithub, cryptography) and the Snowflake connection are only loaded
+#by the page that needs them, so the first paint doesn't wait for any of it
+startup_timer.start_rerun()
 
 
 #   !!!!!!!!    Page Config     !!!!!!!!
@@ -14,48 +13,117 @@ st.title("❄️Igloo - Snowflake Object Management Tool")
 st.divider()
 
 st.sidebar.title("Menu")
-page = st.sidebar.radio("Go to", ["Home", "Create New Object", "Modify Existing", "Sandbox"])
+page = st.sidebar.radio("Go to", ["Home", "Create New Object", "Modify Existing", "Batch Deploy", "DT Monitor", "Sandbox"])
 
-session = get_session()
-database = session.get_current_database()
-provider = get_data_provider()
+#Every query of this run is recorded (and tagged with QUERY_TAG = {"app":"igloo","page":...}) for the profiler panel
+query_run = query_profiler.start_run(page)
 
 
 # ==========================================
 # PAGE 1: HOME (Dashboard)
 # ==========================================
 if page == "Home":
+    with startup_timer.track_import("components.home_ui"):
+        from components.home_ui import home
     home()
 
 
 # ==========================================
-# PAGE 2: CREATE NEW OBJECT 
+# PAGE 2: CREATE NEW OBJECT
 # ==========================================
 elif page == "Create New Object":
+    with startup_timer.track_import("components.builders_ui"):
+        from components.builders_ui import create_object
     create_object()
 
 
 # ==========================================
-# PAGE 3: MODIFY EXISTING 
+# PAGE 3: MODIFY EXISTING
 # ==========================================
 elif page == "Modify Existing":
+    with startup_timer.track_import("components.builders_ui"):
+        from components.builders_ui import modify_object
     modify_object()
 
 
-    
 # ==========================================
-# PAGE 4: Sandbox
+# PAGE 4: BATCH DEPLOY
+# ==========================================
+elif page == "Batch Deploy":
+    with startup_timer.track_import("components.batch_deploy_ui"):
+        from components.batch_deploy_ui import batch_deploy
+    batch_deploy()
+
+
+# ==========================================
+# PAGE 5: DYNAMIC TABLE MONITOR
+# ==========================================
+elif page == "DT Monitor":
+    with startup_timer.track_import("components.dt_monitor_ui"):
+        from components.dt_monitor_ui import dt_monitor
+    dt_monitor()
+
+
+# ==========================================
+# PAGE 6: Sandbox
 # ==========================================
 elif page == "Sandbox":
+    with startup_timer.track_import("utils.data_provider"):
+        from utils.data_provider import get_data_provider
+    provider = get_data_provider()
+
     st.header("Sandbox")
     st.write("This section is my playground")
 
     tf = provider.get_transform('ANALYTICS','NEWVIEW','View')
     st.code(tf)
-    st.code(provider.get_transform_by_alias('ANALYTICS','NEWVIEW','View','ID')) 
-    
+    st.code(provider.get_transform_by_alias('ANALYTICS','NEWVIEW','View','ID'))
+
     st.divider()
     st.code(provider.get_transform('ANALYTICS','testdt','Dynamic Table'))
     st.code(provider.get_transform('ANALYTICS','testdt','Dynamic Table')[0]['transformation'])
     st.code(provider.get_transform_by_alias('ANALYTICS','testdt','Dynamic Table','ID')),
 
+
+#In-flight deploys keep reporting in the sidebar on every page (reattached from session state after reruns)
+if st.session_state.get("deploy_jobs"):
+    from components.deploy_ui import display_deploy_jobs
+    with st.sidebar:
+        st.markdown("#### Deployments")
+        display_deploy_jobs()
+
+
+#Startup/first paint timing report
+startup_timer.mark("first paint")
+startup_timer.end_rerun()
+
+if st.sidebar.checkbox("Show startup timing", value=False):
+    timing = startup_timer.report()
+    with st.sidebar.expander("Startup timing", expanded=True):
+        first_paint = timing["marks"].get("first paint")
+        st.metric("First paint (s)", first_paint, delta="over budget" if timing["over_budget"] else "within budget",
+                  delta_color="inverse" if timing["over_budget"] else "normal")
+        st.caption(f"Budget: {timing['budget_seconds']}s, last rerun: {timing['last_rerun_seconds']}s")
+        st.dataframe(timing["imports"], use_container_width=True)
+
+if st.sidebar.checkbox("Show query profiler", value=False):
+    summary = query_run.summary()
+    previous = st.session_state.get("query_profiler_previous")
+    with st.sidebar.expander("Queries (this rerun)", expanded=True):
+        c1, c2 = st.columns(2)
+        c1.metric("Queries", summary["queries"], delta=summary["queries"] - previous["queries"] if previous else None, delta_color="inverse")
+        c2.metric("Query time (s)", summary["query_seconds"])
+        st.caption(f"Metadata cache: {summary['cache_hits']} hits, {summary['cache_misses']} misses. Errors: {summary['errors']}")
+        from utils.data_provider import get_data_provider #already loaded by the page, this is just a lookup
+        disk_cache = getattr(get_data_provider(), "disk_cache", None)
+        if disk_cache is not None:
+            disk = disk_cache.stats()
+            st.caption(f"Disk cache: {disk['entries']} entries, {disk['bytes'] / 1048576:.1f} of {disk['max_bytes'] / 1048576:.0f} MB, "
+                       f"{disk['hits']} hits since start")
+        st.dataframe(query_run.by_fingerprint(), use_container_width=True)
+        with st.popover("All records") if hasattr(st, "popover") else st.container():
+            st.dataframe(query_run.records, use_container_width=True)
+        c1, c2 = st.columns(2)
+        c1.download_button("JSON", query_run.to_json(), file_name="igloo_queries.json", mime="application/json")
+        c2.download_button("CSV", query_run.to_csv(), file_name="igloo_queries.csv", mime="text/csv")
+    st.session_state["query_profiler_previous"] = summary
@@ -0,0 +1,154 @@
+#Tests import the app's packages (utils, models) from the repo root: python -m pytest -q
+import os
+import re
+import sys
+from datetime import datetime, timezone, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.data_provider import RealDataProvider
+
+
+class FakeRow(dict):
+    #Snowpark Rows answer row["NAME"] and row[0]
+    def __getitem__(self, key):
+        if isinstance(key, int):
+            return list(self.values())[key]
+        return dict.__getitem__(self, key)
+
+
+class FakeSnowflake:
+    """
+    A small fixed catalog behind sql(...).collect(), enough for the GET_DDL, dependency and refresh history queries.
+    Every schema has tables T0..T2, views V0..V2 and dynamic tables D0..D1; V<i>/D<i> read from T<i>.
+    """
+
+    DATABASE = "DB"
+    SCHEMAS = ("S1", "S2")
+
+    def __init__(self, account_usage=True):
+        self.account_usage = account_usage #False: the role can't read SNOWFLAKE.ACCOUNT_USAGE
+        self.queries = 0
+        self.objects = {} #(SCHEMA, NAME) -> 'Table' | 'View' | 'Dynamic Table'
+        for schema in self.SCHEMAS:
+            for obj_type, prefix, count in (("Table", "T", 3), ("View", "V", 3), ("Dynamic Table", "D", 2)):
+                for i in range(count):
+                    self.objects[(schema, f"{prefix}{i}")] = obj_type
+
+    def get_current_account(self):
+        return "ACCOUNT"
+
+    def get_current_role(self):
+        return "ROLE"
+
+    def get_current_database(self):
+        return self.DATABASE
+
+    def sql(self, query):
+        return FakeQuery(self, query)
+
+    def names(self, schema, obj_type):
+        return [name for (s, name), t in self.objects.items() if s == schema and t == obj_type]
+
+    def source_of(self, schema, name):
+        return schema, f"T{name[1:]}"
+
+    def ddl(self, schema, name):
+        obj_type = self.objects.get((schema, name))
+        if obj_type is None:
+            raise RuntimeError(f"Object '{schema}.{name}' does not exist or not authorized.")
+        if obj_type == "Table":
+            return f"create or replace TABLE {name} (\n\tID NUMBER(38,0),\n\tNOTE VARCHAR(100)\n);"
+        source = ".".join(self.source_of(schema, name))
+        query = f"SELECT\n\tID::NUMBER(38,0) AS ID,\n\tTRIM(NOTE)::VARCHAR(100) AS NOTE\nFROM {source};"
+        if obj_type == "View":
+            return f"create or replace view {schema}.{name}(\n\tID,\n\tNOTE\n) as {query}"
+        return f"create or replace dynamic table {name}(\n\tID,\n\tNOTE\n) target_lag = '1 minute' warehouse = WH\n as {query}"
+
+    def answer(self, query):
+        self.queries += 1
+        upper = " ".join(query.split()).upper()
+
+        match = re.match(r"SELECT GET_DDL\('SCHEMA', '(\w+)'", upper)
+        if match:
+            schema = match.group(1)
+            ddls = [self.ddl(s, name) for (s, name) in self.objects if s == schema]
+            return [FakeRow(DDL="\n\n".join([f"create or replace schema {schema};"] + ddls))]
+
+        match = re.match(r"SELECT GET_DDL\('\w+', '(\w+)\.(\w+)'\)", upper)
+        if match:
+            return [FakeRow(DDL=self.ddl(*match.groups()))]
+
+        if "ACCOUNT_USAGE.OBJECT_DEPENDENCIES" in upper:
+            if not self.account_usage:
+                raise RuntimeError("Object 'SNOWFLAKE.ACCOUNT_USAGE.OBJECT_DEPENDENCIES' does not exist or not authorized.")
+            domains = {"View": "VIEW", "Dynamic Table": "DYNAMIC TABLE"}
+            return [
+                FakeRow(REFERENCING_SCHEMA=schema, REFERENCING_OBJECT_NAME=name, REFERENCING_OBJECT_DOMAIN=domains[obj_type],
+                        REFERENCED_DATABASE=self.DATABASE, REFERENCED_SCHEMA=source[0], REFERENCED_OBJECT_NAME=source[1],
+                        REFERENCED_OBJECT_DOMAIN="TABLE")
+                for (schema, name), obj_type in self.objects.items() if obj_type != "Table"
+                for source in [self.source_of(schema, name)]
+            ]
+
+        if "INFORMATION_SCHEMA.VIEWS" in upper:
+            return [
+                FakeRow(TABLE_SCHEMA=schema, TABLE_NAME=name, VIEW_DEFINITION=self.ddl(schema, name))
+                for (schema, name), obj_type in self.objects.items() if obj_type == "View"
+            ]
+
+        if upper.startswith("SHOW DYNAMIC TABLES IN DATABASE"):
+            return [
+                FakeRow(name=name, schema_name=schema, text=self.ddl(schema, name))
+                for (schema, name), obj_type in self.objects.items() if obj_type == "Dynamic Table"
+            ]
+
+        if "DYNAMIC_TABLE_REFRESH_HISTORY" in upper:
+            start = int(re.search(r"DATA_TIMESTAMP_START => TO_TIMESTAMP_LTZ\((\d+)\)", upper).group(1))
+            end = int(re.search(r"DATA_TIMESTAMP_END => TO_TIMESTAMP_LTZ\((\d+)\)", upper).group(1))
+            limit = int(re.search(r"RESULT_LIMIT => (\d+)", upper).group(1))
+            return self.refresh_history(start, end)[:limit]
+
+        raise RuntimeError(f"Unexpected query: {upper[:80]}")
+
+    def refresh_history(self, start, end):
+        #One refresh per dynamic table every full hour in [start, end), the later tables take longer
+        rows = []
+        for index, (schema, name) in enumerate(sorted(key for key, t in self.objects.items() if t == "Dynamic Table")):
+            for hour in range(-(-start // 3600), -(-end // 3600)):
+                data_ts = datetime.fromtimestamp(hour * 3600, tz=timezone.utc)
+                refresh_start = data_ts + timedelta(seconds=5)
+                action = "FULL" if hour % 12 == 0 else "INCREMENTAL"
+                rows.append(FakeRow(
+                    SCHEMA_NAME=schema, NAME=name, STATE="SUCCEEDED", STATE_MESSAGE="", REFRESH_ACTION=action,
+                    REFRESH_TRIGGER="SCHEDULED", DATA_TIMESTAMP=data_ts, REFRESH_START_TIME=refresh_start,
+                    REFRESH_END_TIME=refresh_start + timedelta(seconds=index + 1 + hour % 3), COMPLETION_TARGET=data_ts + timedelta(seconds=60),
+                    STATISTICS='{"numInsertedRows": 100, "numDeletedRows": 10}',
+                    TARGET_LAG_SEC=60, TARGET_LAG_TYPE="USER_DEFINED", REFRESH_MODE="INCREMENTAL",
+                ))
+        return rows
+
+
+class FakeQuery:
+    def __init__(self, session, query):
+        self.session = session
+        self.query = query
+
+    def collect(self, statement_params=None):
+        return self.session.answer(self.query)
+
+
+@pytest.fixture
+def fake_snowflake():
+    return FakeSnowflake()
+
+
+@pytest.fixture
+def fake_provider(fake_snowflake):
+    #The real provider (caching, GET_DDL splitting, parsing) on top of the fake session
+    class Provider(RealDataProvider):
+        session = fake_snowflake
+
+    return Provider()
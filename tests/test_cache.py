@@ -0,0 +1,75 @@
+from utils.cache import MetadataCache, cached
+
+
+class Owner:
+    def __init__(self):
+        self.cache = MetadataCache()
+        self.calls = 0
+
+    def cache_context(self):
+        return ("ACCOUNT", "ROLE", "DB")
+
+    @cached(scope="object", ttl=60)
+    def get_columns(self, schema_name, obj_name):
+        self.calls += 1
+        return [(obj_name, "NUMBER")]
+
+
+def test_ttl_and_lru():
+    cache = MetadataCache(max_entries=2)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+    assert cache.get("a") == (True, 1) #a is now the most recently used
+    cache.set("c", 3, ttl=60)
+    assert cache.get("b") == (False, None)
+    assert cache.evictions == 1
+
+    cache.set("d", 4, ttl=-1)
+    assert cache.get("d") == (False, None)
+
+
+def test_peek_is_not_counted_and_keeps_the_lru_order():
+    cache = MetadataCache(max_entries=2)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+    assert cache.peek("a") == (True, 1)
+    assert cache.peek("missing") == (False, None)
+    assert (cache.hits, cache.misses) == (0, 0)
+    cache.set("c", 3, ttl=60)
+    assert cache.peek("a") == (False, None) #peeking didn't make it recently used
+
+
+def test_decorator_caches_per_normalized_key_and_peeks():
+    owner = Owner()
+    assert owner.get_columns.peek(owner, "s", "t") == (False, None)
+    assert owner.get_columns("s", "t") == owner.get_columns("S", "T") == [("t", "NUMBER")]
+    assert owner.calls == 1
+    assert owner.get_columns.peek(owner, "S", "t") == (True, [("t", "NUMBER")])
+    assert owner.cache.stats()["hits"] == 1 and owner.cache.stats()["misses"] == 1
+
+
+def test_invalidate_object():
+    owner = Owner()
+    owner.get_columns("S", "T")
+    owner.get_columns("S", "U")
+    owner.cache.invalidate("S", "T")
+    owner.get_columns("S", "T")
+    owner.get_columns("S", "U")
+    assert owner.calls == 3
+
+
+def test_quoted_and_unquoted_names_are_different_keys():
+    owner = Owner()
+    owner.get_columns("S", '"foo"')
+    owner.get_columns("S", "FOO")
+    owner.get_columns("S", "foo")
+    assert owner.calls == 2
+
+
+def test_invalidating_an_object_drops_cross_object_results():
+    cache = MetadataCache()
+    context = ("ACCOUNT", "ROLE", "DB")
+    cache.set(context + (None, None, "get_plan", ("SELECT * FROM S.T",), ()), "{}", ttl=60)
+    cache.set(context + (None, None, "get_schemas", ("DB",), ()), ["S"], ttl=60)
+    assert cache.invalidate("S", "T") == 1
+    assert cache.peek(context + (None, None, "get_schemas", ("DB",), ()))[0]
@@ -0,0 +1,68 @@
+from utils.change_detection import normalize_ddl, ddl_hash, normalize_type, check_changes
+
+
+GENERATED = """CREATE OR REPLACE VIEW ANALYTICS.V(
+\tID,
+\tNAME
+)
+AS SELECT
+\tID::NUMBER,
+\tNAME::VARCHAR
+FROM RAW.USERS;"""
+
+#What GET_DDL gives back for the same view: other case, spacing, quoting and the full type names
+DEPLOYED = """create or replace view V(ID, NAME) as SELECT id::NUMBER(38,0), "NAME"::VARCHAR(16777216) FROM raw.users;"""
+
+
+def test_same_object_hashes_the_same():
+    assert normalize_ddl(GENERATED) == normalize_ddl(DEPLOYED)
+    assert ddl_hash(GENERATED) == ddl_hash(DEPLOYED)
+
+
+def test_changed_query_changes_the_hash():
+    assert ddl_hash(GENERATED) != ddl_hash(GENERATED.replace("NAME::VARCHAR", "UPPER(NAME)::VARCHAR AS NAME"))
+
+
+def test_dynamic_table_default_properties_are_ignored():
+    ours = "CREATE OR REPLACE DYNAMIC TABLE S.DT\nTARGET_LAG = '1 minute'\nWAREHOUSE = WH\n(\n\tID\n)\nAS SELECT\n\tID::NUMBER\nFROM S.T;"
+    deployed = "create or replace dynamic table DT(ID) target_lag = '1 minute' refresh_mode = AUTO initialize = ON_CREATE warehouse = WH as SELECT ID::NUMBER FROM S.T;"
+    assert ddl_hash(ours) == ddl_hash(deployed)
+    assert ddl_hash(ours) != ddl_hash(deployed.replace("'1 minute'", "'1 hour'"))
+
+
+def test_normalize_type():
+    assert normalize_type("number") == normalize_type("NUMBER(38,0)")
+    assert normalize_type("string") == normalize_type("VARCHAR(16777216)")
+    assert normalize_type("VARCHAR(10)") != normalize_type("VARCHAR(20)")
+
+
+def test_short_types_expand_only_in_type_position():
+    #A column named TEXT is not a VARCHAR
+    assert ddl_hash("create table S.T (ID number, TEXT text)") == ddl_hash("create table S.T (ID NUMBER(38,0), TEXT VARCHAR(16777216))")
+    assert ddl_hash("create table S.T (TEXT number)") != ddl_hash("create table S.T (VARCHAR number)")
+    assert ddl_hash("create view S.V as select ID::string as X, cast(N as int) as Y from S.T") == \
+        ddl_hash("create view S.V as select ID::VARCHAR(16777216) as X, CAST(N AS NUMBER(38,0)) as Y from S.T")
+    assert ddl_hash("create view S.V as select TEXT from S.T") != ddl_hash("create view S.V as select VARCHAR from S.T")
+
+
+def test_check_changes():
+    assert check_changes(GENERATED, deployed_ddl=DEPLOYED, git_content=GENERATED) == {
+        "hash": ddl_hash(GENERATED), "snowflake_changed": False, "git_changed": False,
+    }
+    missing = check_changes(GENERATED)
+    assert missing["snowflake_changed"] and missing["git_changed"]
+
+
+def test_fetch_deployed_ddls_reads_each_schema_once(fake_snowflake, fake_provider):
+    from utils.change_detection import fetch_deployed_ddls, fetch_deployed_ddl
+    from utils.deploy_engine import DeployItem
+
+    items = [DeployItem(schema, name, obj_type, "", "") for (schema, name), obj_type in fake_snowflake.objects.items()]
+    items.append(DeployItem("S1", "NOT_DEPLOYED_YET", "View", "", ""))
+
+    deployed = fetch_deployed_ddls(fake_provider, items)
+    assert fake_snowflake.queries == len(fake_snowflake.SCHEMAS)
+
+    assert deployed[("S1", "NOT_DEPLOYED_YET")] is None
+    for item in items[:-1]:
+        assert ddl_hash(deployed[(item.schema, item.name)]) == ddl_hash(fetch_deployed_ddl(fake_provider, item.schema, item.name, item.obj_type))
@@ -0,0 +1,32 @@
+from utils.data_provider import RealDataProvider
+
+
+DDL = """create or replace view S.V(ID, "Full Name", CODE) as SELECT
+    ID::NUMBER,
+    first || ' ' || last::VARCHAR AS "Full Name",
+    left(code, 2)::VARCHAR AS code
+FROM S.T;"""
+
+
+class FixedDdl:
+    #Just enough provider for the definition lookups: GET_DDL answers with DDL, nothing is cached
+    def get_ddl(self, schema_name, obj_name, obj_type):
+        return DDL
+
+    def get_object_definition(self, schema_name, obj_name, obj_type):
+        return RealDataProvider.get_object_definition.uncached(self, schema_name, obj_name, obj_type)
+
+
+def test_transform_lookup_uses_identifier_keys():
+    lookup = lambda alias: RealDataProvider.get_transform_by_alias(FixedDdl(), "S", "V", "View", alias)
+    assert lookup("code") == lookup("CODE") == lookup('"CODE"') == "LEFT(CODE, 2)"
+    assert lookup('"Full Name"') == "FIRST || ' ' || LAST"
+    assert lookup("ID") is None
+
+
+def test_modify_grid_keeps_quoted_mixed_case_transformations():
+    from utils.ddl_builder import projection_rows
+    transformations = FixedDdl().get_object_definition("S", "V", "View")["transformations"]
+    #DESCRIBE VIEW gives the stored names: unquoted aliases upper case, quoted ones exactly as written
+    rows = projection_rows([("ID", "NUMBER(38,0)", "Y"), ("Full Name", "VARCHAR", "Y"), ("CODE", "VARCHAR", "Y")], transformations)
+    assert [row["transformation"] for row in rows] == [None, "FIRST || ' ' || LAST", "LEFT(CODE, 2)"]
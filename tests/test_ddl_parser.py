@@ -0,0 +1,98 @@
+from utils.ddl_parser import (
+    tokenize, split_statements, as_single_statement, StatementSplitter, iter_statements,
+    statement_object, split_schema_ddl, parse_ddl, identifier_key,
+)
+
+
+DT_DDL = """create or replace dynamic table DB.ANALYTICS.ORDERS_DT(ID, CODE)
+target_lag = '5 minutes' refresh_mode = AUTO warehouse = COMPUTE_WH
+as SELECT
+    ID::NUMBER,
+    LEFT(CODE, 2)::VARCHAR AS CODE
+FROM RAW.ORDERS;"""
+
+SCHEMA_SCRIPT = """create or replace schema ANALYTICS;
+
+create or replace TABLE T1 (
+    ID NUMBER(38,0),
+    NOTE VARCHAR -- a ; in a comment
+);
+create or replace view ANALYTICS.V1(ID) as SELECT ID::NUMBER FROM T1 WHERE NOTE <> ';';
+create or replace dynamic table DT1(ID) target_lag = '1 minute' warehouse = WH as SELECT ID::NUMBER FROM T1;
+create or replace sequence SEQ1 start 1 increment 1;
+create or replace procedure P1() returns varchar language sql as $$ begin return 'a;b'; end $$;
+"""
+
+
+def test_tokenize_drops_comments_and_tracks_depth():
+    tokens = tokenize("SELECT f(a, (b)) -- comment\n/* block */ FROM t")
+    assert [token.value for token in tokens] == ["SELECT", "f", "(", "a", ",", "(", "b", ")", ")", "FROM", "t"]
+    assert [token.depth for token in tokens if token.value in ("a", "b")] == [1, 2]
+
+
+def test_tokenize_limit():
+    assert len(tokenize("a b c d e", limit=2)) == 2
+
+
+def test_split_statements_ignores_nested_and_quoted_semicolons():
+    assert split_statements("select ';' ; -- x;\n select (1;2); select 3") == ["select ';'", "select (1;2)", "select 3"]
+
+
+def test_as_single_statement():
+    assert as_single_statement("select 1") == "select 1"
+    assert as_single_statement("select 1; select 2;") == "BEGIN\n\tselect 1;\n\tselect 2;\nEND;"
+
+
+def test_statement_splitter_is_chunk_size_independent():
+    expected = list(iter_statements(SCHEMA_SCRIPT, chunk_size=len(SCHEMA_SCRIPT)))
+    assert len(expected) == 6
+    for chunk_size in (1, 2, 3, 7, 64):
+        assert list(iter_statements(SCHEMA_SCRIPT, chunk_size=chunk_size)) == expected
+
+
+def test_statement_splitter_keeps_dollar_bodies_whole():
+    splitter = StatementSplitter()
+    statements = splitter.feed("create procedure p() as $$ a; b $$;") + splitter.close()
+    assert statements == ["create procedure p() as $$ a; b $$"]
+
+
+def test_statement_object():
+    assert statement_object("create or replace secure view S.V as select 1") == ("VIEW", ("S", "V"))
+    assert statement_object("create or replace dynamic table DB.S.DT target_lag = '1 minute'")[0] == "DYNAMIC TABLE"
+    assert statement_object("create table if not exists T (ID NUMBER)") == ("TABLE", ("T",))
+    assert statement_object("select 1") == (None, ())
+
+
+def test_split_schema_ddl_keeps_only_requested_kinds():
+    definitions = split_schema_ddl(SCHEMA_SCRIPT, "analytics")
+    assert sorted(definitions) == ["ANALYTICS.DT1", "ANALYTICS.T1", "ANALYTICS.V1"]
+    kind, ddl = definitions["ANALYTICS.V1"]
+    assert kind == "VIEW"
+    assert ddl.endswith("WHERE NOTE <> ';';")
+
+
+def test_parse_ddl_dynamic_table():
+    definition = parse_ddl(DT_DDL)
+    assert definition.kind == "DYNAMIC TABLE"
+    assert definition.name == ("DB", "ANALYTICS", "ORDERS_DT")
+    assert definition.column_names == ["ID", "CODE"]
+    assert definition.target_lag == "5 minutes"
+    assert definition.warehouse == "COMPUTE_WH"
+    assert definition.refresh_mode == "AUTO"
+    assert definition.main_source == ("RAW", "ORDERS")
+    assert definition.projection == [
+        {"expression": "ID", "type": "NUMBER", "alias": "ID", "explicit_alias": False},
+        {"expression": "LEFT(CODE, 2)", "type": "VARCHAR", "alias": "CODE", "explicit_alias": True},
+    ]
+    assert definition.query.startswith("SELECT") and definition.query.endswith("FROM RAW.ORDERS")
+
+
+def test_parse_ddl_sources_skip_ctes():
+    definition = parse_ddl("create view V as with c as (select * from S.A) select x from c join S.B b on b.x = c.x;")
+    assert definition.sources == [("S", "A"), ("S", "B")]
+
+
+def test_identifier_key():
+    assert identifier_key("abc") == "ABC"
+    assert identifier_key('"ABC"') == "ABC"
+    assert identifier_key('"My Col"') == "My Col"
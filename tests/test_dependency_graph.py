@@ -0,0 +1,125 @@
+from utils.dependency_graph import DependencyGraph
+from conftest import FakeSnowflake
+
+
+def graph_of(edges):
+    graph = DependencyGraph("DB")
+    for node, dependencies in edges.items():
+        graph.set_sources(node, dependencies)
+    return graph
+
+
+def test_node_names_are_stored_names():
+    graph = DependencyGraph("DB")
+    assert graph.node("S", "T") == "S.T"
+    assert graph.node("S", "My View") == "S.My View"
+    assert graph.node("S", "T", "DB") == "S.T"
+    assert graph.node("S", "T", "OTHER") == "OTHER.S.T"
+
+
+def test_transitive_lookups_with_depth():
+    graph = graph_of({"S.V1": {"S.T"}, "S.V2": {"S.V1"}, "S.V3": {"S.V1", "S.T"}})
+    assert graph.downstream("S.T") == {"S.V1", "S.V3"}
+    assert graph.transitive_downstream("S.T") == {"S.V1": 1, "S.V3": 1, "S.V2": 2}
+    assert graph.transitive_upstream("S.V2") == {"S.V1": 1, "S.T": 2}
+
+
+def test_set_sources_replaces_edges_and_clears_memo():
+    graph = graph_of({"S.V1": {"S.T"}})
+    assert graph.transitive_downstream("S.T") == {"S.V1": 1}
+    graph.set_sources("S.V1", {"S.OTHER"})
+    assert graph.transitive_downstream("S.T") == {}
+    assert graph.upstream("S.V1") == {"S.OTHER"}
+
+
+def test_remove_keeps_edges_of_readers():
+    graph = graph_of({"S.V1": {"S.T"}, "S.V2": {"S.V1"}})
+    graph.remove("S.V1")
+    assert graph.upstream("S.V1") == set()
+    assert graph.downstream("S.V1") == {"S.V2"}
+
+
+def test_cycles():
+    graph = graph_of({"S.A": {"S.B"}, "S.B": {"S.C"}, "S.C": {"S.A"}, "S.D": {"S.D"}, "S.E": {"S.A"}})
+    assert graph.cycles() == [["S.A", "S.B", "S.C"], ["S.D"]]
+    assert "S.A" in graph.transitive_downstream("S.A")
+
+
+def test_parse_sources_resolves_unqualified_names():
+    graph = DependencyGraph("DB")
+    ddl = "create view V as select * from T join S2.U on 1 = 1 join OTHER.S3.W on 1 = 1;"
+    assert graph.parse_sources(ddl, "S1") == {"S1.T", "S2.U", "OTHER.S3.W"}
+
+
+def test_quoted_names_match_between_metadata_and_ddl():
+    graph = DependencyGraph("DB")
+    #ACCOUNT_USAGE/INFORMATION_SCHEMA give the stored names, the DDL the identifiers
+    assert graph.parse_sources('create view "My View" as select * from S."My Table" join s.t on 1 = 1;', "S") == {
+        graph.node("S", "My Table"), graph.node("S", "T"),
+    }
+
+
+def test_load_from_account_usage_and_from_definitions_agree():
+    catalog = FakeSnowflake()
+    from_usage = DependencyGraph(catalog.DATABASE)
+    assert from_usage.load(catalog)["source"] == "account_usage"
+    from_ddl = DependencyGraph(catalog.DATABASE)
+    assert from_ddl.load(FakeSnowflake(account_usage=False))["source"] == "ddl"
+
+    for schema in catalog.SCHEMAS:
+        for obj_type in ("View", "Dynamic Table"):
+            for name in catalog.names(schema, obj_type):
+                node = from_usage.node(schema, name)
+                assert from_usage.upstream(node) == from_ddl.upstream(node) == {from_usage.node(*catalog.source_of(schema, name))}
+
+
+class FakeSession:
+    #ACCOUNT_USAGE rows with a quoted mixed-case dependent, GET_DDL of it after a redeploy
+    def __init__(self, ddls):
+        self.ddls = ddls
+
+    def get_current_account(self):
+        return "ACCOUNT"
+
+    def get_current_role(self):
+        return "ROLE"
+
+    def get_current_database(self):
+        return "DB"
+
+    def sql(self, query):
+        return FakeQuery(self, query)
+
+
+class FakeQuery:
+    def __init__(self, session, query):
+        self.session = session
+        self.query = query
+
+    def collect(self, statement_params=None):
+        if "OBJECT_DEPENDENCIES" in self.query:
+            return [{
+                "REFERENCING_SCHEMA": "S", "REFERENCING_OBJECT_NAME": "My View", "REFERENCING_OBJECT_DOMAIN": "VIEW",
+                "REFERENCED_DATABASE": "DB", "REFERENCED_SCHEMA": "S", "REFERENCED_OBJECT_NAME": "T", "REFERENCED_OBJECT_DOMAIN": "TABLE",
+            }]
+        for name, ddl in self.session.ddls.items():
+            if name in self.query:
+                return [[ddl]]
+        raise RuntimeError(f"Unexpected query: {self.query}")
+
+
+def test_redeployed_quoted_dependent_is_patched_in_place():
+    from utils.data_provider import RealDataProvider
+
+    class Provider(RealDataProvider):
+        session = FakeSession({"My View": 'create or replace view S."My View" as select * from S.U;'})
+
+    provider = Provider()
+    graph = provider.get_dependency_graph()
+    assert graph.downstream("S.T") == {"S.My View"}
+
+    provider.invalidate("S", '"My View"', "View")
+    graph = provider.get_dependency_graph()
+    assert graph.upstream("S.My View") == {"S.U"}
+    assert graph.downstream("S.T") == set()
+    assert "S.MY VIEW" not in graph.downstream("S.U")
@@ -0,0 +1,77 @@
+import time
+
+from utils.deploy_engine import DeployItem, LocalSession, build_graph, topological_waves, deploy_batch
+
+
+def table(name):
+    return DeployItem("S", name, "Table", f"create or replace table S.{name} (ID NUMBER);")
+
+
+def view(name, *sources, schema="S"):
+    joins = " join ".join(sources)
+    return DeployItem(schema, name, "View", f"create or replace view {schema}.{name} as select 1 as ID from {joins};")
+
+
+#T <- V1 <- V2 <- V3, T <- V4, and W reads an object outside the batch
+BATCH = [view("V3", "S.V2"), view("V2", "V1"), view("V1", "S.T"), table("T"), view("V4", "T"), view("W", "OTHER.X")]
+
+
+def test_graph_keeps_only_edges_inside_the_batch():
+    graph = build_graph(BATCH)
+    assert graph == {"S.V3": {"S.V2"}, "S.V2": {"S.V1"}, "S.V1": {"S.T"}, "S.T": set(), "S.V4": {"S.T"}, "S.W": set()}
+
+
+def test_topological_waves():
+    waves, cycle = topological_waves(build_graph(BATCH))
+    assert waves == [["S.T", "S.W"], ["S.V1", "S.V4"], ["S.V2"], ["S.V3"]]
+    assert cycle == set()
+
+
+def test_cycle_is_not_ordered():
+    waves, cycle = topological_waves({"A": {"B"}, "B": {"A"}, "C": set(), "D": {"A"}})
+    assert waves == [["C"]]
+    assert cycle == {"A", "B", "D"}
+
+
+def test_deploy_runs_dependencies_first():
+    session = LocalSession()
+    results = deploy_batch(session, BATCH)
+    assert [result["status"] for result in results] == ["success"] * len(BATCH)
+    order = [next(item.fq_name for item in BATCH if item.ddl == query) for query in session.executed]
+    for name, deps in build_graph(BATCH).items():
+        assert all(order.index(dep) < order.index(name) for dep in deps)
+
+
+def test_failure_skips_transitive_dependents_only():
+    session = LocalSession(fail_when=["S.V1 as"])
+    results = {result["name"]: result for result in deploy_batch(session, BATCH)}
+    assert results["S.V1"]["status"] == "failed"
+    assert "Simulated failure" in results["S.V1"]["error"]
+    assert results["S.V2"]["status"] == "skipped"
+    assert results["S.V2"]["error"] == "Upstream not deployed: S.V1"
+    assert results["S.V3"]["status"] == "skipped"
+    assert {results[name]["status"] for name in ("S.T", "S.V4", "S.W")} == {"success"}
+    assert len(session.executed) == 3
+
+
+def test_unchanged_objects_are_not_executed_but_unblock_dependents():
+    session = LocalSession()
+    results = {result["name"]: result for result in deploy_batch(session, BATCH, unchanged={"S.T", "S.V1"})}
+    assert results["S.T"]["status"] == results["S.V1"]["status"] == "unchanged"
+    assert results["S.V2"]["status"] == "success"
+    assert len(session.executed) == len(BATCH) - 2
+
+
+def test_cycle_members_are_reported_not_run():
+    items = [view("A", "S.B"), view("B", "S.A"), table("T")]
+    session = LocalSession()
+    results = {result["name"]: result["status"] for result in deploy_batch(session, items)}
+    assert results == {"S.A": "cycle", "S.B": "cycle", "S.T": "success"}
+    assert len(session.executed) == 1
+
+
+def test_a_wave_runs_concurrently():
+    items = [table(f"T{k}") for k in range(8)]
+    started = time.perf_counter()
+    deploy_batch(LocalSession(latency=0.1), items, max_workers=8)
+    assert time.perf_counter() - started < 0.5
@@ -0,0 +1,48 @@
+import os
+
+from utils.disk_cache import DiskCache
+
+
+def key(schema, obj, method, *args):
+    return ("ACCOUNT", "ROLE", "DB", schema, obj, method, args, ())
+
+
+def payload_size(cache):
+    return cache._connection().execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+
+def test_round_trip_and_stats(tmp_path):
+    cache = DiskCache(os.path.join(tmp_path, "cache.sqlite"))
+    assert cache.get(key("S", "T", "get_columns")) == (False, None)
+    assert cache.set(key("S", "T", "get_columns"), [("ID", "NUMBER", "N")])
+    assert cache.get(key("S", "T", "get_columns")) == (True, [["ID", "NUMBER", "N"]])
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert not cache.set(key("S", "T", "get_columns"), object())
+
+
+def test_invalidate_keeps_the_running_size_in_step(tmp_path):
+    cache = DiskCache(os.path.join(tmp_path, "cache.sqlite"))
+    cache.set(key("S", "", "get_tables"), ["T", "U"])
+    cache.set(key("S", "T", "get_columns"), ["x" * 100])
+    cache.set(key("S", "U", "get_columns"), ["y" * 200])
+    cache.set(key("S2", "V", "get_columns"), ["z" * 300])
+    assert cache._bytes == payload_size(cache)
+
+    #Object level: the object and the schema level lists
+    assert cache.invalidate("s", "t") == 2
+    assert cache._bytes == payload_size(cache)
+    assert cache.get(key("S", "U", "get_columns"))[0]
+
+    assert cache.invalidate("S") == 1
+    assert cache._bytes == payload_size(cache)
+    assert cache.invalidate() == 1
+    assert cache._bytes == 0
+
+
+def test_invalidate_drops_cross_object_results(tmp_path):
+    cache = DiskCache(os.path.join(tmp_path, "cache.sqlite"))
+    cache.set(("ACCOUNT", "ROLE", "DB", None, None, "get_plan", ("SELECT 1",), ()), "{}")
+    cache.set(("ACCOUNT", "ROLE", "DB", None, None, "get_schemas", ("DB",), ()), ["S"])
+    cache.set(key("foo", "", "get_tables"), ["T"])
+    assert cache.invalidate('"foo"', "T") == 2
+    assert cache._bytes == payload_size(cache)
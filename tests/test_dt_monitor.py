@@ -0,0 +1,44 @@
+from utils.dt_monitor import fetch_history, summarize, percentile
+from conftest import FakeSnowflake
+
+
+NOW = 1717200000 #2024-06-01 00:00 UTC
+
+
+def fake_run():
+    session = FakeSnowflake()
+    return session, lambda query: session.sql(query).collect()
+
+
+def test_one_window_when_under_the_limit():
+    session, run = fake_run()
+    history = fetch_history(run, "DB", days=2, now=NOW)
+    assert session.queries == 1
+    assert not history["truncated"]
+    assert history["records"]
+
+
+def test_full_windows_are_split_until_everything_is_read():
+    _, run = fake_run()
+    complete = fetch_history(run, "DB", days=3, now=NOW)["records"]
+
+    session, run = fake_run()
+    paged = fetch_history(run, "DB", days=3, limit=50, now=NOW)
+    assert session.queries > 1
+    assert not paged["truncated"]
+    assert paged["records"] == complete
+
+
+def test_truncation_is_reported_when_a_minimal_window_is_full():
+    _, run = fake_run()
+    history = fetch_history(run, "DB", days=1, limit=2, now=NOW)
+    assert history["truncated"]
+
+
+def test_summarize_and_percentile():
+    assert percentile([1, 2, 3, 4], 50) == 2.5
+    assert percentile([], 90) is None
+    _, run = fake_run()
+    summaries = summarize(fetch_history(run, "DB", days=1, now=NOW)["records"])
+    assert [summary["busy_s"] for summary in summaries] == sorted((summary["busy_s"] for summary in summaries), reverse=True)
+    assert all(summary["refreshes"] == 24 for summary in summaries)
@@ -0,0 +1,24 @@
+import os
+
+import pytest
+
+from utils.git_manager import GitBackend, LocalGitBackend
+
+
+def test_backend_is_abstract():
+    with pytest.raises(TypeError):
+        GitBackend("main")
+
+
+def test_local_backend_commits_many_files_at_once(tmp_path):
+    backend = LocalGitBackend(os.path.join(tmp_path, "repo.git"))
+    assert backend.read("S/views/V.sql") is None
+
+    files = {"S/views/V.sql": "create view V as select 1;\n", "S/tables/T.sql": "create table T (ID NUMBER);\n"}
+    assert backend.commit_files(files, "two files").startswith("Success! Committed 2 files to main")
+    assert backend.read("S/views/V.sql") == "create view V as select 1;\n"
+
+    assert backend.commit_files({"S/views/V.sql": "create view V as select 2;\n"}, "update").startswith("Success!")
+    assert backend.read("S/views/V.sql") == "create view V as select 2;\n"
+    assert backend.read("S/tables/T.sql") == "create table T (ID NUMBER);\n"
+    assert backend.commit_files({}, "nothing") == "Success! Nothing to commit."
@@ -0,0 +1,59 @@
+import os
+
+from utils.plan_check import parse_explain_json, check_plan, thresholds_from_env, format_bytes, DEFAULT_THRESHOLDS
+
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def explain(name):
+    with open(os.path.join(FIXTURES, f"explain_{name}.json"), encoding="utf-8") as f:
+        return parse_explain_json(f.read())
+
+
+def test_parse_pruned_scan():
+    estimate = explain("pruned")
+    assert (estimate.partitions_total, estimate.partitions_assigned, estimate.bytes_assigned) == (4096, 12, 50331648)
+    assert estimate.scans == [{"object": "DB.RAW.ORDERS", "partitions_total": 4096, "partitions_assigned": 12, "bytes_assigned": 50331648}]
+    assert estimate.joins == []
+    assert estimate.operations == 3
+    assert round(estimate.scan_ratio, 4) == 0.0029
+    assert check_plan(estimate) == []
+
+
+def test_parse_join_and_full_scans():
+    estimate = explain("full_scan_join")
+    assert [scan["object"] for scan in estimate.scans] == ["DB.RAW.ORDERS", "DB.RAW.CUSTOMERS"]
+    assert estimate.joins == [{"operation": "InnerJoin", "expressions": "joinKey: (C.ID = O.CUSTOMER_ID)"}]
+    findings = check_plan(estimate)
+    assert [level for level, _ in findings] == ["warning", "warning", "warning"]
+    assert findings[0][1].startswith("Full scan of DB.RAW.ORDERS: 4,096 of 4,096 partitions")
+    assert findings[2][1] == "Reads 20.0 GB, above the 10.0 GB threshold"
+
+
+def test_cartesian_join_is_an_error_and_small_scans_are_ignored():
+    findings = check_plan(explain("cartesian"))
+    assert findings == [("error", "Cartesian join (no join condition): every row with every row")]
+
+
+def test_thresholds():
+    estimate = explain("full_scan_join")
+    relaxed = dict(DEFAULT_THRESHOLDS, min_partitions=2000, max_bytes=30 * 1024 ** 3)
+    assert [message.split(":")[0] for _, message in check_plan(estimate, relaxed)] == ["Full scan of DB.RAW.ORDERS"]
+    strict = dict(DEFAULT_THRESHOLDS, full_scan_ratio=0.001)
+    assert len(check_plan(explain("pruned"), dict(strict, min_partitions=1))) == 1
+
+
+def test_thresholds_from_env(monkeypatch):
+    monkeypatch.setenv("IGLOO_PLAN_FULL_SCAN_RATIO", "0.5")
+    monkeypatch.setenv("IGLOO_PLAN_MIN_PARTITIONS", "10")
+    monkeypatch.setenv("IGLOO_PLAN_MAX_GB", "1.5")
+    assert thresholds_from_env() == {"full_scan_ratio": 0.5, "min_partitions": 10, "max_bytes": int(1.5 * 1024 ** 3)}
+    monkeypatch.delenv("IGLOO_PLAN_MAX_GB")
+    assert thresholds_from_env()["max_bytes"] == DEFAULT_THRESHOLDS["max_bytes"]
+
+
+def test_format_bytes():
+    assert format_bytes(512) == "512 B"
+    assert format_bytes(1536) == "1.5 KB"
+    assert format_bytes(3 * 1024 ** 5) == "3072.0 TB"
@@ -0,0 +1,67 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.query_profiler import instrument, start_run, current_run, query_tag, normalize_sql, submit_in_context
+
+
+class RecordingFrame:
+    def __init__(self, calls):
+        self.calls = calls
+
+    def collect(self, statement_params=None):
+        self.calls.append(statement_params)
+        return [1, 2]
+
+    def to_pandas_batches(self, statement_params=None):
+        self.calls.append(statement_params)
+        return iter([[1, 2], [3]])
+
+
+class RecordingSession:
+    def __init__(self):
+        self.calls = []
+
+    def sql(self, query):
+        return RecordingFrame(self.calls)
+
+
+def test_each_query_is_tagged_without_touching_the_session():
+    session = RecordingSession()
+    start_run("Create")
+    instrument(session).sql("select 1").collect()
+    instrument(session).sql("select 2").collect(statement_params={"QUERY_TAG": "own", "X": 1})
+    assert session.calls == [{"QUERY_TAG": query_tag("Create")}, {"QUERY_TAG": "own", "X": 1}]
+    assert not hasattr(session, "query_tag")
+    assert current_run().summary()["queries"] == 2
+
+
+def test_normalize_sql_folds_literals_and_case():
+    assert normalize_sql("describe table a.b where x = 'y' and n = 1") == normalize_sql("DESCRIBE TABLE A.B WHERE X = 'z' AND N = 22")
+
+
+def open_batches(session):
+    return instrument(session).sql("select 3").to_pandas_batches()
+
+
+def test_batches_are_attributed_to_the_call_not_the_reader():
+    session = RecordingSession()
+    run = start_run("Create")
+    batches = open_batches(session)
+    #The query is submitted on the call, before any batch is read
+    assert session.calls == [{"QUERY_TAG": query_tag("Create")}]
+    start_run("Other")
+    assert sum(len(batch) for batch in batches) == 3
+    (record,) = run.queries()
+    assert record["rows"] == 3
+    assert record["caller"].startswith("tests/test_query_profiler.py:open_batches:")
+    assert not current_run().queries()
+
+
+def test_pool_tasks_record_into_the_callers_run():
+    session = RecordingSession()
+    run = start_run("Deploy")
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        futures = [submit_in_context(pool, lambda n: instrument(session).sql(f"select {n}").collect(), n) for n in range(3)]
+        for future in futures:
+            future.result()
+    assert run.summary()["queries"] == 3
+    assert session.calls == [{"QUERY_TAG": query_tag("Deploy")}] * 3
@@ -0,0 +1,204 @@
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+
+from utils import query_profiler
+from utils.ddl_parser import identifier_key
+
+
+#How long (seconds) each kind of metadata stays fresh. Schemas rarely change, columns/DDL change on every deploy
+DEFAULT_TTLS = {
+    "get_schemas": 600,
+    "get_tables": 300,
+    "get_views": 300,
+    "get_columns": 120,
+    "get_ddl": 120,
+    "get_schema_ddls": 120,
+    "get_object_definition": 120,
+    "get_plan": 300,
+    "get_refresh_history": 300, #refreshes land every TARGET_LAG, a few minutes behind is fine for a dashboard
+}
+DEFAULT_MAX_ENTRIES = 2048
+
+#Database scoped results that depend on the objects they read (an EXPLAIN plan, the refresh history):
+#invalidating any schema/object drops them too, a deploy must not leave the pre-deploy plan behind
+CROSS_OBJECT_METHODS = ("get_plan", "get_refresh_history")
+
+#Disk hits are refreshed in the background, a few threads are plenty (each refresh is one metadata query)
+_refresh_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="igloo-cache-refresh")
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+
+class MetadataCache:
+    """
+    Small in-memory TTL + LRU cache for catalog metadata.
+    Keys look like: (account, role, database, schema, object, method, args)
+    so entries can be evicted per schema/object after a deploy.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict() #key -> (expires_at, value), the order is the LRU order (oldest first)
+        self._lock = threading.RLock() #streamlit runs every user session in its own thread
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        #Returns (found, value) - value can be legitimately None, so need the flag
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return False, None
+
+            self._entries.move_to_end(key) #mark as recently used
+            self.hits += 1
+            return True, value
+
+    def peek(self, key):
+        #Like get, but not a lookup of its own: no hit/miss counted, the LRU order is left alone
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                return False, None
+            return True, entry[1]
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False) #drop the least recently used
+                self.evictions += 1
+
+    def invalidate(self, schema_name=None, obj_name=None):
+        #schema only -> drop everything in the schema, schema + object -> drop the object and the schema level lists (SHOW TABLES/VIEWS)
+        #nothing -> drop everything. CROSS_OBJECT_METHODS results go with any schema/object
+        schema_key = _norm(schema_name)
+        obj_key = _norm(obj_name)
+
+        with self._lock:
+            if schema_key is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                return removed
+
+            to_remove = [
+                key for key in self._entries
+                if (key[3] == schema_key and (obj_key is None or key[4] in (None, obj_key))) or key[5] in CROSS_OBJECT_METHODS
+            ]
+            for key in to_remove:
+                del self._entries[key]
+            return len(to_remove)
+
+    def clear(self):
+        self.invalidate()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+def _norm(identifier):
+    #Same key as the provider everywhere else: unquoted -> upper case, "quoted" -> exact ("foo" and FOO are two objects)
+    if identifier is None:
+        return None
+    return identifier_key(str(identifier))
+
+
+def cached(scope="object", ttl=None):
+    """
+    Decorator for data provider methods.
+    scope tells which positional args are the schema/object:
+      'database' -> no schema/object part (e.g. get_schemas(db_name))
+      'schema'   -> first arg is the schema (e.g. get_tables(schema_name))
+      'object'   -> first arg is the schema, second is the object (e.g. get_columns(schema_name, obj_name, ...))
+    The owner needs a `cache` (MetadataCache) and a `cache_context()` returning (account, role, database).
+    An optional `disk_cache` (utils/disk_cache.py) is the second level: a disk hit is returned right away
+    (e.g. first render after a restart) and the call is re-run in the background to validate it.
+    """
+    def decorator(method):
+        method_ttl = ttl if ttl is not None else DEFAULT_TTLS.get(method.__name__, 120)
+
+        def _key(self, args, kwargs):
+            if scope == "database":
+                schema_key, obj_key, rest = None, None, args
+            elif scope == "schema":
+                schema_key, obj_key, rest = _norm(args[0]), None, args[1:]
+            else:
+                schema_key, obj_key, rest = _norm(args[0]), _norm(args[1]), args[2:]
+            return self.cache_context() + (schema_key, obj_key, method.__name__, rest, tuple(sorted(kwargs.items())))
+
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            key = _key(self, args, kwargs)
+
+            found, value = self.cache.get(key)
+            if found:
+                query_profiler.record_cache_hit(method.__name__)
+                return value
+
+            disk_cache = getattr(self, "disk_cache", None)
+            if disk_cache is not None:
+                found, value = disk_cache.get(key)
+                if found:
+                    query_profiler.record_cache_hit(f"{method.__name__} (disk)")
+                    self.cache.set(key, value, method_ttl)
+                    _refresh_in_background(self, key, method, args, kwargs, method_ttl)
+                    return value
+
+            with query_profiler.cache_miss(method.__name__):
+                value = method(self, *args, **kwargs)
+            self.cache.set(key, value, method_ttl)
+            if disk_cache is not None:
+                disk_cache.set(key, value)
+            return value
+
+        def peek(self, *args, **kwargs):
+            #(found, value) of what the cache holds right now, never computes and doesn't count in the hit ratio
+            return self.cache.peek(_key(self, args, kwargs))
+
+        wrapper.uncached = method #escape hatch to bypass the cache
+        wrapper.peek = peek
+        return wrapper
+
+    return decorator
+
+
+def _refresh_in_background(owner, key, method, args, kwargs, ttl):
+    #Re-run a call served from disk, the fresh value replaces it in both levels (once per key at a time)
+    with _refreshing_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+
+    def refresh():
+        try:
+            value = method(owner, *args, **kwargs)
+            owner.cache.set(key, value, ttl)
+            owner.disk_cache.set(key, value)
+        except Exception:
+            pass #keep the disk value, the next miss tries again
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(key)
+
+    _refresh_pool.submit(refresh)
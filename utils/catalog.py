@@ -0,0 +1,309 @@
+import time
+import threading
+from datetime import datetime
+
+
+#Tables + views of a schema/database in one query (views are in INFORMATION_SCHEMA.TABLES too, with TABLE_TYPE = 'VIEW')
+OBJECTS_QUERY = """
+SELECT TABLE_SCHEMA, TABLE_NAME, TABLE_TYPE, IS_DYNAMIC, LAST_ALTERED
+FROM {database}.INFORMATION_SCHEMA.TABLES
+WHERE TABLE_SCHEMA <> 'INFORMATION_SCHEMA'{schema_filter}
+ORDER BY TABLE_SCHEMA, TABLE_NAME
+"""
+
+#Incremental refresh: {filter} is OR-ed (TABLE_SCHEMA = '..' [AND LAST_ALTERED >= '..'::TIMESTAMP_LTZ] [AND TABLE_NAME IN (..)]) groups
+CHANGED_OBJECTS_QUERY = """
+SELECT TABLE_SCHEMA, TABLE_NAME, TABLE_TYPE, IS_DYNAMIC, LAST_ALTERED
+FROM {database}.INFORMATION_SCHEMA.TABLES
+WHERE {filter}
+"""
+OBJECT_NAMES_QUERY = """
+SELECT TABLE_SCHEMA, TABLE_NAME
+FROM {database}.INFORMATION_SCHEMA.TABLES
+WHERE {filter}
+"""
+OBJECT_COLUMNS_QUERY = """
+SELECT TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, DATA_TYPE, IS_NULLABLE,
+       CHARACTER_MAXIMUM_LENGTH, NUMERIC_PRECISION, NUMERIC_SCALE, DATETIME_PRECISION
+FROM {database}.INFORMATION_SCHEMA.COLUMNS
+WHERE {filter}
+ORDER BY TABLE_SCHEMA, TABLE_NAME, ORDINAL_POSITION
+"""
+#Names per IN list, keeps the statements a sane size when many objects changed at once
+REFRESH_CHUNK = 500
+
+#Every column of a schema/database in one query, in the same order as DESCRIBE would return them
+COLUMNS_QUERY = """
+SELECT TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, DATA_TYPE, IS_NULLABLE,
+       CHARACTER_MAXIMUM_LENGTH, NUMERIC_PRECISION, NUMERIC_SCALE, DATETIME_PRECISION
+FROM {database}.INFORMATION_SCHEMA.COLUMNS
+WHERE TABLE_SCHEMA <> 'INFORMATION_SCHEMA'{schema_filter}
+ORDER BY TABLE_SCHEMA, TABLE_NAME, ORDINAL_POSITION
+"""
+
+VIEW_TYPES = ("VIEW", "MATERIALIZED VIEW")
+
+
+class CatalogSnapshot:
+    """
+    In-memory index of the TABLES/VIEWS/COLUMNS of a database (or some of its schemas).
+    Loaded with 2 set based queries per load, after that every lookup is a dict access.
+    Lists are kept in name order, same as SHOW TABLES/VIEWS.
+    Every object's LAST_ALTERED is kept, the newest one per schema is the high-water mark refresh() starts from.
+    """
+
+    def __init__(self, database):
+        self.database = database
+        self._schemas = {} #SCHEMA -> {'all': [...], 'normal': [...], 'dynamic': [...], 'views': [...]}
+        self._columns = {} #(SCHEMA, OBJECT) -> [(name, type, null?)]
+        self._altered = {} #(SCHEMA, OBJECT) -> LAST_ALTERED (ISO string)
+        self._watermarks = {} #SCHEMA -> newest LAST_ALTERED of the schema (ISO string)
+        self._lock = threading.RLock()
+
+    def load(self, session, schema_name=None):
+        #schema_name=None -> whole database
+        schema_filter = ""
+        if schema_name is not None:
+            schema_filter = f"\n  AND TABLE_SCHEMA = '{schema_name}'"
+
+        object_rows = session.sql(OBJECTS_QUERY.format(database=self.database, schema_filter=schema_filter)).collect()
+        column_rows = session.sql(COLUMNS_QUERY.format(database=self.database, schema_filter=schema_filter)).collect()
+
+        schemas = {}
+        if schema_name is not None:
+            schemas[schema_name.upper()] = _empty_schema() #an empty schema is still "loaded"
+
+        altered = {}
+        for row in object_rows:
+            entry = schemas.setdefault(row["TABLE_SCHEMA"].upper(), _empty_schema())
+            _add_object(entry, row)
+            altered[(row["TABLE_SCHEMA"].upper(), row["TABLE_NAME"].upper())] = _timestamp(row["LAST_ALTERED"])
+
+        columns = _columns_by_object(column_rows)
+
+        with self._lock:
+            if schema_name is None:
+                self._schemas = schemas
+                self._columns = columns
+                self._altered = altered
+                self._watermarks = {}
+            else:
+                self.forget(schema_name)
+                self._schemas.update(schemas)
+                self._columns.update(columns)
+                self._altered.update(altered)
+            for (schema_key, _), last_altered in altered.items():
+                self._watermarks[schema_key] = _newest(self._watermarks.get(schema_key), last_altered)
+
+    def refresh(self, session):
+        """
+        Brings every loaded schema up to date with about 3 queries, whatever the size of the catalog:
+          objects with LAST_ALTERED >= the schema's high-water mark (new or changed), their columns only,
+          and the names of all objects (a missing name is a drop, dropping doesn't touch LAST_ALTERED of anything).
+        Note: DML bumps a table's LAST_ALTERED too, so tables that are loaded often come back as changed.
+        Returns {'changed': [(SCHEMA, NAME, obj_type)], 'dropped': [...], 'queries', 'seconds'}, obj_type as the app names it.
+        """
+        started = time.perf_counter()
+        with self._lock:
+            schema_keys = sorted(self._schemas)
+            watermarks = dict(self._watermarks)
+            known = dict(self._altered)
+            listed = {(schema_key, name.upper()) for schema_key in schema_keys
+                      for kind in ("all", "views") for name in self._schemas[schema_key][kind]}
+        result = {"changed": [], "dropped": [], "queries": 0, "seconds": 0.0}
+        if not schema_keys:
+            return result
+
+        #1. New or altered since the mark (>=: an object altered in the same instant as the mark isn't lost, equal values are skipped below)
+        groups = []
+        for schema_key in schema_keys:
+            mark = watermarks.get(schema_key)
+            if mark is None:
+                groups.append(f"(TABLE_SCHEMA = {_literal(schema_key)})")
+            else:
+                groups.append(f"(TABLE_SCHEMA = {_literal(schema_key)} AND LAST_ALTERED >= {_literal(mark)}::TIMESTAMP_LTZ)")
+        rows = session.sql(CHANGED_OBJECTS_QUERY.format(database=self.database, filter=" OR ".join(groups))).collect()
+        result["queries"] += 1
+        changed_rows = [
+            row for row in rows
+            if known.get((row["TABLE_SCHEMA"].upper(), row["TABLE_NAME"].upper())) != _timestamp(row["LAST_ALTERED"])
+        ]
+
+        #2. Drops: the name sets
+        groups = [f"(TABLE_SCHEMA = {_literal(schema_key)})" for schema_key in schema_keys]
+        name_rows = session.sql(OBJECT_NAMES_QUERY.format(database=self.database, filter=" OR ".join(groups))).collect()
+        result["queries"] += 1
+        existing = {(row["TABLE_SCHEMA"].upper(), row["TABLE_NAME"].upper()) for row in name_rows}
+        dropped = sorted(listed - existing)
+
+        #3. Columns of the changed objects only
+        by_schema = {}
+        for row in changed_rows:
+            by_schema.setdefault(row["TABLE_SCHEMA"], []).append(row["TABLE_NAME"])
+        column_rows = []
+        for schema, names in by_schema.items():
+            for start in range(0, len(names), REFRESH_CHUNK):
+                chunk = ", ".join(_literal(name) for name in names[start:start + REFRESH_CHUNK])
+                filter_sql = f"(TABLE_SCHEMA = {_literal(schema)} AND TABLE_NAME IN ({chunk}))"
+                column_rows += session.sql(OBJECT_COLUMNS_QUERY.format(database=self.database, filter=filter_sql)).collect()
+                result["queries"] += 1
+        columns = _columns_by_object(column_rows)
+
+        with self._lock:
+            for schema_key, name_key in dropped:
+                entry = self._schemas.get(schema_key)
+                if entry is None:
+                    continue
+                result["dropped"].append((schema_key, name_key, _remove_object(entry, name_key)))
+                self._columns.pop((schema_key, name_key), None)
+                self._altered.pop((schema_key, name_key), None)
+
+            for row in changed_rows:
+                schema_key, name_key = row["TABLE_SCHEMA"].upper(), row["TABLE_NAME"].upper()
+                entry = self._schemas.get(schema_key)
+                if entry is None:
+                    continue #forgotten while we were querying
+                _remove_object(entry, name_key) #type may have changed (e.g. a view replaced by a table)
+                result["changed"].append((schema_key, name_key, _add_object(entry, row)))
+                for names in entry.values():
+                    names.sort()
+                self._columns[(schema_key, name_key)] = columns.get((schema_key, name_key), [])
+                last_altered = _timestamp(row["LAST_ALTERED"])
+                self._altered[(schema_key, name_key)] = last_altered
+                self._watermarks[schema_key] = _newest(self._watermarks.get(schema_key), last_altered)
+
+        result["seconds"] = round(time.perf_counter() - started, 4)
+        return result
+
+    def schemas(self):
+        return sorted(self._schemas)
+
+    def to_dict(self):
+        #JSON friendly copy, e.g. to compile specs offline against a saved catalog
+        with self._lock:
+            return {
+                "database": self.database,
+                "schemas": {schema: dict(entry) for schema, entry in self._schemas.items()},
+                "columns": [[schema, obj, [list(column) for column in columns]] for (schema, obj), columns in self._columns.items()],
+                "altered": [[schema, obj, last_altered] for (schema, obj), last_altered in self._altered.items()],
+                "watermarks": dict(self._watermarks),
+            }
+
+    @classmethod
+    def from_dict(cls, data):
+        snapshot = cls(data["database"])
+        snapshot._schemas = {schema: {kind: list(names) for kind, names in entry.items()} for schema, entry in data["schemas"].items()}
+        snapshot._columns = {(schema, obj): [tuple(column) for column in columns] for schema, obj, columns in data["columns"]}
+        #Snapshots saved before the high-water marks: refresh() then re-reads those schemas in full once
+        snapshot._altered = {(schema, obj): last_altered for schema, obj, last_altered in data.get("altered", [])}
+        snapshot._watermarks = dict(data.get("watermarks", {}))
+        return snapshot
+
+    def watermark(self, schema_name):
+        return self._watermarks.get(schema_name.upper())
+
+    def has_schema(self, schema_name):
+        return schema_name.upper() in self._schemas
+
+    def forget(self, schema_name):
+        #Drop a schema from the index (e.g. after a deploy), next access has to reload it
+        schema_key = schema_name.upper()
+        with self._lock:
+            self._schemas.pop(schema_key, None)
+            for key in [key for key in self._columns if key[0] == schema_key]:
+                del self._columns[key]
+            for key in [key for key in self._altered if key[0] == schema_key]:
+                del self._altered[key]
+            self._watermarks.pop(schema_key, None)
+
+    def get_tables(self, schema_name, obj_type='all'):
+        return list(self._schemas[schema_name.upper()][obj_type])
+
+    def get_views(self, schema_name):
+        return list(self._schemas[schema_name.upper()]["views"])
+
+    def get_columns(self, schema_name, obj_name):
+        #None -> not in the snapshot (e.g. created after the load)
+        columns = self._columns.get((schema_name.upper(), obj_name.upper()))
+        return list(columns) if columns is not None else None
+
+    def stats(self):
+        return {
+            "schemas": len(self._schemas),
+            "objects": sum(len(s["all"]) + len(s["views"]) for s in self._schemas.values()),
+            "columns": sum(len(c) for c in self._columns.values()),
+        }
+
+
+def _empty_schema():
+    return {"all": [], "normal": [], "dynamic": [], "views": []}
+
+
+def _add_object(entry, row):
+    #Files an INFORMATION_SCHEMA.TABLES row into the schema's lists, returns the app's type name
+    name = row["TABLE_NAME"]
+    if row["TABLE_TYPE"] in VIEW_TYPES:
+        entry["views"].append(name)
+        return "View"
+    #SHOW TABLES returns dynamic tables as well, so 'all' has both
+    entry["all"].append(name)
+    if row["IS_DYNAMIC"] == "YES":
+        entry["dynamic"].append(name)
+        return "Dynamic Table"
+    entry["normal"].append(name)
+    return "Table"
+
+
+def _remove_object(entry, name_key):
+    #Returns the type the object had (None if it wasn't there)
+    obj_type = None
+    for kind, names in entry.items():
+        kept = [name for name in names if name.upper() != name_key]
+        if len(kept) != len(names):
+            names[:] = kept
+            obj_type = obj_type or {"views": "View", "dynamic": "Dynamic Table", "normal": "Table"}.get(kind)
+    return obj_type
+
+
+def _columns_by_object(column_rows):
+    columns = {}
+    for row in column_rows:
+        key = (row["TABLE_SCHEMA"].upper(), row["TABLE_NAME"].upper())
+        columns.setdefault(key, []).append((
+            row["COLUMN_NAME"],
+            _describe_type(row),
+            "Y" if row["IS_NULLABLE"] == "YES" else "N", #same Y/N format as DESCRIBE's null? column
+        ))
+    return columns
+
+
+def _timestamp(value):
+    #LAST_ALTERED comes back as a datetime, kept as ISO text (JSON friendly, and a literal Snowflake parses)
+    if value is None:
+        return None
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+def _newest(first, second):
+    if first is None or second is None:
+        return first or second
+    return max(first, second, key=datetime.fromisoformat)
+
+
+def _literal(value):
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+#INFORMATION_SCHEMA splits the type into DATA_TYPE + precision columns, DESCRIBE returns them together (NUMBER(38,0), VARCHAR(16777216))
+#Build the DESCRIBE format, so the editors see the same types in both modes
+def _describe_type(row):
+    data_type = row["DATA_TYPE"]
+    if data_type == "TEXT":
+        return f"VARCHAR({row['CHARACTER_MAXIMUM_LENGTH']})"
+    if data_type == "BINARY":
+        return f"BINARY({row['CHARACTER_MAXIMUM_LENGTH']})"
+    if data_type == "NUMBER":
+        return f"NUMBER({row['NUMERIC_PRECISION']},{row['NUMERIC_SCALE']})"
+    if data_type in ("TIME", "TIMESTAMP_NTZ", "TIMESTAMP_LTZ", "TIMESTAMP_TZ") and row["DATETIME_PRECISION"] is not None:
+        return f"{data_type}({row['DATETIME_PRECISION']})"
+    return data_type
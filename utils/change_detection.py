@@ -0,0 +1,189 @@
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.ddl_parser import parse_ddl, tokenize, identifier_key, WORD, QUOTED, OP
+
+
+#Only the properties the editors generate are compared. GET_DDL adds defaults (refresh_mode = AUTO, initialize = ON_CREATE)
+#that our DDL never has, they must not count as a change
+COMPARED_PROPERTIES = ("TARGET_LAG", "WAREHOUSE")
+
+GIT_READ_WORKERS = 8 #file reads are HTTP round trips (GitHub) or git processes (local), they overlap well
+
+#Snowflake stores the full type, GET_DDL gives it back that way: NUMBER -> NUMBER(38,0), VARCHAR -> VARCHAR(16777216)
+#Map the short forms to the stored ones so 'ID NUMBER' and 'ID NUMBER(38,0)' hash the same (spaced like _canonical joins tokens)
+_TYPE_DEFAULTS = {
+    "NUMBER": "NUMBER ( 38 , 0 )", "DECIMAL": "NUMBER ( 38 , 0 )", "NUMERIC": "NUMBER ( 38 , 0 )",
+    "INT": "NUMBER ( 38 , 0 )", "INTEGER": "NUMBER ( 38 , 0 )", "BIGINT": "NUMBER ( 38 , 0 )", "SMALLINT": "NUMBER ( 38 , 0 )",
+    "VARCHAR": "VARCHAR ( 16777216 )", "STRING": "VARCHAR ( 16777216 )", "TEXT": "VARCHAR ( 16777216 )",
+    "TIMESTAMP": "TIMESTAMP_NTZ ( 9 )", "TIMESTAMP_NTZ": "TIMESTAMP_NTZ ( 9 )",
+    "TIMESTAMP_LTZ": "TIMESTAMP_LTZ ( 9 )", "TIMESTAMP_TZ": "TIMESTAMP_TZ ( 9 )",
+    "DOUBLE": "FLOAT", "REAL": "FLOAT", "FLOAT4": "FLOAT", "FLOAT8": "FLOAT",
+}
+_TYPE_ALIASES = {"DECIMAL": "NUMBER", "NUMERIC": "NUMBER", "STRING": "VARCHAR", "TEXT": "VARCHAR", "TIMESTAMP": "TIMESTAMP_NTZ"}
+
+
+def normalize_ddl(ddl, properties=COMPARED_PROPERTIES):
+    """
+    Canonical text of a CREATE statement, ignoring everything that doesn't change the object:
+    whitespace, comments, keyword/identifier case, the object name (GET_DDL writes it differently),
+    default properties and short type names.
+    properties=() compares only the columns and the query (what an ALTER can't change).
+    """
+    definition = parse_ddl(ddl)
+    parts = [definition.kind or ""]
+
+    if definition.column_tokens:
+        parts.append("(" + _canonical(definition.column_tokens, _column_type_positions(definition.column_tokens)) + ")")
+
+    for key in properties:
+        if key in definition.properties:
+            parts.append(f"{key}={identifier_key(definition.properties[key])}")
+
+    if definition.query_tokens:
+        parts.append("AS " + _canonical(definition.query_tokens, _cast_type_positions(definition.query_tokens)))
+
+    return " ".join(parts)
+
+
+def ddl_hash(ddl):
+    return hashlib.sha256(normalize_ddl(ddl).encode("utf-8")).hexdigest()
+
+
+def normalize_type(type_text):
+    #'number' -> 'NUMBER ( 38 , 0 )', 'VARCHAR(100)' -> 'VARCHAR ( 100 )': equal text = same stored type
+    return _canonical(tokenize(type_text), {0})
+
+
+def _column_type_positions(tokens):
+    #The type is the token right after the column name: 'ID TEXT' -> TEXT, but not a column named TEXT
+    positions = _cast_type_positions(tokens)
+    if not tokens:
+        return positions
+    list_depth = tokens[0].depth
+    starts_definition = True
+    for k, token in enumerate(tokens):
+        if token.depth != list_depth:
+            continue
+        if starts_definition:
+            positions.add(k + 1)
+        starts_definition = token.value == ","
+    return positions
+
+
+def _cast_type_positions(tokens):
+    #Types inside expressions: after '::' and after the AS of CAST(... AS type) / TRY_CAST
+    positions = set()
+    casts = [] #one entry per open paren, True if it is a CAST's
+    for k, token in enumerate(tokens):
+        if token.kind != OP and token.kind != WORD:
+            continue
+        value = token.value.upper()
+        if value == "(":
+            casts.append(k > 0 and tokens[k - 1].value.upper() in ("CAST", "TRY_CAST"))
+        elif value == ")":
+            if casts:
+                casts.pop()
+        elif value == "::":
+            positions.add(k + 1)
+        elif value == "AS" and casts and casts[-1]:
+            positions.add(k + 1)
+    return positions
+
+
+def _canonical(tokens, type_positions=()):
+    #type_positions: indexes of the tokens that are data types, only those get the short -> stored type mapping
+    out = []
+    n = len(tokens)
+    for k, token in enumerate(tokens):
+        if token.kind == WORD:
+            word = token.value.upper()
+            if k in type_positions:
+                has_params = k + 1 < n and tokens[k + 1].value == "("
+                if word in _TYPE_DEFAULTS and not has_params:
+                    word = _TYPE_DEFAULTS[word]
+                else:
+                    word = _TYPE_ALIASES.get(word, word)
+            out.append(word)
+        elif token.kind == QUOTED:
+            #"ID" and ID are the same identifier
+            key = identifier_key(token.value)
+            out.append(key if key.isupper() and key.replace("_", "").isalnum() else token.value)
+        else:
+            out.append(token.value)
+    return " ".join(out)
+
+
+def check_changes(ddl, deployed_ddl=None, git_content=None):
+    """
+    Compares the generated DDL with what is deployed (GET_DDL) and what is in Git.
+    Returns {'hash', 'snowflake_changed', 'git_changed'}; a missing object/file always counts as changed.
+    """
+    new_hash = ddl_hash(ddl)
+    return {
+        "hash": new_hash,
+        "snowflake_changed": deployed_ddl is None or ddl_hash(deployed_ddl) != new_hash,
+        "git_changed": git_content is None or ddl_hash(git_content) != new_hash,
+    }
+
+
+def fetch_deployed_ddl(provider, schema_name, obj_name, obj_type):
+    #Fresh GET_DDL (not from the cache, someone else may have changed it), None if the object doesn't exist yet
+    try:
+        return provider.get_ddl.uncached(provider, schema_name, obj_name, obj_type)
+    except Exception:
+        return None
+
+
+def fetch_git_content(file_path):
+    #None if there is no Git backend configured or the file isn't there yet
+    try:
+        from utils.git_manager import get_git_backend
+        return get_git_backend().read(file_path)
+    except Exception:
+        return None
+
+
+def fetch_deployed_ddls(provider, items):
+    """
+    Fresh deployed DDL of many objects (DeployItem-like: schema, name, obj_type): ONE GET_DDL('SCHEMA') per schema
+    instead of one GET_DDL per object. {(SCHEMA, NAME): ddl or None}
+    A schema that can't be read as a whole (missing, no privilege) falls back to the per-object fetch.
+    """
+    by_schema = {}
+    for item in items:
+        by_schema.setdefault(identifier_key(item.schema), []).append(item)
+
+    deployed = {}
+    for schema_key, schema_items in by_schema.items():
+        try:
+            schema_ddls = provider.get_schema_ddls.uncached(provider, schema_items[0].schema)
+        except Exception:
+            schema_ddls = None
+        for item in schema_items:
+            key = (schema_key, identifier_key(item.name))
+            if schema_ddls is None:
+                deployed[key] = fetch_deployed_ddl(provider, item.schema, item.name, item.obj_type)
+            else:
+                entry = schema_ddls.get(f"{key[0]}.{key[1]}")
+                deployed[key] = entry[1] if entry is not None else None
+    return deployed
+
+
+def fetch_git_contents(file_paths, max_workers=GIT_READ_WORKERS):
+    #{path: content or None}, the reads run concurrently on a small thread pool
+    try:
+        from utils.git_manager import get_git_backend
+        backend = get_git_backend()
+    except Exception:
+        return {path: None for path in file_paths}
+
+    def read(path):
+        try:
+            return backend.read(path)
+        except Exception:
+            return None
+
+    file_paths = list(dict.fromkeys(file_paths))
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(file_paths))), thread_name_prefix="igloo-git-read") as pool:
+        return dict(zip(file_paths, pool.map(read, file_paths)))
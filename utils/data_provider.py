@@ -1,7 +1,16 @@
 # utils/data_provider.py
-import streamlit as st
-import pandas as pd
-from utils.snowflake_connector import get_session
+import os
+from utils.cache import MetadataCache, cached
+from utils.catalog import CatalogSnapshot
+from utils.dependency_graph import DependencyGraph
+from utils.ddl_parser import parse_ddl, identifier_key, split_schema_ddl
+from utils import query_profiler
+from utils.plan_check import explain_sql
+from utils.dt_monitor import DEFAULT_DAYS, fetch_history
+from utils.ddl_validation import VALIDATION_CACHE_ENTRIES, DEFAULT_MAX_WORKERS as DEFAULT_VALIDATION_WORKERS, validate_batch
+from utils.source_preview import (
+    DEFAULT_ROWS, PREVIEW_TTL, PREVIEW_CACHE_ENTRIES, sample_sql, transformed_sql, stream_frames,
+)
 
 #Get some sample data for offline dev
 class MockDataProvider:
@@ -19,20 +28,168 @@ class MockDataProvider:
 
     def get_columns(self, schema_name, table_name, obj_type):
         #Returns fake columns based on table name
+        #(name, type, null?) like DESCRIBE, the editors unpack all 3
         if "USERS" in table_name:
-            return [("ID", "NUMBER"), ("NAME", "VARCHAR"), ("CREATED_AT", "TIMESTAMP")]
+            return [("ID", "NUMBER", "Y"), ("NAME", "VARCHAR", "Y"), ("CREATED_AT", "TIMESTAMP", "Y")]
         elif "ORDERS" in table_name:
-            return [("ORDER_ID", "NUMBER"), ("USER_ID", "NUMBER"), ("AMOUNT", "FLOAT")]
+            return [("ORDER_ID", "NUMBER", "Y"), ("USER_ID", "NUMBER", "Y"), ("AMOUNT", "FLOAT", "Y")]
         else:
-            return [("COL_1", "VARCHAR"), ("COL_2", "NUMBER")]
+            return [("COL_1", "VARCHAR", "Y"), ("COL_2", "NUMBER", "Y")]
+
+    def invalidate(self, schema_name=None, obj_name=None, obj_type=None):
+        #Nothing is cached for the fake data
+        return 0
+
+    def get_dependency_graph(self, reload=False):
+        #The fake objects don't read each other
+        return DependencyGraph("MOCK_DB")
+
+    def get_refresh_history(self, db_name, days=DEFAULT_DAYS):
+        #The fake dynamic tables never refresh
+        return {"records": [], "truncated": False}
+
+    def stream_preview(self, schema_name, obj_name, columns=None, rows=DEFAULT_ROWS, sample=False):
+        #No data behind the fake objects: the column headers only
+        import pandas as pd
+        names = [column.name for column in columns] if columns else [column[0] for column in self.get_columns(schema_name, obj_name, None)]
+        yield pd.DataFrame(columns=names), False
+
+
+#Offline, read only: the metadata of a saved catalog snapshot (CatalogSnapshot.to_dict() as JSON), e.g. for the spec compiler in CI
+class CatalogDataProvider:
+    def __init__(self, catalog):
+        self.catalog = catalog
+
+    @classmethod
+    def from_file(cls, path):
+        import json
+        with open(path, encoding="utf-8") as f:
+            return cls(CatalogSnapshot.from_dict(json.load(f)))
+
+    def get_schemas(self, db_name):
+        return self.catalog.schemas()
+
+    def get_tables(self, schema_name, obj_type='all'):
+        return self.catalog.get_tables(schema_name, obj_type)
+
+    def get_views(self, schema_name):
+        return self.catalog.get_views(schema_name)
+
+    def get_columns(self, schema_name, obj_name, obj_type):
+        columns = self.catalog.get_columns(schema_name, obj_name)
+        if columns is None:
+            raise KeyError(f"{schema_name}.{obj_name} is not in the catalog snapshot")
+        return columns
+
+    def invalidate(self, schema_name=None, obj_name=None, obj_type=None):
+        return 0
 
 
 #returns real data from snowflake
 class RealDataProvider:
-    def __init__(self):
-        self.session = get_session()
+    #catalog_mode: None -> SHOW/DESCRIBE per call, 'schema' -> snapshot a schema on first touch, 'database' -> snapshot the whole db at once
+    #disk_cache: optional DiskCache (utils/disk_cache.py), survives restarts
+    def __init__(self, catalog_mode=None, disk_cache=None):
+        self.cache = MetadataCache()
+        self.disk_cache = disk_cache
+        self._context = None
+        self.catalog_mode = catalog_mode
+        self.catalog = None
+        self.dependencies = None #DependencyGraph, built on first use
+        self._stale_dependencies = {} #(SCHEMA, NAME) stored names -> (schema, name, obj_type) as given, deployed since the graph was built
+        self.previews = MetadataCache(max_entries=PREVIEW_CACHE_ENTRIES) #sampled source rows, see stream_preview
+        self.validations = MetadataCache(max_entries=VALIDATION_CACHE_ENTRIES) #compile results by DDL hash, see validate_ddls
+
+    #Always ask the connector, it hands back the pooled session (or a fresh one if the old dropped)
+    @property
+    def session(self):
+        from utils.snowflake_connector import get_session #lazy: Snowpark is only loaded once a page needs real data
+        return get_session()
+
+    #(account, role, database) part of every cache key, so different roles/dbs never see each other's metadata
+    def cache_context(self):
+        if self._context is None:
+            self._context = (
+                self.session.get_current_account(),
+                self.session.get_current_role(),
+                self.session.get_current_database(),
+            )
+        return self._context
+
+    #Drop cached metadata after something was deployed (only the touched schema/object)
+    #obj_type lets the dependency graph re-read just that object, without it the graph is rebuilt
+    #keep_catalog: the snapshot is already up to date (refresh_catalog), only the caches go
+    def invalidate(self, schema_name=None, obj_name=None, obj_type=None, keep_catalog=False):
+        if self.catalog is not None and not keep_catalog:
+            if schema_name is None:
+                self.catalog = None
+            else:
+                self.catalog.forget(schema_name)
+        if self.dependencies is not None:
+            if obj_name is not None and obj_type is not None:
+                #Keyed by the stored names (normalized here, once), the names as given are kept for GET_DDL
+                self._stale_dependencies[(identifier_key(schema_name), identifier_key(obj_name))] = (schema_name, obj_name, obj_type)
+            else:
+                self.dependencies = None
+        if self.disk_cache is not None:
+            self.disk_cache.invalidate(schema_name, obj_name)
+        self.previews.invalidate(schema_name, obj_name)
+        self.validations.clear() #a deployed object can make other objects' queries (in)valid
+        return self.cache.invalidate(schema_name, obj_name)
+
+    #Who reads what in the whole database, loaded in bulk once, then patched object by object after deploys
+    #reload=True: drop it and load again (changes made outside the app)
+    def get_dependency_graph(self, reload=False):
+        if self.dependencies is None or reload:
+            graph = DependencyGraph(self.session.get_current_database())
+            graph.load(self.session)
+            self.dependencies = graph
+            self._stale_dependencies = {}
+
+        while self._stale_dependencies:
+            (schema_key, obj_key), (schema_name, obj_name, obj_type) = self._stale_dependencies.popitem()
+            node = self.dependencies.node(schema_key, obj_key)
+            if obj_type == 'Table':
+                self.dependencies.set_sources(node, (), 'TABLE')
+                continue
+            try:
+                ddl = self.get_ddl(schema_name, obj_name, obj_type)
+            except Exception:
+                self.dependencies.remove(node) #dropped (or no longer visible)
+                continue
+            self.dependencies.set_sources(node, self.dependencies.parse_sources(ddl, schema_key), obj_type.upper())
+        return self.dependencies
+
+    #Incremental sync of the catalog snapshot (LAST_ALTERED high-water marks + name sets, see CatalogSnapshot.refresh)
+    #Only the changed/dropped objects lose their cached metadata, DDL that was cached for them is fetched again right away
+    def refresh_catalog(self):
+        if self.catalog is None:
+            return None
+        result = self.catalog.refresh(self.session)
+        dropped = set(result["dropped"])
+        for schema_name, obj_name, obj_type in result["changed"] + result["dropped"]:
+            had_ddl, _ = self.get_ddl.peek(self, schema_name, obj_name, obj_type)
+            self.invalidate(schema_name, obj_name, obj_type, keep_catalog=True)
+            if had_ddl and (schema_name, obj_name, obj_type) not in dropped:
+                self.get_ddl(schema_name, obj_name, obj_type)
+        return result
+
+    #Returns the snapshot if the schema can be served from it (loads it when needed), None if snapshot mode is off
+    def _catalog_for(self, schema_name):
+        if not self.catalog_mode:
+            return None
+
+        if self.catalog is None:
+            self.catalog = CatalogSnapshot(self.session.get_current_database())
+            if self.catalog_mode == 'database':
+                self.catalog.load(self.session)
+
+        if not self.catalog.has_schema(schema_name):
+            self.catalog.load(self.session, schema_name)
+        return self.catalog
 
     #Get schemas in the current db
+    @cached(scope="database")
     def get_schemas(self, db_name):
         df = self.session.sql(f"SHOW SCHEMAS IN DATABASE {db_name}").collect()
         schemas = [
@@ -43,7 +200,12 @@ class RealDataProvider:
         return schemas
 
     #Get tables in a specific schema, default is all so don't need to specify in some cases
+    @cached(scope="schema")
     def get_tables(self, schema_name, obj_type='all'):
+        catalog = self._catalog_for(schema_name)
+        if catalog is not None:
+            return catalog.get_tables(schema_name, obj_type)
+
         #1 collect all data
         #maybe use UPPER() later, if someone was stupid enough to name the table with lowercase 
         df_all = self.session.sql(f"SHOW TABLES IN SCHEMA {schema_name}").collect()
@@ -57,19 +219,32 @@ class RealDataProvider:
         
         #handle dt/normal
         if obj_type == 'normal':
-            return list(set(tables_all) - set(tables_dt))  #Have to use "sets" bc cant substract 1list rom another. INVALID:[1, 2, 3] - [2], VALID:{1, 2, 3} - {2}  
+            tables_dt = set(tables_dt)  #set for the fast lookup, but keep the SHOW order of tables_all
+            return [table for table in tables_all if table not in tables_dt]
         elif obj_type == 'dynamic':
             return tables_dt
 
     
     #Get views in a specific schema
+    @cached(scope="schema")
     def get_views(self, schema_name):
+        catalog = self._catalog_for(schema_name)
+        if catalog is not None:
+            return catalog.get_views(schema_name)
+
         df = self.session.sql(f"SHOW VIEWS IN SCHEMA {schema_name}").collect()
         views = [row["name"] for row in df]
         return views
 
     #Get columns in a specific table/view 
+    @cached(scope="object")
     def get_columns(self, schema_name, obj_name, obj_type):
+        catalog = self._catalog_for(schema_name)
+        if catalog is not None:
+            columns = catalog.get_columns(schema_name, obj_name)
+            if columns is not None:
+                return columns
+
         if obj_type in ('Table','Dynamic Table'):
             df = self.session.sql(f"DESCRIBE TABLE {schema_name}.{obj_name}").collect()
         elif obj_type == 'View':
@@ -77,157 +252,153 @@ class RealDataProvider:
         columns = [(row["name"], row["type"], row["null?"]) for row in df]
         return columns
     
-    #simple DESC command not enough to get the transforms like LEFT(ID,2)
-    def get_transform(self, schema_name, obj_name, obj_type):
+    #Raw DDL of a view/dynamic table. Everything that needs the definition (transforms, source, DT config) should go through this
+    @cached(scope="object")
+    def get_ddl(self, schema_name, obj_name, obj_type):
+        #Already fetched with the whole schema? Then no round trip at all
+        found, schema_ddls = self.get_schema_ddls.peek(self, schema_name)
+        if found:
+            entry = schema_ddls.get(f"{identifier_key(schema_name)}.{identifier_key(obj_name)}")
+            if entry is not None:
+                return entry[1]
+
         if obj_type == 'View':
             df = self.session.sql(f"SELECT GET_DDL('VIEW', '{schema_name}.{obj_name}')").collect()
-            
-
-        elif obj_type == 'Dynamic Table':
+        elif obj_type in ('Table', 'Dynamic Table'):
             df = self.session.sql(f"SELECT GET_DDL('TABLE', '{schema_name}.{obj_name}')").collect()
-            
-
-        ddl = df[0][0]  # Extract the DDL string
-
-        # Find the SELECT statement part
-        select_start = ddl.upper().find('SELECT')
-        from_start = ddl.upper().find('FROM', select_start)
-
-        if select_start != -1 and from_start != -1:
-            # Extract the column definitions between SELECT and FROM
-            select_clause = ddl[select_start + 6:from_start].strip()
-
-            # Split by comma (handling potential commas in functions)
-            columns = []
-            paren_depth = 0
-            current_col = []
-
-            # If we just split by commas, LEFT(KEK,2) would be incorrectly split into LEFT(KEK and 2)
-            # At this point I understand this, but tomorrow i'll need AI again
-            for char in select_clause:
-                if char == '(':
-                    paren_depth += 1
-                elif char == ')':
-                    paren_depth -= 1
-                elif char == ',' and paren_depth == 0:
-                    columns.append(''.join(current_col).strip())
-                    current_col = []
-                    continue
-                current_col.append(char)
-
-            # Add the last column
-            if current_col:
-                columns.append(''.join(current_col).strip())
-
-            # Parse columns with transformations into different variables to be able to re-use them.
-            results = []
-            for col in columns:
-                col_upper = col.upper()
-                if ' AS ' in col_upper and '::' in col:
-                    # Find the AS keyword position
-                    as_pos = col_upper.rfind(' AS ')
-                    alias = col[as_pos + 4:].strip()
-
-                    # Everything before AS
-                    before_as = col[:as_pos].strip()
-
-                    # Find the :: to split transformation and type
-                    type_pos = before_as.rfind('::')
-                    transformation = before_as[:type_pos].strip()
-                    data_type = before_as[type_pos + 2:].strip()
-
-                    results.append({
-                        'alias': alias,
-                        'type': data_type,
-                        'transformation': transformation
-                    })
-
-            return results
-
-        return []
+        return df[0][0]  # Extract the DDL string
+
+    #Every table/view/dynamic table definition of a schema in ONE round trip (GET_DDL('SCHEMA'), split statement by statement)
+    #For anything that needs many definitions at once, get_ddl() of the same schema is then served from this
+    #Returns: {'SCHEMA.NAME': (kind, ddl)}, kind is 'TABLE', 'VIEW' or 'DYNAMIC TABLE'
+    @cached(scope="schema")
+    def get_schema_ddls(self, schema_name):
+        df = self.session.sql(f"SELECT GET_DDL('SCHEMA', '{schema_name}', TRUE)").collect()
+        return split_schema_ddl(df[0][0], schema_name)
+
+    #One GET_DDL + one parse per object. The modify editors use this instead of calling get_transform_by_alias per column
+    #Returns: {'transformations': {ALIAS: {'alias','type','transformation'}}, 'source': (schema, name), 'warehouse', 'target_lag', 'refresh_mode', 'query'}
+    @cached(scope="object")
+    def get_object_definition(self, schema_name, obj_name, obj_type):
+        parsed = parse_ddl(self.get_ddl(schema_name, obj_name, obj_type))
+
+        #Only the 'expr::TYPE AS alias' columns are transformations, plain 'COL::TYPE' ones are just casts
+        transformations = {}
+        for item in parsed.projection:
+            if item['explicit_alias'] and item['type']:
+                transformations[identifier_key(item['alias'])] = {
+                    'alias': item['alias'],
+                    'type': item['type'],
+                    'transformation': item['expression'],
+                }
+
+        #Source as (schema, name), DATABASE.SCHEMA.TABLE is cut to SCHEMA.TABLE
+        source = (None, None)
+        if parsed.main_source and len(parsed.main_source) in (2, 3):
+            source = tuple(parsed.main_source[-2:])
+
+        return {
+            'transformations': transformations,
+            'source': source,
+            'warehouse': parsed.warehouse if obj_type == 'Dynamic Table' else None,
+            'target_lag': parsed.target_lag if obj_type == 'Dynamic Table' else None,
+            'refresh_mode': parsed.refresh_mode if obj_type == 'Dynamic Table' else None,
+            'query': parsed.query,
+        }
+
+    #Refresh history of every dynamic table in the database (+ target lag/refresh mode), see utils/dt_monitor.py
+    #One query per DATA_TIMESTAMP window, usually a single one. Returns {'records': plain records (epoch seconds), 'truncated'},
+    #the monitor page and the modify drill-down summarize them
+    @cached(scope="database")
+    def get_refresh_history(self, db_name, days=DEFAULT_DAYS):
+        return fetch_history(lambda query: self.session.sql(query).collect(), db_name, days)
+
+    #EXPLAIN USING JSON of a query (compiled, not run), parsed by utils/plan_check.py. Cached per query text
+    @cached(scope="database")
+    def get_plan(self, query):
+        df = self.session.sql(explain_sql(query)).collect()
+        return df[0][0]
+
+    #Compile-only check of many DDLs at once (EXPLAIN, nothing is created), see utils/ddl_validation.py
+    #items: DeployItem-like (schema, name, obj_type, ddl). Unchanged DDLs are answered from the cache until the next deploy
+    def validate_ddls(self, items, max_workers=DEFAULT_VALIDATION_WORKERS, on_result=None):
+        return validate_batch(
+            self.session, items, cache=self.validations, context=self.cache_context(), max_workers=max_workers, on_result=on_result,
+        )
+
+    #A bounded sample of a source object's rows, streamed batch by batch: yields (frame so far, capped), see utils/source_preview.py
+    #columns (ColumnSpecs of the editor grid): the transformed output of those expressions instead of the raw rows
+    #Cached per source object (and select list), a cache hit yields the finished frame at once
+    def stream_preview(self, schema_name, obj_name, columns=None, rows=DEFAULT_ROWS, sample=False):
+        columns = tuple(columns) if columns else None
+        key = self.cache_context() + (schema_name.upper(), obj_name.upper(), "stream_preview", (columns, int(rows), sample), ())
+        found, value = self.previews.get(key)
+        if found:
+            query_profiler.record_cache_hit("stream_preview")
+            yield value
+            return
+
+        source_object = f"{schema_name}.{obj_name}"
+        if columns:
+            query = transformed_sql(source_object, columns, rows, sample)
+        else:
+            query = sample_sql(source_object, rows, sample)
+        value = None
+        for value in stream_frames(self.session.sql(query), max_rows=rows):
+            yield value
+        self.previews.set(key, value, PREVIEW_TTL) #only a preview that was read to the end is kept
+
+    #simple DESC command not enough to get the transforms like LEFT(ID,2)
+    def get_transform(self, schema_name, obj_name, obj_type):
+        definition = self.get_object_definition(schema_name, obj_name, obj_type)
+        return list(definition['transformations'].values())
         
     #Helper method for transform, to be able to get the transformation based on the "alias"
     def get_transform_by_alias(self, schema_name, obj_name, obj_type, alias):
-        transformations = self.get_transform(schema_name, obj_name, obj_type)
-     
-        for tf in transformations:
-            if tf['alias'].upper() == alias.upper():
-                return tf['transformation'].upper()
+        definition = self.get_object_definition(schema_name, obj_name, obj_type)
+        tf = definition['transformations'].get(identifier_key(alias)) #keyed like get_object_definition: "Mixed Case" stays as is
+        if tf:
+            return tf['transformation'].upper()
      
         return None  #or return {'alias': alias, 'type': None, 'transformation': None}
     
 
     #Returns the source schema and obj name - use this in MODIFIY VIEW
     def get_source(self, schema_name, obj_name, obj_type):
-        if obj_type == 'View':
-            df = self.session.sql(f"SELECT GET_DDL('VIEW', '{schema_name}.{obj_name}')").collect()
-        elif obj_type == 'Dynamic Table':
-            df = self.session.sql(f"SELECT GET_DDL('TABLE', '{schema_name}.{obj_name}')").collect()
+        return self.get_object_definition(schema_name, obj_name, obj_type)['source']
 
-        ddl = df[0][0]  # Extract the DDL string
 
-        # Find the FROM clause
-        from_pos = ddl.upper().find('FROM')
-
-        if from_pos == -1:
-            return None, None
-
-        #Extract everything after FROM
-        after_from = ddl[from_pos + 4:].strip()
-
-        #Get the first word (the source table/view), stop at semicolon, space, or newline
-        source_full = after_from.split(';')[0].split()[0].strip()
-
-        #Split by dot to separate schema and object name
-        parts = source_full.split('.')
+    def get_dynamic_table_config(self, schema_name,obj_name):
+        definition = self.get_object_definition(schema_name, obj_name, 'Dynamic Table')
+        return definition['warehouse'], definition['target_lag']
 
-        if len(parts) == 2:
-            obj_source_schema = parts[0]
-            obj_source_name = parts[1]
-        elif len(parts) == 3:
-            # If it includes database name: DATABASE.SCHEMA.TABLE
-            obj_source_schema = parts[1]
-            obj_source_name = parts[2]
-        else:
-            return None, None
 
-        return obj_source_schema, obj_source_name
-        
 
+#IGLOO_DISK_CACHE=/path/to/catalog.sqlite turns on the persistent cache, IGLOO_DISK_CACHE_MB bounds its size (default 256)
+def _disk_cache_from_env():
+    path = os.environ.get("IGLOO_DISK_CACHE")
+    if not path:
+        return None
+    from utils.disk_cache import DiskCache, DEFAULT_MAX_BYTES
+    max_mb = os.environ.get("IGLOO_DISK_CACHE_MB")
+    return DiskCache(path, max_bytes=int(float(max_mb) * 1024 * 1024) if max_mb else DEFAULT_MAX_BYTES)
 
 
-    def get_dynamic_table_config(self, schema_name,obj_name):
-        df = self.session.sql(f"SELECT GET_DDL('TABLE', '{schema_name}.{obj_name}')").collect()
-        ddl = df[0][0] #have to get the "body" part
-
-        #Find target_lag
-        target_lag = None
-        target_lag_pos = ddl.upper().find('TARGET_LAG')
-        if target_lag_pos != -1:
-            #Find the opening quote after target_lag =
-            quote_start = ddl.find("'", target_lag_pos)
-            if quote_start != -1:
-                #Find the closing quote
-                quote_end = ddl.find("'", quote_start + 1)
-                if quote_end != -1:
-                    target_lag = ddl[quote_start + 1:quote_end]
-
-        #Find warehouse
-        warehouse = None
-        warehouse_pos = ddl.upper().find('WAREHOUSE')
-        if warehouse_pos != -1:
-            #Find the = sign after warehouse
-            equals_pos = ddl.find('=', warehouse_pos)
-            if equals_pos != -1:
-                #et everything after = and extract the warehouse name
-                after_equals = ddl[equals_pos + 1:].strip()
-                #Split by whitespace and take the first word
-                warehouse = after_equals.split()[0].strip()
-
-        return warehouse, target_lag
 
 # Factory function to get the provider
+#One provider per process, so the metadata cache is shared by every page/module (and survives reruns)
+_provider = None
+
 def get_data_provider():
+    global _provider
     #if local -> use Mock, if Server -> use Real
-    return RealDataProvider()
-    #return MockDataProvider()
\ No newline at end of file
+    if _provider is None:
+        synthetic = os.environ.get("IGLOO_SYNTHETIC")
+        if synthetic:
+            #Load testing the UI on a generated catalog, see benchmarks/synthetic_provider.py::from_spec
+            from benchmarks.synthetic_provider import from_spec
+            _provider = from_spec(synthetic)
+        else:
+            _provider = RealDataProvider(catalog_mode='schema', disk_cache=_disk_cache_from_env())
+        #_provider = MockDataProvider()
+    return _provider
\ No newline at end of file
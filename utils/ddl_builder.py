@@ -0,0 +1,157 @@
+#Column mapping -> DDL without any UI: the editors build their grid rows and call these, the spec compiler does the same from files
+from models.table import Table
+from models.view import View
+from models.dynamic_table import DynamicTable
+from models.column_spec import ColumnSpec
+from utils.ddl_parser import identifier_key
+
+
+OBJECT_TYPES = ("Table", "View", "Dynamic Table")
+
+
+def object_file_path(schema_name, object_type, object_name, root="snowflake_objects"):
+    #Construct a clean path: objects/SCHEMA/TYPE/NAME.sql
+    return f"{root}/{schema_name}/{object_type}/{object_name}.sql".lower()
+
+
+def _filled(value):
+    #Empty grid cells come back as None, NaN or ''
+    return value is not None and value == value and value != ""
+
+
+def projection_rows(source_cols, transformations=None):
+    """
+    Starting grid of the view/dynamic table editors, one row per (name, type, null?) column.
+    transformations: get_object_definition()['transformations'] when modifying an object, None for a new one
+    """
+    rows = []
+    for col_name, col_type, *_ in source_cols:
+        transformation = ""
+        if transformations is not None:
+            #Keyed by identifier_key(alias): the exact stored name DESCRIBE gives ("Full Name" -> Full Name), a quoted name is unquoted
+            tf = transformations.get(col_name) or transformations.get(identifier_key(col_name))
+            transformation = tf['transformation'].upper() if tf else None
+        rows.append({
+            "src_col_nm": col_name,
+            "new_col_nm": col_name,
+            "transformation": transformation,
+            "data_type": col_type, #This can be 'NUMBER(38,0)', wich is not part of the base types
+        })
+    return rows
+
+
+def projection_specs(rows):
+    """
+    View/dynamic table grid rows ({'src_col_nm', 'new_col_nm', 'transformation', 'data_type'}) -> ColumnSpecs for the models
+    Rows without a source column (the editor's empty row) are left out.
+    """
+    return tuple(
+        ColumnSpec(
+            row["new_col_nm"], row["data_type"], source=row["src_col_nm"],
+            transformation=row["transformation"] if _filled(row["transformation"]) else None,
+        )
+        for row in rows if _filled(row["src_col_nm"])
+    )
+
+
+def projection_frame_specs(frame):
+    """
+    projection_specs for the editors' data_editor DataFrame: the cells are cleaned with pandas string ops over whole
+    columns, only the ColumnSpecs are built per row. Building the SQL itself over whole columns is no faster at 100 to
+    5,000 columns (benchmarks/bench_projection.py, 'frame_sql'), and an unchanged grid gets the memoized DDL anyway.
+    """
+    #Empty cells (None/NaN/'') -> '', everything else as text
+    src, new, transformation, data_type = (
+        frame[key].fillna("").astype(str) for key in ("src_col_nm", "new_col_nm", "transformation", "data_type")
+    )
+    keep = src != ""
+    return tuple(
+        ColumnSpec(name, col_type, source=source, transformation=rule)
+        for source, name, rule, col_type in zip(*(series[keep].tolist() for series in (src, new, transformation, data_type)))
+    )
+
+
+def table_specs(rows, name_key="col_nm", source_key=None):
+    #Table grid rows ({name_key, 'data_type', 'nullable'}) -> ColumnSpecs, source_key: the column's current name (modify)
+    specs = []
+    for row in rows:
+        if not _filled(row[name_key]):
+            continue
+        source = row[source_key] if source_key and isinstance(row[source_key], str) else None #NaN/None on added rows
+        specs.append(ColumnSpec(row[name_key], row["data_type"], nullable=bool(row["nullable"]), source=source))
+    return tuple(specs)
+
+
+def object_type_of(value):
+    #'dynamic_table', 'DYNAMIC TABLE', 'view' -> the type names the app uses
+    normalized = " ".join(str(value).replace("_", " ").split()).lower()
+    for object_type in OBJECT_TYPES:
+        if object_type.lower() == normalized:
+            return object_type
+    raise ValueError(f"Unknown object type: {value} (expected one of {', '.join(OBJECT_TYPES)})")
+
+
+def build_object(spec, provider):
+    """
+    Model object (Table/View/DynamicTable) from a spec dict:
+      type: table | view | dynamic table
+      schema, name
+      columns: table -> [{name, data_type, nullable}]
+               view/dynamic table -> [{source, name, transformation, data_type}], optional: every source column as-is
+      source: SCHEMA.OBJECT (view/dynamic table)
+      warehouse, target_lag (dynamic table)
+    The provider is only asked for the source columns (types of the columns the spec leaves out).
+    """
+    object_type = object_type_of(spec["type"])
+    schema_name, name = spec["schema"], spec["name"]
+
+    if object_type == "Table":
+        rows = [
+            {"col_nm": column["name"], "data_type": column["data_type"], "nullable": column.get("nullable", True)}
+            for column in spec["columns"]
+        ]
+        return Table(schema=schema_name, name=name, columns=table_specs(rows))
+
+    source_schema, _, source_name = spec["source"].rpartition(".")
+    if not source_schema:
+        source_schema = schema_name #unqualified source: same schema as the object
+
+    rows = _projection_rows(spec.get("columns"), lambda: provider.get_columns(source_schema, source_name, object_type), spec["source"])
+    columns = projection_specs(rows)
+    source_object = f"{source_schema}.{source_name}"
+
+    if object_type == "View":
+        return View(schema=schema_name, name=name, columns=columns, source_object=source_object)
+
+    return DynamicTable(
+        schema=schema_name, name=name, columns=columns, source_object=source_object,
+        warehouse=spec["warehouse"], target_lag=spec.get("target_lag", "1 minute"),
+    )
+
+
+def _projection_rows(columns, fetch_source_columns, source):
+    source_types = None
+
+    def source_type(column_name):
+        nonlocal source_types
+        if source_types is None:
+            #name -> type, the same (name, type, null?) rows the editors start from
+            source_types = {column[0].upper(): column[1] for column in fetch_source_columns()}
+        if column_name.upper() not in source_types:
+            raise ValueError(f"Column {column_name} not found in {source}")
+        return source_types[column_name.upper()]
+
+    if not columns:
+        #No mapping: every source column as-is, like the editors' starting grid
+        return projection_rows(fetch_source_columns())
+
+    rows = []
+    for column in columns:
+        source_column = column.get("source") or column["name"]
+        rows.append({
+            "src_col_nm": source_column,
+            "new_col_nm": column.get("name") or source_column,
+            "transformation": column.get("transformation"),
+            "data_type": column.get("data_type") or source_type(source_column),
+        })
+    return rows
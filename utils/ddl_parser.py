@@ -0,0 +1,582 @@
+"""
+Tokenizer + lightweight parser for the DDL that GET_DDL returns for views and dynamic tables.
+
+tokenize() walks the text once and understands string literals ('..', $$..$$), quoted identifiers ("..")
+and comments (--, //, /* */), so commas/parentheses/keywords inside them can't confuse the parser.
+parse_ddl() then does a single walk over the tokens and returns a DdlDefinition with the header
+(kind, name, column names, properties like TARGET_LAG/WAREHOUSE/REFRESH_MODE), the projection list
+of the main SELECT (expression, type, alias) and every object read in a FROM/JOIN.
+"""
+
+import re
+
+
+#Token kinds (also the group names of _TOKEN_RE)
+WORD = "word"           #keywords and unquoted identifiers
+QUOTED = "quoted"       #"Quoted Identifier"
+STRING = "string"       #'literal' or $$literal$$
+NUMBER = "number"
+OP = "op"               #punctuation/operators: ( ) , . ; :: = + - ...
+
+#Words that end a FROM/JOIN source list or a projection item
+CLAUSE_KEYWORDS = {
+    "WHERE", "GROUP", "HAVING", "QUALIFY", "ORDER", "LIMIT", "OFFSET", "FETCH", "UNION", "EXCEPT",
+    "MINUS", "INTERSECT", "WINDOW", "CONNECT", "START", "MATCH_RECOGNIZE", "PIVOT", "UNPIVOT", "SAMPLE",
+    "TABLESAMPLE", "ON", "USING", "NATURAL", "INNER", "LEFT", "RIGHT", "FULL", "OUTER", "CROSS",
+    "JOIN", "LATERAL", "ASOF", "AT", "BEFORE", "CHANGES",
+}
+
+#Words that can end an expression, so they are never an implicit alias (CASE ... END, x IS NULL)
+NOT_ALIAS_WORDS = {"END", "NULL", "TRUE", "FALSE", "DISTINCT", "ASC", "DESC", "AND", "OR", "NOT", "IS", "IN", "LIKE", "THEN", "ELSE"}
+
+#Stop words for a FROM/JOIN source list (TABLE(FLATTEN(..)) and subqueries are not plain names)
+SOURCE_STOP_WORDS = CLAUSE_KEYWORDS | {"SELECT", "TABLE"}
+
+
+class Token:
+    __slots__ = ("kind", "value", "start", "end", "depth")
+
+    def __init__(self, kind, value, start, end, depth):
+        self.kind = kind
+        self.value = value
+        self.start = start
+        self.end = end
+        self.depth = depth #parenthesis depth the token sits at (the '(' itself is at the outer depth)
+
+    def is_word(self, *words):
+        return self.kind == WORD and self.value.upper() in words
+
+    def __repr__(self):
+        return f"Token({self.kind}, {self.value!r}, depth={self.depth})"
+
+
+#One alternation for every token kind, re.finditer walks the text once (much faster than a char loop in Python)
+_TOKEN_RE = re.compile(r"""
+    (?P<ws>\s+)
+  | (?P<comment>--[^\n]*|//[^\n]*|/\*.*?(?:\*/|\Z))
+  | (?P<string>'(?:[^'\\]|\\.|'')*(?:'|\Z)|\$\$.*?(?:\$\$|\Z))
+  | (?P<quoted>"(?:[^"]|"")*(?:"|\Z))
+  | (?P<word>[^\W\d][\w$]*)
+  | (?P<number>\d+(?:\.\d*)?)
+  | (?P<op>::|\|\||<=|>=|<>|!=|=>|->|.)
+""", re.DOTALL | re.VERBOSE)
+
+
+def tokenize(text, limit=None):
+    #Linear scan, whitespace and comments are dropped
+    #'' and \' are escaped quotes inside literals, "" inside quoted identifiers
+    #limit: stop after that many tokens (enough to read a statement's header)
+    tokens = []
+    append = tokens.append
+    depth = 0
+
+    for match in _TOKEN_RE.finditer(text):
+        kind = match.lastgroup
+        if kind == "ws" or kind == "comment":
+            continue
+
+        value = match.group()
+        if kind == "op":
+            if value == "(":
+                append(Token(OP, value, match.start(), match.end(), depth))
+                depth += 1
+                continue
+            if value == ")":
+                depth = max(depth - 1, 0)
+        append(Token(kind, value, match.start(), match.end(), depth))
+        if limit is not None and len(tokens) >= limit:
+            break
+
+    return tokens
+
+
+def split_statements(text):
+    #Statements of a script, split on the top level ';' (a ';' inside a string, comment or parentheses doesn't count)
+    #Each statement is the original text from its first to its last token, without the ';'
+    statements = []
+    first = None
+    last = None
+    for token in tokenize(text):
+        if token.value == ";" and token.kind == OP and token.depth == 0:
+            if first is not None:
+                statements.append(text[first.start:last.end])
+            first = None
+            continue
+        if first is None:
+            first = token
+        last = token
+    if first is not None:
+        statements.append(text[first.start:last.end])
+    return statements
+
+
+def as_single_statement(script):
+    #One query for a multi statement script (session.sql() runs a single statement): an anonymous Snowflake Scripting block
+    #Keeps the deploy a single async job with one query id
+    statements = split_statements(script)
+    if len(statements) <= 1:
+        return script
+    body = "".join(f"\t{statement};\n" for statement in statements)
+    return f"BEGIN\n{body}END;"
+
+
+#Scanner states of StatementSplitter -> what ends them
+_SPLIT_START = re.compile(r"""[;()'"]|\$\$|--|//|/\*""")
+_SPLIT_END = {
+    "'": re.compile(r"[\\']"),
+    '"': re.compile(r'"'),
+    "$$": re.compile(r"\$\$"),
+    "--": re.compile(r"\n"),
+    "//": re.compile(r"\n"),
+    "/*": re.compile(r"\*/"),
+}
+
+
+class StatementSplitter:
+    """
+    Incremental split_statements: feed() text in chunks of any size (a chunk may end inside a string or comment),
+    every complete statement is returned as soon as its top level ';' arrives. Only the current statement is buffered,
+    so a script of thousands of statements is never tokenized (or held as tokens) in one piece.
+    Statements are stripped of surrounding whitespace, comments are kept as they are part of the text.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0 #scanned up to here
+        self._state = None #None (plain SQL) or the opener of the string/identifier/comment we're inside
+        self._depth = 0
+
+    def feed(self, text):
+        self._buffer += text
+        statements = []
+        buffer = self._buffer
+        while True:
+            if self._state is None:
+                match = _SPLIT_START.search(buffer, self._pos)
+                if match is None:
+                    #Keep the last char: it may be the first half of '--', '//', '/*' or '$$'
+                    self._pos = max(self._pos, len(buffer) - 1)
+                    break
+                value = match.group()
+                self._pos = match.end()
+                if value == "(":
+                    self._depth += 1
+                elif value == ")":
+                    self._depth = max(self._depth - 1, 0)
+                elif value == ";":
+                    if self._depth == 0:
+                        statement = buffer[:match.start()].strip()
+                        if statement:
+                            statements.append(statement)
+                        buffer = buffer[match.end():]
+                        self._pos = 0
+                else:
+                    self._state = value
+                continue
+
+            match = _SPLIT_END[self._state].search(buffer, self._pos)
+            if match is None:
+                self._pos = max(self._pos, len(buffer) - 1) if self._state in ("$$", "/*") else len(buffer)
+                break
+            if match.group() == "\\":
+                if match.end() >= len(buffer):
+                    self._pos = match.start() #the escaped char hasn't arrived yet
+                    break
+                self._pos = match.end() + 1 #\' and \\ inside a literal
+                continue
+            self._pos = match.end()
+            self._state = None #'' and "" close and reopen, same result
+
+        self._buffer = buffer
+        return statements
+
+    def close(self):
+        #The last statement when the script doesn't end with ';'
+        statement = self._buffer.strip()
+        self._buffer, self._pos, self._state, self._depth = "", 0, None, 0
+        return [statement] if statement else []
+
+
+def iter_statements(chunks, chunk_size=65536):
+    #Statements of a script given as a string or as an iterable of text chunks, yielded one by one
+    if isinstance(chunks, str):
+        text = chunks
+        chunks = (text[i:i + chunk_size] for i in range(0, len(text), chunk_size))
+    splitter = StatementSplitter()
+    for chunk in chunks:
+        yield from splitter.feed(chunk)
+    yield from splitter.close()
+
+
+#Words between CREATE and the object type
+_CREATE_MODIFIERS = {
+    "OR", "REPLACE", "SECURE", "TRANSIENT", "TEMPORARY", "TEMP", "VOLATILE", "LOCAL", "GLOBAL", "RECURSIVE", "HYBRID", "ICEBERG",
+}
+#The kind and name are in the first few tokens, no need to tokenize a whole (possibly huge) statement
+_HEADER_TOKENS = 24
+
+
+def statement_object(statement):
+    """
+    (kind, name parts) of a CREATE statement: ('DYNAMIC TABLE', ('DB', 'S', 'T')), ('SEQUENCE', ('S', 'SEQ'))
+    (None, ()) for anything else
+    """
+    tokens = tokenize(statement, limit=_HEADER_TOKENS)
+    n = len(tokens)
+    if not n or not tokens[0].is_word("CREATE"):
+        return None, ()
+
+    i = 1
+    while i < n and tokens[i].kind == WORD and tokens[i].value.upper() in _CREATE_MODIFIERS:
+        i += 1
+    if i >= n or tokens[i].kind != WORD:
+        return None, ()
+
+    kind = tokens[i].value.upper()
+    i += 1
+    if kind in ("DYNAMIC", "EXTERNAL", "EVENT") and i < n and tokens[i].is_word("TABLE"):
+        kind += " TABLE"
+        i += 1
+    elif kind == "MATERIALIZED" and i < n and tokens[i].is_word("VIEW"):
+        kind = "MATERIALIZED VIEW"
+        i += 1
+    elif kind == "FILE" and i < n and tokens[i].is_word("FORMAT"):
+        kind = "FILE FORMAT"
+        i += 1
+
+    if i < n and tokens[i].is_word("IF"):
+        i += 3 #IF NOT EXISTS
+
+    name, _ = _read_qualified_name(tokens, i)
+    return kind, name
+
+
+def split_schema_ddl(script, schema_name, kinds=("TABLE", "VIEW", "DYNAMIC TABLE")):
+    """
+    GET_DDL('SCHEMA', ...) output -> {'SCHEMA.NAME': (kind, 'create or replace ...;')} for the objects of the given kinds
+    Unqualified names are in schema_name. Statements are split as the text streams by, nothing else is parsed.
+    """
+    definitions = {}
+    schema_key = identifier_key(schema_name)
+    for statement in iter_statements(script):
+        kind, name = statement_object(statement)
+        if kind not in kinds or not name:
+            continue
+        key = f"{identifier_key(name[-2]) if len(name) > 1 else schema_key}.{identifier_key(name[-1])}"
+        definitions[key] = (kind, statement + ";") #same shape as a single object's GET_DDL
+    return definitions
+
+
+class DdlDefinition:
+    """
+    Structured view of a CREATE VIEW / DYNAMIC TABLE / TABLE statement.
+    projection items: {'expression', 'type', 'alias', 'explicit_alias'} (type is None without a :: cast)
+    sources: every object read in a FROM/JOIN, as tuples of name parts, e.g. ('DB', 'SCHEMA', 'TABLE'), CTE names excluded
+    main_source: first source of the main SELECT (what the editors call the "source object")
+    """
+
+    def __init__(self):
+        self.kind = None            #'VIEW', 'DYNAMIC TABLE', 'TABLE'
+        self.name = None            #name parts as written, e.g. ('ANALYTICS', 'MY_VIEW')
+        self.column_names = []      #column list of the header: CREATE VIEW X(ID, NAME)
+        self.column_tokens = []     #every token inside the header parens (full column definitions for tables)
+        self.properties = {}        #KEY -> raw value text (quotes stripped for strings)
+        self.projection = []
+        self.sources = []
+        self.main_source = None
+        self.query = None           #the AS ... part (without the trailing ;)
+        self.query_tokens = []
+
+    @property
+    def target_lag(self):
+        return self.properties.get("TARGET_LAG")
+
+    @property
+    def warehouse(self):
+        return self.properties.get("WAREHOUSE")
+
+    @property
+    def refresh_mode(self):
+        return self.properties.get("REFRESH_MODE")
+
+    def __repr__(self):
+        return f"DdlDefinition({self.kind} {'.'.join(self.name or ())}, {len(self.projection)} columns, sources={self.sources})"
+
+
+def parse_ddl(ddl):
+    tokens = tokenize(ddl)
+    definition = DdlDefinition()
+    n = len(tokens)
+
+    i = _parse_header(tokens, definition)
+
+    #The query starts after the top level AS
+    if i < n:
+        query_start = tokens[i].start
+        query_end = tokens[-1].end
+        if tokens[-1].value == ";":
+            query_end = tokens[-2].end if n > 1 else tokens[-1].start
+        definition.query = ddl[query_start:query_end]
+        definition.query_tokens = tokens[i:-1] if tokens[-1].value == ";" else tokens[i:]
+        _parse_query(ddl, tokens, i, definition)
+
+    return definition
+
+
+def _parse_header(tokens, definition):
+    #Returns the index of the first token of the query (after AS), or len(tokens) if there is no query
+    n = len(tokens)
+    i = 0
+
+    #CREATE [OR REPLACE] [SECURE|TRANSIENT|...] VIEW|DYNAMIC TABLE|TABLE [IF NOT EXISTS] name
+    while i < n and tokens[i].kind == WORD:
+        word = tokens[i].value.upper()
+        i += 1
+        if word == "VIEW":
+            definition.kind = "VIEW"
+            break
+        if word == "TABLE":
+            definition.kind = "DYNAMIC TABLE" if definition.kind == "DYNAMIC" else "TABLE"
+            break
+        if word == "DYNAMIC":
+            definition.kind = "DYNAMIC"
+
+    if i < n and tokens[i].is_word("IF"):
+        i += 3 #IF NOT EXISTS
+
+    name, i = _read_qualified_name(tokens, i)
+    definition.name = name
+
+    while i < n and tokens[i].is_word("COPY", "GRANTS"):
+        i += 1
+
+    #Optional column list (before or after the properties, DynamicTable.create_ddl writes it after) and KEY = value properties, until the top level AS
+    while i < n:
+        token = tokens[i]
+        if token.is_word("AS") and token.depth == 0:
+            return i + 1
+
+        #CLUSTER BY (..), WITH TAG (..), ROW ACCESS POLICY p ON (..) are not the column list
+        if token.value == "(" and token.kind == OP and token.depth == 0 and not definition.column_tokens \
+                and not tokens[i - 1].is_word("BY", "TAG", "ON"):
+            i = _parse_column_list(tokens, i, definition)
+            continue
+
+        if token.kind == WORD and i + 2 < n and tokens[i + 1].value == "=":
+            value = tokens[i + 2]
+            if value.kind == STRING:
+                definition.properties[token.value.upper()] = _unquote_string(value.value)
+            else:
+                definition.properties[token.value.upper()] = value.value
+            i += 3
+            continue
+        i += 1
+
+    return n
+
+
+def _parse_column_list(tokens, i, definition):
+    #tokens[i] is the '(' - collects the first identifier of every top level item, returns the index after the ')'
+    n = len(tokens)
+    list_depth = tokens[i].depth + 1
+    i += 1
+    list_start = i
+    expect_name = True
+    while i < n and not (tokens[i].value == ")" and tokens[i].depth == list_depth - 1):
+        token = tokens[i]
+        if token.depth == list_depth:
+            if expect_name and token.kind in (WORD, QUOTED):
+                definition.column_names.append(token.value)
+                expect_name = False
+            elif token.value == ",":
+                expect_name = True
+        i += 1
+    definition.column_tokens = tokens[list_start:i]
+    return i + 1
+
+
+def _parse_query(ddl, tokens, i, definition):
+    n = len(tokens)
+
+    #One walk over the query: find the main SELECT (the shallowest one), the CTE names and every FROM/JOIN source
+    cte_names = set()
+    select_depths = {} #depth -> a SELECT was seen at this depth (inside the current parens)
+    main_select = None
+    main_from = None
+    sources = []
+    main_sources = []
+    expect_cte = tokens[i].is_word("WITH") if i < n else False
+
+    j = i
+    while j < n:
+        token = tokens[j]
+
+        if token.value == "(" and token.kind == OP:
+            select_depths[token.depth + 1] = False
+        elif token.kind == WORD:
+            word = token.value.upper()
+
+            if expect_cte and token.depth == 0:
+                #WITH a AS (...), b AS (...) SELECT
+                if word == "SELECT":
+                    expect_cte = False
+                elif word not in ("WITH", "RECURSIVE", "AS"):
+                    cte_names.add(identifier_key(token.value))
+
+            if word == "SELECT":
+                select_depths[token.depth] = True
+                if main_select is None or token.depth < tokens[main_select].depth:
+                    #a shallower SELECT (e.g. after the CTEs) is the real main query
+                    main_select = j
+                    main_from = None
+                    main_sources = []
+            elif word in ("FROM", "JOIN") and select_depths.get(token.depth):
+                #FROM inside EXTRACT(YEAR FROM x) / TRIM(.. FROM x) has no SELECT at its depth, so it's skipped
+                if word == "FROM" and main_select is not None and token.depth == tokens[main_select].depth and main_from is None:
+                    main_from = j
+                j = _read_sources(tokens, j + 1, cte_names, sources,
+                                  main_sources if main_select is not None and token.depth == tokens[main_select].depth else None)
+                continue
+        j += 1
+
+    definition.sources = sources
+    #SELECT .. FROM some_cte -> fall back to the first real object the query reads
+    definition.main_source = main_sources[0] if main_sources else (sources[0] if sources else None)
+
+    if main_select is not None:
+        definition.projection = _parse_projection(ddl, tokens, main_select, main_from)
+
+
+def _read_sources(tokens, j, cte_names, sources, main_sources):
+    #Reads "a.b.c [AS] x, d.e [x]" after FROM/JOIN, stops at the next clause keyword, returns the index to continue from
+    n = len(tokens)
+    if j >= n:
+        return j
+    depth = tokens[j - 1].depth
+
+    while j < n and tokens[j].kind in (WORD, QUOTED) and not (tokens[j].kind == WORD and tokens[j].value.upper() in SOURCE_STOP_WORDS):
+        name, j = _read_qualified_name(tokens, j)
+        if name and not (len(name) == 1 and identifier_key(name[0]) in cte_names):
+            if name not in sources:
+                sources.append(name)
+            if main_sources is not None:
+                main_sources.append(name)
+
+        #Optional alias
+        if j < n and tokens[j].is_word("AS"):
+            j += 1
+        if j < n and tokens[j].kind in (WORD, QUOTED) and tokens[j].depth == depth \
+                and not (tokens[j].kind == WORD and tokens[j].value.upper() in CLAUSE_KEYWORDS):
+            j += 1
+
+        #FROM a, b -> another source
+        if j < n and tokens[j].value == "," and tokens[j].depth == depth:
+            j += 1
+            continue
+        break
+
+    return j
+
+
+def _parse_projection(ddl, tokens, select_index, from_index):
+    depth = tokens[select_index].depth
+    start = select_index + 1
+    n = len(tokens)
+
+    #SELECT DISTINCT / TOP n
+    if start < n and tokens[start].is_word("DISTINCT", "ALL"):
+        start += 1
+    if start < n and tokens[start].is_word("TOP"):
+        start += 2
+
+    if from_index is not None:
+        end = from_index
+    else:
+        #No FROM (SELECT 1 AS X) -> the projection runs to the next clause or the end
+        end = start
+        while end < n and not (tokens[end].depth < depth or (tokens[end].depth == depth and (
+                tokens[end].value == ";" or (tokens[end].kind == WORD and tokens[end].value.upper() in CLAUSE_KEYWORDS)))):
+            end += 1
+
+    items = []
+    item_start = start
+    for k in range(start, end + 1):
+        if k == end or (tokens[k].value == "," and tokens[k].depth == depth):
+            if k > item_start:
+                items.append(_parse_projection_item(ddl, tokens[item_start:k], depth))
+            item_start = k + 1
+
+    return items
+
+
+def _parse_projection_item(ddl, item_tokens, depth):
+    alias = None
+    explicit_alias = False
+    expr_tokens = item_tokens
+
+    last = item_tokens[-1]
+    if len(item_tokens) >= 3 and item_tokens[-2].is_word("AS") and item_tokens[-2].depth == depth:
+        alias = last.value
+        explicit_alias = True
+        expr_tokens = item_tokens[:-2]
+    elif len(item_tokens) >= 2 and last.kind in (WORD, QUOTED) and last.depth == depth:
+        #expr alias (without AS), but not "x::NUMBER" / "a.b" / CASE .. END / x IS NULL
+        previous = item_tokens[-2]
+        is_keyword = last.kind == WORD and last.value.upper() in NOT_ALIAS_WORDS
+        if not is_keyword and (previous.kind != OP or previous.value == ")"):
+            alias = last.value
+            expr_tokens = item_tokens[:-1]
+
+    #Last top level :: is the cast to the column type
+    data_type = None
+    cast_at = None
+    for k in range(len(expr_tokens) - 1, -1, -1):
+        if expr_tokens[k].value == "::" and expr_tokens[k].depth == depth:
+            cast_at = k
+            break
+
+    if cast_at is not None and cast_at + 1 < len(expr_tokens):
+        data_type = ddl[expr_tokens[cast_at + 1].start:expr_tokens[-1].end]
+        expression = ddl[expr_tokens[0].start:expr_tokens[cast_at - 1].end] if cast_at > 0 else ""
+    else:
+        expression = ddl[expr_tokens[0].start:expr_tokens[-1].end]
+
+    if alias is None:
+        #Plain column (ID or T.ID or ID::NUMBER) -> the column keeps its name
+        base = expr_tokens[:cast_at] if cast_at is not None else expr_tokens
+        if base and base[-1].kind in (WORD, QUOTED) and all(t.kind in (WORD, QUOTED) or t.value == "." for t in base):
+            alias = base[-1].value
+
+    return {
+        "expression": expression,
+        "type": data_type,
+        "alias": alias,
+        "explicit_alias": explicit_alias,
+    }
+
+
+def _read_qualified_name(tokens, i):
+    #a.b.c -> ('a', 'b', 'c')
+    n = len(tokens)
+    parts = []
+    while i < n and tokens[i].kind in (WORD, QUOTED):
+        parts.append(tokens[i].value)
+        i += 1
+        if i < n and tokens[i].value == "." and i + 1 < n:
+            i += 1
+            continue
+        break
+    return tuple(parts), i
+
+
+def _unquote_string(literal):
+    if literal.startswith("$$"):
+        return literal[2:-2]
+    return literal[1:-1].replace("''", "'")
+
+
+def identifier_key(identifier):
+    #"Quoted" identifiers are case sensitive, unquoted ones are stored upper case by Snowflake
+    if identifier.startswith('"'):
+        return identifier[1:-1].replace('""', '"')
+    return identifier.upper()
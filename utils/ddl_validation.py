@@ -0,0 +1,154 @@
+"""
+Compile-only validation of generated DDL, many objects at once: nothing is created and nothing runs on a warehouse.
+Views/dynamic tables: EXPLAIN of their SELECT. Tables: EXPLAIN of a SELECT casting NULL to every column type.
+Snowflake's compile errors say 'error line L at position P', the line is mapped back to the projection item
+(= the editor grid row / column alias) written on it, or to the column the error message quotes.
+Results are cached by the normalized DDL hash (utils/change_detection.py), re-validating a layer only compiles what changed.
+"""
+import re
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.ddl_parser import parse_ddl, identifier_key, OP
+from utils.change_detection import ddl_hash
+from utils.plan_check import explain_sql
+from utils.query_profiler import submit_in_context
+
+
+DEFAULT_MAX_WORKERS = 8 #compiles are cloud services work, no warehouse: more of them at once is fine
+VALIDATION_TTL = 300
+VALIDATION_CACHE_ENTRIES = 4096
+
+_ERROR_POSITION_RE = re.compile(r"line (\d+) at position (\d+)", re.IGNORECASE)
+_QUOTED_NAME_RE = re.compile(r"""['"]([^'"]+)['"]""")
+#Column options that end the type of a table column definition
+_COLUMN_OPTIONS = ("NOT", "NULL", "DEFAULT", "COLLATE", "COMMENT", "PRIMARY", "UNIQUE", "CONSTRAINT", "AUTOINCREMENT", "IDENTITY", "REFERENCES", "FOREIGN")
+
+
+def compile_statement(ddl, obj_type):
+    """
+    (statement, items): the EXPLAIN that compiles the object's SQL, and [(alias, first line, last line)] of every
+    projection item / table column in the statement, in grid order.
+    """
+    definition = parse_ddl(ddl)
+    if obj_type == "Table":
+        columns = _table_columns(ddl, definition)
+        #One column per line, right after the first line: item k sits on line k + 2
+        select_list = ",\n\t".join(f"CAST(NULL AS {data_type}) AS {name}" for name, data_type in columns)
+        statement = explain_sql(f"SELECT\n\t{select_list}")
+        return statement, [(name, k + 2, k + 2) for k, (name, _) in enumerate(columns)]
+
+    query = definition.query
+    if not query:
+        raise ValueError("No SELECT found in the DDL")
+    statement = explain_sql(query) #same line numbers as the query, the prefix doesn't add a line
+    items, cursor = [], 0
+    for item in definition.projection:
+        position = query.find(item["expression"], cursor)
+        if position < 0:
+            position = cursor
+        cursor = position + len(item["expression"])
+        first_line = query.count("\n", 0, position) + 1
+        items.append((item["alias"], first_line, first_line + item["expression"].count("\n")))
+    return statement, items
+
+
+def _table_columns(ddl, definition):
+    #[(name, type text)] from the header of a CREATE TABLE, split at the top level commas of the column list
+    columns, group = [], []
+    for token in definition.column_tokens + [None]:
+        if token is None or (token.kind == OP and token.value == "," and token.depth == 1):
+            if group:
+                type_tokens = []
+                for part in group[1:]:
+                    if part.depth == 1 and part.is_word(*_COLUMN_OPTIONS):
+                        break
+                    type_tokens.append(part)
+                data_type = ddl[type_tokens[0].start:type_tokens[-1].end] if type_tokens else "VARCHAR"
+                columns.append((group[0].value, data_type))
+            group = []
+        else:
+            group.append(token)
+    return columns
+
+
+def locate_error(message, items):
+    #(row number 1-based, alias) of the grid row the compile error points at, (None, None) if it can't be told
+    match = _ERROR_POSITION_RE.search(message or "")
+    if match:
+        line = int(match.group(1))
+        for k, (alias, first_line, last_line) in enumerate(items):
+            if first_line <= line <= last_line:
+                return k + 1, alias
+
+    #No usable position (or it's outside the select list): a column the message quotes, e.g. invalid identifier 'FOO'
+    for name in _QUOTED_NAME_RE.findall(message or ""):
+        for k, (alias, _, _) in enumerate(items):
+            if identifier_key(alias) == identifier_key(name.split(".")[-1]):
+                return k + 1, alias
+    return None, None
+
+
+def cache_key(context, item):
+    #Same layout as the MetadataCache keys (account, role, database, schema, object, method, args, kwargs)
+    return tuple(context) + (
+        identifier_key(item.schema), identifier_key(item.name), "validate", (item.obj_type, ddl_hash(item.ddl)), (),
+    )
+
+
+def validate_batch(session, items, cache=None, context=(), max_workers=DEFAULT_MAX_WORKERS, on_result=None):
+    """
+    Compiles every item (DeployItem-like: schema, name, obj_type, ddl) concurrently on a bounded thread pool.
+    Returns one result per item, in order: {'name', 'obj_type', 'status': 'valid'|'invalid', 'row', 'column', 'error', 'seconds', 'cached'}
+    cache: a MetadataCache, results are kept under the DDL hash for VALIDATION_TTL seconds.
+    on_result(result) is called as soon as an object is done (live progress).
+    """
+    results = [None] * len(items)
+    lock = threading.Lock()
+
+    def record(index, result):
+        with lock:
+            results[index] = result
+        if on_result:
+            on_result(result)
+
+    def run(index, item):
+        key = cache_key(context, item) if cache is not None else None
+        if key is not None:
+            found, cached_result = cache.get(key)
+            if found:
+                record(index, dict(cached_result, cached=True))
+                return
+
+        started = time.perf_counter()
+        row, column, error = None, None, None
+        try:
+            statement, grid_items = compile_statement(item.ddl, item.obj_type)
+            try:
+                session.sql(statement).collect()
+            except Exception as e:
+                error = str(e)
+                row, column = locate_error(error, grid_items)
+        except ValueError as e:
+            error = str(e)
+
+        result = {
+            "name": f"{identifier_key(item.schema)}.{identifier_key(item.name)}",
+            "obj_type": item.obj_type,
+            "status": "invalid" if error else "valid",
+            "row": row,
+            "column": column,
+            "error": error,
+            "seconds": round(time.perf_counter() - started, 3),
+            "cached": False,
+        }
+        if key is not None:
+            cache.set(key, result, VALIDATION_TTL)
+        record(index, result)
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="igloo-validate") as pool:
+        futures = [submit_in_context(pool, run, index, item) for index, item in enumerate(items)]
+        for future in futures:
+            future.result()
+    return results
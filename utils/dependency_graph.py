@@ -0,0 +1,217 @@
+"""
+Database-wide object dependency index: which objects a view/dynamic table reads (upstream) and who reads an object (downstream).
+Built in bulk, from SNOWFLAKE.ACCOUNT_USAGE.OBJECT_DEPENDENCIES when the role can read it, otherwise by parsing every
+view/dynamic table definition of the database (2 queries). After that every lookup is a walk over in-memory sets.
+Nodes are 'SCHEMA.NAME' of the names as Snowflake stores them (= identifier_key of the SQL identifier, like DeployItem.fq_name),
+objects of other databases are 'DATABASE.SCHEMA.NAME'. Metadata rows already carry stored names and are used as they are,
+only identifiers read from DDL text go through identifier_key: "My View" -> My View, my_view -> MY_VIEW.
+"""
+import time
+import threading
+from collections import deque
+
+from utils.ddl_parser import parse_ddl, identifier_key
+
+
+#ACCOUNT_USAGE lags behind (up to ~3 hours), the app's own deploys are patched in with set_sources()
+ACCOUNT_USAGE_QUERY = """
+SELECT REFERENCING_SCHEMA, REFERENCING_OBJECT_NAME, REFERENCING_OBJECT_DOMAIN,
+       REFERENCED_DATABASE, REFERENCED_SCHEMA, REFERENCED_OBJECT_NAME, REFERENCED_OBJECT_DOMAIN
+FROM SNOWFLAKE.ACCOUNT_USAGE.OBJECT_DEPENDENCIES
+WHERE REFERENCING_DATABASE = '{database}'
+"""
+
+#Fallback: the definitions themselves, one query per object kind for the whole database
+VIEW_DEFINITIONS_QUERY = """
+SELECT TABLE_SCHEMA, TABLE_NAME, VIEW_DEFINITION
+FROM {database}.INFORMATION_SCHEMA.VIEWS
+WHERE TABLE_SCHEMA <> 'INFORMATION_SCHEMA'
+"""
+DYNAMIC_TABLES_QUERY = "SHOW DYNAMIC TABLES IN DATABASE {database}"
+
+
+class DependencyGraph:
+    """
+    Adjacency sets both ways (upstream: node -> what it reads, downstream: node -> who reads it), kept in sync.
+    Transitive lookups are memoized until the next change of the graph.
+    """
+
+    def __init__(self, database):
+        self.database = database #stored name, e.g. session.get_current_database()
+        self.source = None #'account_usage' | 'ddl' once loaded
+        self.loaded_at = None
+        self._upstream = {}
+        self._downstream = {}
+        self._kinds = {} #node -> 'VIEW', 'TABLE', 'DYNAMIC TABLE', ... when known
+        self._closures = {} #(direction, node) -> {node: depth}, cleared on every change
+        self._lock = threading.RLock()
+
+    def node(self, schema_name, obj_name, database=None):
+        #Stored names in, nothing is normalized here (a second identifier_key would turn My View into MY VIEW)
+        key = f"{schema_name}.{obj_name}"
+        if database and database != self.database:
+            return f"{database}.{key}"
+        return key
+
+    def load(self, session):
+        #Replaces the whole graph, ACCOUNT_USAGE first (no DDL parsing at all), the definitions if the role can't see it
+        try:
+            rows = session.sql(ACCOUNT_USAGE_QUERY.format(database=self.database)).collect()
+            edges = [
+                (self.node(row["REFERENCING_SCHEMA"], row["REFERENCING_OBJECT_NAME"]), row["REFERENCING_OBJECT_DOMAIN"],
+                 self.node(row["REFERENCED_SCHEMA"], row["REFERENCED_OBJECT_NAME"], row["REFERENCED_DATABASE"]),
+                 row["REFERENCED_OBJECT_DOMAIN"])
+                for row in rows
+            ]
+            source = "account_usage"
+        except Exception:
+            edges = list(self._definition_edges(session))
+            source = "ddl"
+
+        with self._lock:
+            self._upstream, self._downstream, self._kinds = {}, {}, {}
+            for node, kind, dependency, dependency_kind in edges:
+                self._add_edge(node, dependency)
+                self._kinds[node] = kind
+                self._kinds.setdefault(dependency, dependency_kind)
+            self._closures.clear()
+            self.source = source
+            self.loaded_at = time.time()
+        return self.stats()
+
+    def _definition_edges(self, session):
+        for row in session.sql(VIEW_DEFINITIONS_QUERY.format(database=self.database)).collect():
+            node = self.node(row["TABLE_SCHEMA"], row["TABLE_NAME"])
+            for dependency in self.parse_sources(row["VIEW_DEFINITION"], row["TABLE_SCHEMA"]):
+                yield node, "VIEW", dependency, None
+        for row in session.sql(DYNAMIC_TABLES_QUERY.format(database=self.database)).collect():
+            node = self.node(row["schema_name"], row["name"])
+            for dependency in self.parse_sources(row["text"], row["schema_name"]):
+                yield node, "DYNAMIC TABLE", dependency, None
+
+    def parse_sources(self, ddl, schema_name):
+        #Nodes read by a definition, unqualified names are in the object's own schema (schema_name: its stored name)
+        dependencies = set()
+        for parts in parse_ddl(ddl or "").sources:
+            parts = [identifier_key(part) for part in parts]
+            if len(parts) == 1:
+                dependencies.add(self.node(schema_name, parts[0]))
+            elif len(parts) == 2:
+                dependencies.add(self.node(parts[0], parts[1]))
+            else:
+                dependencies.add(self.node(parts[-2], parts[-1], parts[-3]))
+        return dependencies
+
+    #Incremental updates: one object at a time, e.g. after a deploy (no reload of the database)
+    def set_sources(self, node, dependencies, kind=None):
+        with self._lock:
+            for dependency in self._upstream.pop(node, set()):
+                self._downstream.get(dependency, set()).discard(node)
+            for dependency in dependencies:
+                self._add_edge(node, dependency)
+            if kind:
+                self._kinds[node] = kind
+            self._closures.clear()
+
+    def remove(self, node):
+        #A dropped object: its own edges go, objects that still read it keep the (now broken) edge
+        with self._lock:
+            self.set_sources(node, ())
+            if not self._downstream.get(node):
+                self._downstream.pop(node, None)
+                self._kinds.pop(node, None)
+
+    def _add_edge(self, node, dependency):
+        self._upstream.setdefault(node, set()).add(dependency)
+        self._downstream.setdefault(dependency, set()).add(node)
+
+    def kind(self, node):
+        return self._kinds.get(node)
+
+    def upstream(self, node):
+        return set(self._upstream.get(node, ()))
+
+    def downstream(self, node):
+        return set(self._downstream.get(node, ()))
+
+    def transitive_upstream(self, node):
+        return self._closure("up", node)
+
+    def transitive_downstream(self, node):
+        return self._closure("down", node)
+
+    def _closure(self, direction, node):
+        #{node: depth} of everything reachable (depth 1 = direct), the start node itself only if it's on a cycle
+        key = (direction, node)
+        with self._lock:
+            closure = self._closures.get(key)
+            if closure is None:
+                edges = self._upstream if direction == "up" else self._downstream
+                closure = {}
+                queue = deque([(node, 0)])
+                while queue:
+                    current, depth = queue.popleft()
+                    for neighbour in edges.get(current, ()):
+                        if neighbour not in closure:
+                            closure[neighbour] = depth + 1
+                            queue.append((neighbour, depth + 1))
+                self._closures[key] = closure
+            return dict(closure)
+
+    def cycles(self):
+        """
+        Strongly connected components with more than one node (or a node reading itself), iterative Tarjan.
+        Snowflake refuses most cycles at CREATE time, but a CREATE OR REPLACE can still close one.
+        """
+        with self._lock:
+            graph = {node: list(deps) for node, deps in self._upstream.items()}
+        index_of, low, on_stack, stack, found = {}, {}, set(), [], []
+        counter = 0
+
+        for root in graph:
+            if root in index_of:
+                continue
+            work = [(root, iter(graph.get(root, ())))]
+            index_of[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                node, neighbours = work[-1]
+                advanced = False
+                for neighbour in neighbours:
+                    if neighbour not in index_of:
+                        index_of[neighbour] = low[neighbour] = counter
+                        counter += 1
+                        stack.append(neighbour)
+                        on_stack.add(neighbour)
+                        work.append((neighbour, iter(graph.get(neighbour, ()))))
+                        advanced = True
+                        break
+                    if neighbour in on_stack:
+                        low[node] = min(low[node], index_of[neighbour])
+                if advanced:
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index_of[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1 or node in graph.get(node, ()):
+                        found.append(sorted(component))
+        return sorted(found)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "source": self.source,
+                "nodes": len(set(self._upstream) | set(self._downstream)),
+                "edges": sum(len(deps) for deps in self._upstream.values()),
+            }
@@ -0,0 +1,174 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.ddl_parser import parse_ddl, identifier_key, as_single_statement
+from utils.query_profiler import submit_in_context
+
+
+DEFAULT_MAX_WORKERS = 4
+
+
+class DeployItem:
+    """One object of a batch deploy: where it goes + the DDL that creates it (+ what to run instead, e.g. an ALTER migration)."""
+
+    def __init__(self, schema, name, obj_type, ddl, commitmsg=None, deploy_sql=None):
+        self.schema = schema
+        self.name = name
+        self.obj_type = obj_type
+        self.ddl = ddl
+        self.commitmsg = commitmsg
+        self.deploy_sql = deploy_sql
+
+    @property
+    def fq_name(self):
+        return f"{identifier_key(self.schema)}.{identifier_key(self.name)}"
+
+    def sources(self):
+        #SCHEMA.NAME of everything the DDL reads, unqualified names are in the object's own schema
+        if self.obj_type == 'Table':
+            return set()
+
+        result = set()
+        for parts in parse_ddl(self.ddl).sources:
+            if len(parts) == 1:
+                result.add(f"{identifier_key(self.schema)}.{identifier_key(parts[0])}")
+            else:
+                result.add(f"{identifier_key(parts[-2])}.{identifier_key(parts[-1])}")
+        return result
+
+    def __repr__(self):
+        return f"DeployItem({self.obj_type} {self.fq_name})"
+
+
+def build_graph(items):
+    #name -> set of names it depends on, only edges inside the batch matter (everything else should already exist)
+    by_name = {item.fq_name: item for item in items}
+    return {
+        name: {source for source in item.sources() if source in by_name and source != name}
+        for name, item in by_name.items()
+    }
+
+
+def topological_waves(graph):
+    """
+    Kahn's algorithm, grouped: every wave only depends on earlier waves, so a wave can run in parallel.
+    Returns (waves, cycle) where cycle is the set of names that could not be ordered.
+    """
+    remaining = {name: set(deps) for name, deps in graph.items()}
+    dependents = {name: set() for name in graph}
+    for name, deps in graph.items():
+        for dep in deps:
+            dependents[dep].add(name)
+
+    waves = []
+    ready = sorted(name for name, deps in remaining.items() if not deps)
+    while ready:
+        waves.append(ready)
+        next_ready = []
+        for name in ready:
+            del remaining[name]
+            for dependent in dependents[name]:
+                remaining[dependent].discard(name)
+                if not remaining[dependent]:
+                    next_ready.append(dependent)
+        ready = sorted(next_ready)
+
+    return waves, set(remaining)
+
+
+def deploy_batch(session, items, max_workers=DEFAULT_MAX_WORKERS, on_result=None, unchanged=()):
+    """
+    Deploys the items wave by wave, the objects of a wave run concurrently on a bounded thread pool.
+    A failed object only stops its (transitive) dependents, everything else keeps going.
+    on_result(result) is called as soon as an object finishes (for live progress in the UI).
+    Returns one result dict per item: {'name', 'obj_type', 'status', 'wave', 'seconds', 'error'}
+    status: 'success', 'failed', 'skipped' (an upstream object failed), 'unchanged' or 'cycle'
+    unchanged: names already deployed with the same definition, they are not executed but count as deployed for their dependents
+    """
+    by_name = {item.fq_name: item for item in items}
+    graph = build_graph(items)
+    waves, cycle = topological_waves(graph)
+
+    results = {}
+    lock = threading.Lock()
+
+    def record(result):
+        with lock:
+            results[result["name"]] = result
+        if on_result:
+            on_result(result)
+
+    def run(item, wave_no):
+        started = time.perf_counter()
+        try:
+            session.sql(as_single_statement(item.deploy_sql or item.ddl)).collect()
+            status, error = "success", None
+        except Exception as e:
+            status, error = "failed", str(e)
+        record(_result(item, status, wave_no, time.perf_counter() - started, error))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for wave_no, wave in enumerate(waves, start=1):
+            to_run = []
+            for name in wave:
+                failed_deps = sorted(dep for dep in graph[name] if results[dep]["status"] not in ("success", "unchanged"))
+                if failed_deps:
+                    record(_result(by_name[name], "skipped", wave_no, 0.0, f"Upstream not deployed: {', '.join(failed_deps)}"))
+                elif name in unchanged:
+                    record(_result(by_name[name], "unchanged", wave_no, 0.0, None))
+                else:
+                    to_run.append(by_name[name])
+
+            #Wait for the whole wave before starting the next one
+            futures = [submit_in_context(pool, run, item, wave_no) for item in to_run]
+            for future in futures:
+                future.result()
+
+    for name in sorted(cycle):
+        record(_result(by_name[name], "cycle", None, 0.0, "Dependency cycle inside the batch"))
+
+    return [results[item.fq_name] for item in items]
+
+
+def _result(item, status, wave_no, seconds, error):
+    return {
+        "name": item.fq_name,
+        "obj_type": item.obj_type,
+        "status": status,
+        "wave": wave_no,
+        "seconds": round(seconds, 3),
+        "error": error,
+    }
+
+
+class LocalSession:
+    """
+    Stand-in for a Snowpark session, to exercise the engine without Snowflake.
+    Records every statement, can sleep to fake query latency and fail statements that contain a marker.
+    """
+
+    def __init__(self, latency=0.0, fail_when=()):
+        self.latency = latency
+        self.fail_when = tuple(fail_when)
+        self.executed = []
+        self._lock = threading.Lock()
+
+    def sql(self, query):
+        return _LocalQuery(self, query)
+
+
+class _LocalQuery:
+    def __init__(self, session, query):
+        self.session = session
+        self.query = query
+
+    def collect(self, statement_params=None):
+        if self.session.latency:
+            time.sleep(self.session.latency)
+        for marker in self.session.fail_when:
+            if marker in self.query:
+                raise RuntimeError(f"Simulated failure ({marker})")
+        with self.session._lock:
+            self.session.executed.append(self.query)
+        return [{"status": "Statement executed successfully."}]
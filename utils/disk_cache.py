@@ -0,0 +1,192 @@
+"""
+Persistent second level for the metadata cache: a SQLite file that survives app restarts.
+After a restart the first render is served from disk (no Snowflake round trip) and a background refresh re-runs
+the query and overwrites the entry, see utils/cache.py::cached.
+
+One row per cached call, keyed like MetadataCache: (account, role, database) context, schema, object, method, args.
+WAL mode: any number of readers (every Streamlit session thread, other app processes) next to one writer.
+Size bounded: past max_bytes the least recently read entries are evicted.
+"""
+import os
+import json
+import time
+import sqlite3
+import threading
+
+from utils.ddl_parser import identifier_key
+from utils.cache import CROSS_OBJECT_METHODS
+
+
+#Bump when the stored value format of any provider method changes, an older file is then wiped on open
+FORMAT_VERSION = 1
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_AGE = 7 * 24 * 3600 #older entries are ignored (and evicted), even a background refresh is too late for them
+_TOUCH_INTERVAL = 60 #seconds, accessed_at is only rewritten this often (reads shouldn't turn into writes)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS entries (
+    context TEXT NOT NULL,
+    schema_key TEXT NOT NULL,
+    obj_key TEXT NOT NULL,
+    method TEXT NOT NULL,
+    args TEXT NOT NULL,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (context, schema_key, obj_key, method, args)
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at);
+"""
+
+
+class DiskCache:
+
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES, max_age=DEFAULT_MAX_AGE):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._bytes = 0 #running estimate of the file's payload, recounted whenever it crosses max_bytes
+        self._local = threading.local() #sqlite3 connections can't be shared between threads
+        self._write_lock = threading.Lock() #one writer per process, other processes wait on SQLite's own lock
+        self._open()
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=10, isolation_level=None) #autocommit, explicit BEGIN for writes
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def _open(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        connection = self._connection()
+        with self._write_lock:
+            connection.executescript(_SCHEMA) #IF NOT EXISTS: safe when several processes open the file at once
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = connection.execute("SELECT value FROM meta WHERE key = 'format_version'").fetchone()
+                if row is None or int(row[0]) != FORMAT_VERSION:
+                    connection.execute("DELETE FROM entries")
+                    connection.execute("INSERT OR REPLACE INTO meta VALUES ('format_version', ?)", (str(FORMAT_VERSION),))
+                self._bytes = connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+
+    @staticmethod
+    def _columns(key):
+        #MetadataCache key: account, role, database, schema, object, method, args, kwargs
+        account, role, database, schema_key, obj_key, method, args, kwargs = key
+        return (
+            json.dumps([account, role, database]), schema_key or "", obj_key or "", method,
+            json.dumps([list(args), [list(item) for item in kwargs]], default=str),
+        )
+
+    def get(self, key):
+        #(found, value), lists come back where a tuple was stored (JSON), the provider's callers only unpack/iterate them
+        columns = self._columns(key)
+        connection = self._connection()
+        row = connection.execute(
+            "SELECT value, stored_at, accessed_at FROM entries WHERE context = ? AND schema_key = ? AND obj_key = ? AND method = ? AND args = ?",
+            columns,
+        ).fetchone()
+        now = time.time()
+        if row is None or row[1] < now - self.max_age:
+            self.misses += 1
+            return False, None
+
+        if row[2] < now - _TOUCH_INTERVAL:
+            try:
+                connection.execute(
+                    "UPDATE entries SET accessed_at = ? WHERE context = ? AND schema_key = ? AND obj_key = ? AND method = ? AND args = ?",
+                    (now,) + columns,
+                )
+            except sqlite3.OperationalError:
+                pass #locked by another writer: the LRU order is a hint, the read still counts
+        self.hits += 1
+        return True, json.loads(row[0])
+
+    def set(self, key, value):
+        try:
+            payload = json.dumps(value)
+        except (TypeError, ValueError):
+            return False #not JSON friendly, stays in memory only
+        now = time.time()
+        connection = self._connection()
+        with self._write_lock:
+            connection.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                self._columns(key) + (payload, len(payload), now, now),
+            )
+            self._bytes += len(payload) #overcounts replaced entries (and misses other processes), the recount fixes both
+            if self._bytes > self.max_bytes:
+                self._evict(connection, now)
+        return True
+
+    def _evict(self, connection, now):
+        removed = connection.execute("DELETE FROM entries WHERE stored_at < ?", (now - self.max_age,)).rowcount
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total > self.max_bytes:
+            #Oldest reads first, until 10% under the bound so it doesn't run on every write
+            target = total - int(self.max_bytes * 0.9)
+            freed = 0
+            victims = []
+            for rowid, size in connection.execute("SELECT rowid, size FROM entries ORDER BY accessed_at"):
+                victims.append((rowid,))
+                freed += size
+                if freed >= target:
+                    break
+            connection.executemany("DELETE FROM entries WHERE rowid = ?", victims)
+            removed += len(victims)
+            total -= freed
+        self._bytes = total
+        self.evictions += removed
+
+    def invalidate(self, schema_name=None, obj_name=None):
+        #Same rules as MetadataCache.invalidate: schema -> the schema, schema + object -> the object and the schema level lists
+        connection = self._connection()
+        with self._write_lock:
+            if schema_name is None:
+                self._bytes = 0
+                return connection.execute("DELETE FROM entries").rowcount
+            schema_key = identifier_key(str(schema_name))
+            if obj_name is None:
+                where, params = "schema_key = ?", (schema_key,)
+            else:
+                where, params = "schema_key = ? AND obj_key IN ('', ?)", (schema_key, identifier_key(str(obj_name)))
+            methods = ", ".join("?" for _ in CROSS_OBJECT_METHODS)
+            where, params = f"({where}) OR method IN ({methods})", params + CROSS_OBJECT_METHODS
+            #Keep the running size in step, or it drifts up until every write triggers a recount
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                deleted_bytes = connection.execute(f"SELECT COALESCE(SUM(size), 0) FROM entries WHERE {where}", params).fetchone()[0]
+                deleted = connection.execute(f"DELETE FROM entries WHERE {where}", params).rowcount
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+            self._bytes = max(0, self._bytes - deleted_bytes)
+            return deleted
+
+    def stats(self):
+        entries, size = self._connection().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "path": self.path,
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
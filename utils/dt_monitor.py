@@ -0,0 +1,208 @@
+"""
+Dynamic table refresh performance of the whole database, from ONE query: DYNAMIC_TABLE_REFRESH_HISTORY joined
+with the current DYNAMIC_TABLE_GRAPH_HISTORY entry of each table (target lag, refresh mode).
+Per table: refresh duration percentiles, incremental vs full refreshes, refreshes that missed the target lag,
+rows changed, and the total refresh time (the warehouse time, what the credits follow).
+Everything after the query is plain Python over the records, no session needed.
+One call of the table function returns at most RESULT_LIMIT rows, a single table with a 1 minute lag refreshes more often
+than that in a week: the history is read in DATA_TIMESTAMP windows, halving any window that comes back full.
+"""
+import json
+import time
+from datetime import datetime
+
+
+DEFAULT_DAYS = 7
+RESULT_LIMIT = 10000 #the table function's maximum
+MIN_WINDOW_SECONDS = 60 #a window this small that is still full is kept truncated (and reported)
+
+
+REFRESH_HISTORY_QUERY = """
+WITH graph AS (
+    SELECT QUALIFIED_NAME, TARGET_LAG_SEC, TARGET_LAG_TYPE, REFRESH_MODE
+    FROM TABLE({database}.INFORMATION_SCHEMA.DYNAMIC_TABLE_GRAPH_HISTORY())
+    WHERE VALID_TO IS NULL
+)
+SELECT h.SCHEMA_NAME, h.NAME, h.STATE, h.STATE_MESSAGE, h.REFRESH_ACTION, h.REFRESH_TRIGGER,
+       h.DATA_TIMESTAMP, h.REFRESH_START_TIME, h.REFRESH_END_TIME, h.COMPLETION_TARGET, h.STATISTICS,
+       g.TARGET_LAG_SEC, g.TARGET_LAG_TYPE, g.REFRESH_MODE
+FROM TABLE({database}.INFORMATION_SCHEMA.DYNAMIC_TABLE_REFRESH_HISTORY(
+    DATA_TIMESTAMP_START => TO_TIMESTAMP_LTZ({start}),
+    DATA_TIMESTAMP_END => TO_TIMESTAMP_LTZ({end}),
+    NAME_PREFIX => '{database}.',
+    RESULT_LIMIT => {limit}
+)) h
+LEFT JOIN graph g ON g.QUALIFIED_NAME = h.QUALIFIED_NAME
+ORDER BY h.SCHEMA_NAME, h.NAME, h.DATA_TIMESTAMP
+"""
+
+
+def history_query(database, start, end, limit=RESULT_LIMIT):
+    #start/end: epoch seconds, absolute so the windows of one read line up exactly
+    return REFRESH_HISTORY_QUERY.format(database=database, start=int(start), end=int(end), limit=int(limit))
+
+
+def fetch_history(run, database, days=DEFAULT_DAYS, limit=RESULT_LIMIT, now=None):
+    """
+    run(query) -> rows. Reads the last `days` of refresh history window by window: a window that returns `limit` rows
+    may be cut off, so it is split in two halves that are read again, down to MIN_WINDOW_SECONDS.
+    Returns {'records': history_records() sorted per table and data timestamp, 'truncated': True if a smallest window was still full}
+    """
+    end = int(now if now is not None else time.time())
+    windows = [(end - int(days) * 86400, end)]
+    records, seen, truncated = [], set(), False
+    while windows:
+        start, stop = windows.pop()
+        rows = run(history_query(database, start, stop, limit))
+        if len(rows) >= limit and stop - start > MIN_WINDOW_SECONDS:
+            middle = (start + stop) // 2
+            windows += [(start, middle), (middle, stop)]
+            continue
+        truncated = truncated or len(rows) >= limit
+        for record in history_records(rows):
+            #A refresh on a window edge can come back from both windows
+            key = (record["schema"], record["name"], record["data_ts"])
+            if key not in seen:
+                seen.add(key)
+                records.append(record)
+    records.sort(key=lambda record: (record["schema"], record["name"], record["data_ts"] or 0))
+    return {"records": records, "truncated": truncated}
+
+
+def _epoch(value):
+    #Snowpark gives datetimes, a cached/saved record has epoch seconds already
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value.timestamp()
+
+
+def _statistics(value):
+    #STATISTICS is a JSON object (a string or an already parsed VARIANT): numInsertedRows, numDeletedRows, ...
+    if not value:
+        return {}
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return {}
+    return dict(value)
+
+
+def history_records(rows):
+    """
+    Query rows -> plain dicts (epoch seconds, no Snowpark types), so they fit the JSON disk cache too:
+    {'schema', 'name', 'state', 'message', 'action', 'trigger', 'data_ts', 'start', 'end', 'completion_target',
+     'target_lag_sec', 'refresh_mode', 'rows_inserted', 'rows_deleted'}
+    """
+    records = []
+    for row in rows:
+        stats = _statistics(row["STATISTICS"])
+        records.append({
+            "schema": row["SCHEMA_NAME"],
+            "name": row["NAME"],
+            "state": row["STATE"],
+            "message": row["STATE_MESSAGE"],
+            "action": row["REFRESH_ACTION"],
+            "trigger": row["REFRESH_TRIGGER"],
+            "data_ts": _epoch(row["DATA_TIMESTAMP"]),
+            "start": _epoch(row["REFRESH_START_TIME"]),
+            "end": _epoch(row["REFRESH_END_TIME"]),
+            "completion_target": _epoch(row["COMPLETION_TARGET"]),
+            "target_lag_sec": row["TARGET_LAG_SEC"] if row["TARGET_LAG_TYPE"] != "DOWNSTREAM" else None,
+            "refresh_mode": row["REFRESH_MODE"],
+            "rows_inserted": int(stats.get("numInsertedRows", 0) or 0),
+            "rows_deleted": int(stats.get("numDeletedRows", 0) or 0),
+        })
+    return records
+
+
+def percentile(sorted_values, q):
+    #Linear interpolation between the closest ranks, q in [0, 100]
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def _duration(record):
+    if record["start"] is None or record["end"] is None:
+        return None
+    return record["end"] - record["start"]
+
+
+def refresh_details(records):
+    """
+    One table's refreshes (oldest first) with the derived columns: duration, lag at completion, lag miss.
+    Lag at completion = how old the data was just before this refresh landed (end - previous data timestamp).
+    A miss: past COMPLETION_TARGET when Snowflake gives one, otherwise a lag at completion above the target lag.
+    """
+    details = []
+    previous_data_ts = None
+    for record in sorted(records, key=lambda record: record["data_ts"] or 0):
+        lag = record["end"] - previous_data_ts if record["end"] is not None and previous_data_ts is not None else None
+        if record["completion_target"] is not None and record["end"] is not None:
+            missed = record["end"] > record["completion_target"]
+        else:
+            missed = lag is not None and record["target_lag_sec"] is not None and lag > record["target_lag_sec"]
+        details.append(dict(record, duration=_duration(record), lag_at_completion=lag, lag_missed=missed))
+        if record["state"] == "SUCCEEDED":
+            previous_data_ts = record["data_ts"]
+    return details
+
+
+def summarize(records):
+    """
+    Per dynamic table: {'object', 'refresh_mode', 'target_lag_sec', 'refreshes', 'failed', 'incremental', 'full', 'no_data',
+    'p50_s', 'p90_s', 'p99_s', 'max_s', 'busy_s', 'lag_misses', 'rows_changed', 'rows_per_refresh'}
+    Sorted by busy_s (the summed refresh time) descending: the credit burners first.
+    Durations are of the succeeded refreshes that did work (NO_DATA ones are skips, they'd pull the percentiles down).
+    """
+    by_table = {}
+    for record in records:
+        by_table.setdefault((record["schema"], record["name"]), []).append(record)
+
+    summaries = []
+    for (schema_name, name), table_records in by_table.items():
+        details = refresh_details(table_records)
+        worked = [d for d in details if d["state"] == "SUCCEEDED" and d["action"] != "NO_DATA" and d["duration"] is not None]
+        durations = sorted(d["duration"] for d in worked)
+        rows_changed = sum(d["rows_inserted"] + d["rows_deleted"] for d in worked)
+        latest = details[-1]
+        summaries.append({
+            "object": f"{schema_name}.{name}",
+            "refresh_mode": latest["refresh_mode"],
+            "target_lag_sec": latest["target_lag_sec"],
+            "refreshes": len(details),
+            "failed": sum(1 for d in details if d["state"] in ("FAILED", "UPSTREAM_FAILED")),
+            "incremental": sum(1 for d in details if d["action"] == "INCREMENTAL"),
+            "full": sum(1 for d in details if d["action"] in ("FULL", "REINITIALIZE")),
+            "no_data": sum(1 for d in details if d["action"] == "NO_DATA"),
+            "p50_s": round_seconds(percentile(durations, 50)),
+            "p90_s": round_seconds(percentile(durations, 90)),
+            "p99_s": round_seconds(percentile(durations, 99)),
+            "max_s": round_seconds(durations[-1] if durations else None),
+            "busy_s": round_seconds(sum(durations)),
+            "lag_misses": sum(1 for d in details if d["lag_missed"]),
+            "rows_changed": rows_changed,
+            "rows_per_refresh": round(rows_changed / len(worked)) if worked else 0,
+        })
+    summaries.sort(key=lambda summary: (-(summary["busy_s"] or 0), summary["object"]))
+    return summaries
+
+
+def round_seconds(value):
+    #Durations shown on the monitor page and in the drill-down, None stays None
+    return round(value, 2) if value is not None else None
+
+
+def page(items, page_no, page_size):
+    #(the items of the 1-based page, number of pages)
+    pages = max(1, -(-len(items) // page_size))
+    page_no = min(max(1, page_no), pages)
+    return items[(page_no - 1) * page_size:page_no * page_size], pages
@@ -1,39 +1,205 @@
-import streamlit as st
-from github import Github
-import base64
+import os
+import tempfile
+import threading
+import subprocess
+from abc import ABC, abstractmethod
+
+
+class GitBackend(ABC):
+    """
+    Writes any number of files as ONE commit (tree + commit + ref update).
+    The files are passed per call, the backend keeps no pending state, so one instance can serve every session.
+    Subclasses implement _write_commit() and read().
+    """
+
+    def __init__(self, branch):
+        self.branch = branch
+        self._lock = threading.Lock() #one commit at a time per backend, the ref update must see the latest parent
+
+    def commit_files(self, files, message):
+        #Returns a user facing message, same "Success!"/"Git Error:" format as push_to_github always had
+        if not files:
+            return "Success! Nothing to commit."
+
+        try:
+            with self._lock:
+                sha = self._write_commit(files, message)
+        except Exception as e:
+            return f"Git Error: {str(e)}"
+
+        if len(files) == 1:
+            return f"Success! Committed {next(iter(files))} to {self.branch} ({sha[:7]})"
+        return f"Success! Committed {len(files)} files to {self.branch} ({sha[:7]})"
+
+    @abstractmethod
+    def _write_commit(self, files, message):
+        #Writes {path: content} as one commit on the branch, returns its sha
+        pass
+
+    @abstractmethod
+    def read(self, path):
+        #Content of the file on the branch, None if it doesn't exist
+        pass
+
+
+class GitHubBackend(GitBackend):
+    """
+    GitHub through the Git Data API: 4 calls per commit no matter how many files
+    (get ref, create tree with the contents inline, create commit, move the ref).
+    """
+
+    def __init__(self, token, repo_name, branch):
+        super().__init__(branch)
+        self.token = token
+        self.repo_name = repo_name
+        self._repo = None
+
+    @property
+    def repo(self):
+        if self._repo is None:
+            self._repo = _github_client(self.token).get_repo(self.repo_name)
+        return self._repo
+
+    def _write_commit(self, files, message):
+        from github import InputGitTreeElement
+
+        ref = self.repo.get_git_ref(f"heads/{self.branch}")
+        parent = self.repo.get_git_commit(ref.object.sha)
+
+        elements = [
+            InputGitTreeElement(path=path, mode="100644", type="blob", content=content)
+            for path, content in files.items()
+        ]
+        tree = self.repo.create_git_tree(elements, parent.tree)
+        commit = self.repo.create_git_commit(message, tree, [parent])
+        ref.edit(commit.sha)
+        return commit.sha
+
+    def read(self, path):
+        from github import UnknownObjectException
 
-def push_to_github(file_path, file_content, commit_message):
-    try:
-        #Connect
-        token = st.secrets["github"]["token"]
-        repo_name = st.secrets["github"]["repo_name"]
-        branch = st.secrets["github"]["branch"]
-        
-        g = Github(token)
-        repo = g.get_repo(repo_name)
-
-        #Check if file exists to decide: Create or Update?
         try:
-            contents = repo.get_contents(file_path, ref=branch)
-            # UPDATE existing file
-            repo.update_file(
-                path=file_path,
-                message=commit_message,
-                content=file_content,
-                sha=contents.sha,
-                branch=branch
-            )
-            return f"Success! Updated {file_path} on GitHub!"
-            
-        except:
-            #CREATE new file
-            repo.create_file(
-                path=file_path,
-                message=commit_message,
-                content=file_content,
-                branch=branch
-            )
-            return f"Success! Created {file_path} on GitHub!"
+            return self.repo.get_contents(path, ref=self.branch).decoded_content.decode("utf-8")
+        except UnknownObjectException:
+            return None
+
+
+class LocalGitBackend(GitBackend):
+    """
+    Same interface on a local (bare) repository with git plumbing commands, nothing touches a work tree.
+    Good for offline use, CI and benchmarks. The repo is created (bare) if it doesn't exist.
+    """
 
+    def __init__(self, repo_path, branch="main", author_name="Igloo", author_email="igloo@localhost"):
+        super().__init__(branch)
+        self.repo_path = repo_path
+        self.author_name = author_name
+        self.author_email = author_email
+        if not os.path.exists(repo_path):
+            subprocess.run(["git", "init", "--bare", "--quiet", repo_path], check=True)
+
+    def _git(self, *args, input=None, env=None, strip=True):
+        full_env = dict(os.environ, GIT_DIR=self.repo_path)
+        full_env.update(env or {})
+        result = subprocess.run(
+            ["git", *args], input=input, env=full_env,
+            capture_output=True, text=True, check=False
+        )
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip() or f"git {args[0]} failed")
+        return result.stdout.strip() if strip else result.stdout
+
+    def _parent(self):
+        try:
+            return self._git("rev-parse", "--verify", "--quiet", f"refs/heads/{self.branch}")
+        except RuntimeError:
+            return None #first commit on the branch
+
+    def _write_commit(self, files, message):
+        parent = self._parent()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            #Temporary index, so a bare repo works and nothing else is disturbed
+            env = {
+                "GIT_INDEX_FILE": os.path.join(tmp, "index"),
+                "GIT_AUTHOR_NAME": self.author_name, "GIT_AUTHOR_EMAIL": self.author_email,
+                "GIT_COMMITTER_NAME": self.author_name, "GIT_COMMITTER_EMAIL": self.author_email,
+            }
+            if parent:
+                self._git("read-tree", parent, env=env)
+
+            #All blobs with one hash-object call
+            blob_paths = []
+            for i, content in enumerate(files.values()):
+                blob_path = os.path.join(tmp, f"blob_{i}")
+                with open(blob_path, "w", encoding="utf-8") as f:
+                    f.write(content)
+                blob_paths.append(blob_path)
+            shas = self._git("hash-object", "-w", "--stdin-paths", input="\n".join(blob_paths) + "\n").split("\n")
+
+            index_info = "".join(f"100644 {sha}\t{path}\n" for path, sha in zip(files, shas))
+            self._git("update-index", "--add", "--index-info", input=index_info, env=env)
+            tree = self._git("write-tree", env=env)
+
+            parent_args = ["-p", parent] if parent else []
+            commit = self._git("commit-tree", tree, *parent_args, "-m", message, env=env)
+
+        #Compare-and-swap: fails if someone moved the branch since we read the parent
+        self._git("update-ref", f"refs/heads/{self.branch}", commit, parent or "")
+        return commit
+
+    def read(self, path):
+        try:
+            return self._git("cat-file", "blob", f"refs/heads/{self.branch}:{path}", strip=False)
+        except RuntimeError:
+            return None
+
+
+#One PyGithub client per token for the whole process (it keeps its HTTP connection pool)
+_github_clients = {}
+_clients_lock = threading.Lock()
+
+
+def _github_client(token):
+    with _clients_lock:
+        if token not in _github_clients:
+            from github import Github
+            _github_clients[token] = Github(token)
+        return _github_clients[token]
+
+
+_backend = None
+
+
+def get_git_backend():
+    """
+    Backend from .streamlit/secrets.toml:
+    [github] token/repo_name/branch -> GitHubBackend
+    [git] local_repo_path (+ branch) -> LocalGitBackend
+    """
+    global _backend
+    if _backend is None:
+        import streamlit as st
+        if "github" in st.secrets:
+            config = st.secrets["github"]
+            _backend = GitHubBackend(config["token"], config["repo_name"], config["branch"])
+        elif "git" in st.secrets:
+            config = st.secrets["git"]
+            _backend = LocalGitBackend(config["local_repo_path"], config.get("branch", "main"))
+        else:
+            raise RuntimeError("No [github] or [git] section in secrets.")
+    return _backend
+
+
+def push_files(files, commit_message):
+    #files: {path: content}, all of them go in one commit
+    try:
+        backend = get_git_backend()
     except Exception as e:
-        return f"Git Error: {str(e)}"
\ No newline at end of file
+        return f"Git Error: {str(e)}"
+
+    return backend.commit_files(files, commit_message)
+
+
+def push_to_github(file_path, file_content, commit_message):
+    return push_files({file_path: file_content}, commit_message)
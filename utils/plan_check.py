@@ -0,0 +1,131 @@
+"""
+Pre-deploy scan cost estimate of a generated view/dynamic table query, from Snowflake's EXPLAIN (compile only, nothing runs).
+A dynamic table whose SELECT prunes nothing reads every micro-partition of its source on each full refresh,
+the plan shows it before the deploy does: partitions total vs assigned, bytes assigned and the join operators.
+The parser takes the captured EXPLAIN USING JSON output and needs no session.
+"""
+import os
+import json
+
+
+#Flag a scan when it keeps at least this share of the partitions, on sources big enough to matter
+DEFAULT_THRESHOLDS = {
+    "full_scan_ratio": 0.9,
+    "min_partitions": 100,
+    "max_bytes": 10 * 1024 ** 3,
+}
+
+#Operators that combine inputs, a CartesianJoin is the one that multiplies rows
+JOIN_OPERATIONS = ("Join", "InnerJoin", "LeftOuterJoin", "RightOuterJoin", "FullOuterJoin", "CartesianJoin", "SemiJoin", "AntiJoin")
+
+
+class PlanEstimate:
+    """What EXPLAIN says the query reads: the totals (GlobalStats) and one entry per table scan and per join."""
+
+    def __init__(self, partitions_total=0, partitions_assigned=0, bytes_assigned=0):
+        self.partitions_total = partitions_total
+        self.partitions_assigned = partitions_assigned
+        self.bytes_assigned = bytes_assigned
+        self.scans = [] #{'object', 'partitions_total', 'partitions_assigned', 'bytes_assigned'}
+        self.joins = [] #{'operation', 'expressions'}
+        self.operations = 0
+
+    @property
+    def scan_ratio(self):
+        #Share of the partitions read, 1.0 = nothing pruned
+        if not self.partitions_total:
+            return 0.0
+        return self.partitions_assigned / self.partitions_total
+
+    def to_dict(self):
+        return {
+            "partitions_total": self.partitions_total,
+            "partitions_assigned": self.partitions_assigned,
+            "bytes_assigned": self.bytes_assigned,
+            "scan_ratio": round(self.scan_ratio, 4),
+            "scans": self.scans,
+            "joins": self.joins,
+            "operations": self.operations,
+        }
+
+
+def explain_sql(query):
+    return f"EXPLAIN USING JSON {query}"
+
+
+def _int(value):
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _add_operation(estimate, operation, objects, expressions, total, assigned, size):
+    estimate.operations += 1
+    if operation == "TableScan":
+        estimate.scans.append({
+            "object": ", ".join(objects) if isinstance(objects, list) else (objects or ""),
+            "partitions_total": _int(total),
+            "partitions_assigned": _int(assigned),
+            "bytes_assigned": _int(size),
+        })
+    elif operation in JOIN_OPERATIONS:
+        estimate.joins.append({
+            "operation": operation,
+            "expressions": ", ".join(expressions) if isinstance(expressions, list) else (expressions or ""),
+        })
+
+
+def parse_explain_json(text):
+    """
+    EXPLAIN USING JSON output:
+      {"GlobalStats": {"partitionsTotal", "partitionsAssigned", "bytesAssigned"},
+       "Operations": [[{"id", "operation", "objects", "expressions", "partitionsTotal", ...}, ...]]}
+    """
+    plan = json.loads(text) if isinstance(text, str) else text
+    stats = plan.get("GlobalStats", {})
+    estimate = PlanEstimate(
+        _int(stats.get("partitionsTotal")), _int(stats.get("partitionsAssigned")), _int(stats.get("bytesAssigned"))
+    )
+    for step in plan.get("Operations", []):
+        for operation in step:
+            _add_operation(
+                estimate, operation.get("operation"), operation.get("objects"), operation.get("expressions"),
+                operation.get("partitionsTotal"), operation.get("partitionsAssigned"), operation.get("bytesAssigned"),
+            )
+    return estimate
+
+
+def thresholds_from_env():
+    #IGLOO_PLAN_FULL_SCAN_RATIO, IGLOO_PLAN_MIN_PARTITIONS, IGLOO_PLAN_MAX_GB override the defaults
+    thresholds = dict(DEFAULT_THRESHOLDS)
+    if os.environ.get("IGLOO_PLAN_FULL_SCAN_RATIO"):
+        thresholds["full_scan_ratio"] = float(os.environ["IGLOO_PLAN_FULL_SCAN_RATIO"])
+    if os.environ.get("IGLOO_PLAN_MIN_PARTITIONS"):
+        thresholds["min_partitions"] = int(os.environ["IGLOO_PLAN_MIN_PARTITIONS"])
+    if os.environ.get("IGLOO_PLAN_MAX_GB"):
+        thresholds["max_bytes"] = int(float(os.environ["IGLOO_PLAN_MAX_GB"]) * 1024 ** 3)
+    return thresholds
+
+
+def check_plan(estimate, thresholds=None):
+    #[(level, message)], level 'error' for what should stop a deploy review, 'warning' for what's worth a look
+    thresholds = thresholds or DEFAULT_THRESHOLDS
+    findings = []
+    for scan in estimate.scans:
+        total, assigned = scan["partitions_total"], scan["partitions_assigned"]
+        if total >= thresholds["min_partitions"] and assigned >= total * thresholds["full_scan_ratio"]:
+            findings.append(("warning", f"Full scan of {scan['object']}: {assigned:,} of {total:,} partitions, nothing is pruned"))
+    if estimate.bytes_assigned > thresholds["max_bytes"]:
+        findings.append(("warning", f"Reads {format_bytes(estimate.bytes_assigned)}, above the {format_bytes(thresholds['max_bytes'])} threshold"))
+    for join in estimate.joins:
+        if join["operation"] == "CartesianJoin":
+            findings.append(("error", f"Cartesian join (no join condition): {join['expressions'] or 'every row with every row'}"))
+    return findings
+
+
+def format_bytes(size):
+    for unit in ("B", "KB", "MB", "GB", "TB"):
+        if size < 1024 or unit == "TB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
@@ -0,0 +1,260 @@
+"""
+Per-rerun query instrumentation.
+instrument(session) wraps a Snowpark session: every sql(...).collect()/collect_nowait() is recorded in the log of the
+current script run with a fingerprint of the SQL, the calling function, duration, rows and the metadata cache state.
+The log lives in a contextvar, so concurrent users (one script thread each) never see each other's queries.
+"""
+import os
+import io
+import sys
+import csv
+import json
+import time
+import hashlib
+import threading
+import contextvars
+from contextlib import contextmanager
+
+from utils.ddl_parser import tokenize, STRING, NUMBER
+
+
+APP_NAME = "igloo"
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+#Frames in these files are plumbing, the caller is the first frame outside them
+_SKIP_FILES = {os.path.abspath(__file__), os.path.join(_REPO_ROOT, "utils", "cache.py")}
+
+_current_run = contextvars.ContextVar("igloo_query_run", default=None)
+_cache_method = contextvars.ContextVar("igloo_cache_method", default=None)
+
+
+class QueryRun:
+    """Everything recorded during one script run (page interaction)."""
+
+    def __init__(self, page):
+        self.page = page
+        self.started = time.perf_counter()
+        self.records = []
+        self._lock = threading.Lock()
+
+    def add(self, record):
+        with self._lock:
+            self.records.append(record)
+
+    def queries(self):
+        return [record for record in self.records if record["kind"] in QUERY_KINDS]
+
+    def summary(self):
+        queries = self.queries()
+        return {
+            "page": self.page,
+            "queries": len(queries),
+            "query_seconds": round(sum(record["seconds"] for record in queries), 4),
+            "cache_hits": sum(1 for record in self.records if record["kind"] == "cache_hit"),
+            "cache_misses": sum(1 for record in self.records if record["kind"] == "cache_miss"),
+            "errors": sum(1 for record in queries if record["error"]),
+        }
+
+    def by_fingerprint(self):
+        #Latency breakdown: one row per distinct statement shape, slowest total first
+        groups = {}
+        for record in self.queries():
+            group = groups.setdefault(record["fingerprint"], {
+                "fingerprint": record["fingerprint"], "sql": record["normalized"], "caller": record["caller"],
+                "count": 0, "total_seconds": 0.0, "max_seconds": 0.0, "rows": 0,
+            })
+            group["count"] += 1
+            group["total_seconds"] += record["seconds"]
+            group["max_seconds"] = max(group["max_seconds"], record["seconds"])
+            group["rows"] += record["rows"] or 0
+        for group in groups.values():
+            group["total_seconds"] = round(group["total_seconds"], 4)
+            group["max_seconds"] = round(group["max_seconds"], 4)
+        return sorted(groups.values(), key=lambda group: group["total_seconds"], reverse=True)
+
+    def to_json(self):
+        return json.dumps({"summary": self.summary(), "records": self.records}, indent=2, default=str)
+
+    def to_csv(self):
+        out = io.StringIO()
+        writer = csv.DictWriter(out, fieldnames=RECORD_FIELDS)
+        writer.writeheader()
+        writer.writerows(self.records)
+        return out.getvalue()
+
+
+QUERY_KINDS = ("query", "async_submit")
+RECORD_FIELDS = ["kind", "page", "offset_seconds", "seconds", "rows", "cache", "fingerprint", "caller", "normalized", "error"]
+
+
+def start_run(page):
+    #Called once per script run, before the page renders
+    run = QueryRun(page)
+    _current_run.set(run)
+    return run
+
+
+def current_run():
+    return _current_run.get()
+
+
+def submit_in_context(pool, fn, *args):
+    #Runs fn in a copy of the caller's context, so the queries of the pool's worker threads land in the caller's run
+    return pool.submit(contextvars.copy_context().run, fn, *args)
+
+
+def query_tag(page):
+    return json.dumps({"app": APP_NAME, "page": page}, separators=(",", ":"))
+
+
+def normalize_sql(sql):
+    #Literals out, whitespace/case folded: 'DESCRIBE TABLE A.B' and 'describe table a.b' are the same shape, IN lists too
+    parts = []
+    for token in tokenize(sql):
+        if token.kind in (STRING, NUMBER):
+            parts.append("?")
+        else:
+            parts.append(token.value.upper())
+    return " ".join(parts)
+
+
+def fingerprint(normalized_sql):
+    return hashlib.sha1(normalized_sql.encode("utf-8")).hexdigest()[:12]
+
+
+def _caller():
+    #First frame in the app's own code outside the profiler/cache plumbing (e.g. utils/data_provider.py:get_columns:171)
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if filename not in _SKIP_FILES and filename.startswith(_REPO_ROOT):
+            return f"{os.path.relpath(filename, _REPO_ROOT)}:{frame.f_code.co_name}:{frame.f_lineno}"
+        frame = frame.f_back
+    return None
+
+
+def _record(kind, sql=None, seconds=0.0, rows=None, error=None, caller=None, cache=None):
+    run = _current_run.get()
+    if run is None:
+        return
+    normalized = normalize_sql(sql) if sql else None
+    run.add({
+        "kind": kind,
+        "page": run.page,
+        "offset_seconds": round(time.perf_counter() - run.started, 4),
+        "seconds": round(seconds, 4),
+        "rows": rows,
+        "cache": cache if cache is not None else _cache_method.get(),
+        "fingerprint": fingerprint(normalized) if normalized else None,
+        "caller": caller,
+        "normalized": normalized[:500] if normalized else None,
+        "error": error,
+    })
+
+
+def record_cache_hit(method_name):
+    _record("cache_hit", cache=method_name, caller=_caller())
+
+
+@contextmanager
+def cache_miss(method_name):
+    #Queries run while a cached method computes its value are tagged with it (innermost method wins)
+    caller = _caller()
+    started = time.perf_counter()
+    token = _cache_method.set(method_name)
+    try:
+        yield
+    finally:
+        _cache_method.reset(token)
+        _record("cache_miss", seconds=time.perf_counter() - started, caller=caller, cache=method_name)
+
+
+class InstrumentedSession:
+    """
+    Transparent proxy of a Snowpark session: sql() is recorded, everything else is passed through.
+    Every query carries the page's QUERY_TAG as a statement parameter of its own: the session is shared by all tabs and
+    worker threads, an ALTER SESSION tag would be overwritten by whichever of them ran last.
+    """
+
+    def __init__(self, session):
+        self._session = session
+
+    @property
+    def wrapped(self):
+        return self._session
+
+    def sql(self, query, *args, **kwargs):
+        run = _current_run.get()
+        tag = query_tag(run.page) if run is not None else None
+        return _InstrumentedQuery(self._session.sql(query, *args, **kwargs), query, tag)
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+
+class _InstrumentedQuery:
+    def __init__(self, dataframe, sql, tag=None):
+        self._dataframe = dataframe
+        self._sql = sql
+        self._tag = tag
+
+    def _tagged(self, kwargs):
+        #QUERY_TAG for this statement only, a tag the caller passes itself wins
+        if self._tag is not None:
+            statement_params = dict(kwargs.get("statement_params") or {})
+            statement_params.setdefault("QUERY_TAG", self._tag)
+            kwargs["statement_params"] = statement_params
+        return kwargs
+
+    def collect(self, *args, **kwargs):
+        caller = _caller()
+        started = time.perf_counter()
+        try:
+            rows = self._dataframe.collect(*args, **self._tagged(kwargs))
+        except Exception as e:
+            _record("query", self._sql, time.perf_counter() - started, error=str(e)[:300], caller=caller)
+            raise
+        _record("query", self._sql, time.perf_counter() - started, rows=len(rows), caller=caller)
+        return rows
+
+    def collect_nowait(self, *args, **kwargs):
+        #Only the submission is timed, the query itself runs on after this returns
+        caller = _caller()
+        started = time.perf_counter()
+        job = self._dataframe.collect_nowait(*args, **self._tagged(kwargs))
+        _record("async_submit", self._sql, time.perf_counter() - started, caller=caller)
+        return job
+
+    def to_pandas_batches(self, *args, **kwargs):
+        #Caller, start time and run are taken on the call, not when the reader first pulls a batch (maybe from another frame/thread)
+        caller = _caller()
+        context = contextvars.copy_context()
+        started = time.perf_counter()
+        try:
+            batches = self._dataframe.to_pandas_batches(*args, **self._tagged(kwargs))
+        except Exception as e:
+            _record("query", self._sql, time.perf_counter() - started, error=str(e)[:300], caller=caller)
+            raise
+        return self._stream(batches, caller, context, started)
+
+    def _stream(self, batches, caller, context, started):
+        #Recorded once the stream ends (or the reader stops early), rows = the rows actually fetched
+        rows, error = 0, None
+        try:
+            for batch in batches:
+                rows += len(batch)
+                yield batch
+        except Exception as e:
+            error = str(e)[:300]
+            raise
+        finally:
+            context.run(_record, "query", self._sql, time.perf_counter() - started,
+                        rows=None if error else rows, error=error, caller=caller)
+
+    def __getattr__(self, name):
+        return getattr(self._dataframe, name)
+
+
+def instrument(session):
+    if session is None or isinstance(session, InstrumentedSession):
+        return session
+    return InstrumentedSession(session)
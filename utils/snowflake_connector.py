@@ -1,7 +1,131 @@
+import os
+import time
+import threading
 import streamlit as st
-from snowflake.snowpark import Session
-from snowflake.snowpark.context import get_active_session
-from cryptography.hazmat.primitives import serialization
+from utils.query_profiler import instrument
+#Snowpark and cryptography are imported inside the functions, they are slow to import and the Home page can render without them
+
+
+class SessionManager:
+    """
+    Process-wide pool of local Snowpark sessions.
+    One session per (account, user, role, warehouse, database) config, reused by every page/module.
+    Liveness is checked cheaply (closed flag every time, a SELECT 1 at most every PING_INTERVAL seconds),
+    a dropped session is rebuilt lazily on the next get().
+    """
+
+    PING_INTERVAL = 60 #seconds between real round-trip checks of a pooled session
+    IDLE_AFTER = 300 #a session not handed out for this long counts as idle
+
+    def __init__(self):
+        self._sessions = {} #config key -> {'session', 'created', 'last_used', 'last_ping'}
+        self._private_keys = {} #(path, mtime) -> DER bytes, so the PEM is read + decoded only once
+        self._lock = threading.RLock()
+        self.created = 0
+        self.reused = 0
+        self.reconnects = 0
+
+    def get(self, config):
+        key = _config_key(config)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._sessions.get(key)
+            if entry is not None:
+                if self._is_alive(entry, now):
+                    entry["last_used"] = now
+                    self.reused += 1
+                    return entry["session"]
+
+                #Dropped/expired session -> rebuild it below
+                self._close(entry["session"])
+                del self._sessions[key]
+                self.reconnects += 1
+
+            session = self._create(config)
+            self._sessions[key] = {"session": session, "created": now, "last_used": now, "last_ping": now}
+            self.created += 1
+            return session
+
+    def _create(self, config):
+        config = dict(config)
+
+        #Key Pair Auth: Snowpark expects the raw bytes of the key
+        if "private_key_path" in config:
+            config["private_key"] = self._load_private_key(config.pop("private_key_path")) # Clean up param not needed by Snowpark
+
+        from snowflake.snowpark import Session
+        return Session.builder.configs(config).create()
+
+    def _load_private_key(self, path):
+        cache_key = (path, os.path.getmtime(path)) #a rotated key file gets a new mtime -> decoded again
+        if cache_key not in self._private_keys:
+            from cryptography.hazmat.primitives import serialization
+            with open(path, "rb") as key_file:
+                p_key = serialization.load_pem_private_key(
+                    key_file.read(),
+                    password=None
+                )
+
+            self._private_keys[cache_key] = p_key.private_bytes(
+                encoding=serialization.Encoding.DER,
+                format=serialization.PrivateFormat.PKCS8,
+                encryption_algorithm=serialization.NoEncryption()
+            )
+        return self._private_keys[cache_key]
+
+    def _is_alive(self, entry, now):
+        session = entry["session"]
+
+        #Cheap check first: the connector knows when the connection was closed (logout, network error)
+        connection = getattr(getattr(session, "_conn", None), "_conn", None)
+        if connection is not None and connection.is_closed():
+            return False
+
+        #Real round-trip only every PING_INTERVAL, so most get() calls cost nothing
+        if now - entry["last_ping"] < self.PING_INTERVAL:
+            return True
+        try:
+            session.sql("SELECT 1").collect()
+        except Exception:
+            return False
+        entry["last_ping"] = now
+        return True
+
+    def _close(self, session):
+        try:
+            session.close()
+        except Exception:
+            pass
+
+    def close_all(self):
+        with self._lock:
+            for entry in self._sessions.values():
+                self._close(entry["session"])
+            self._sessions.clear()
+
+    def stats(self):
+        now = time.monotonic()
+        with self._lock:
+            idle = sum(1 for entry in self._sessions.values() if now - entry["last_used"] >= self.IDLE_AFTER)
+            return {
+                "open": len(self._sessions),
+                "idle": idle,
+                "created": self.created,
+                "reused": self.reused,
+                "reconnects": self.reconnects,
+            }
+
+
+def _config_key(config):
+    return tuple(
+        str(config.get(param, "")).upper()
+        for param in ("account", "user", "role", "warehouse", "database", "schema")
+    )
+
+
+_manager = SessionManager()
+
 
 def get_session():
     """
@@ -9,50 +133,32 @@ def get_session():
     1. Checks for SiS (Active Session).
     2. Checks for Key Pair Auth (Local).
     3. Checks for Password/Browser Auth (Local Fallback).
+    Local sessions come from the shared SessionManager, so they are built once per process, not per call.
+    The session is handed out wrapped by the query profiler (utils/query_profiler.py), every sql() gets recorded.
     """
     # 1. Try Active Session (Running in Snowflake)
     try:
-        return get_active_session()
+        from snowflake.snowpark.context import get_active_session
+        return instrument(get_active_session())
     except Exception:
         pass
 
     # 2. Local Connection Logic
     if "snowflake" in st.secrets:
         config = st.secrets["snowflake"].to_dict()
-        
-        # A. Handle Key Pair Auth (The "Senior" Way)
-        if "private_key_path" in config:
-            try:
-                # Read the private key file
-                with open(config["private_key_path"], "rb") as key_file:
-                    p_key = serialization.load_pem_private_key(
-                        key_file.read(),
-                        password=None
-                    )
-                
-                # Snowpark expects the raw bytes of the key
-                pkb = p_key.private_bytes(
-                    encoding=serialization.Encoding.DER,
-                    format=serialization.PrivateFormat.PKCS8,
-                    encryption_algorithm=serialization.NoEncryption()
-                )
-                
-                config["private_key"] = pkb
-                del config["private_key_path"] # Clean up param not needed by Snowpark
-                
-                return Session.builder.configs(config).create()
-                
-            except Exception as e:
-                st.error(f"Key Pair Login failed: {e}")
-                return None
-
-        # B. Handle Standard Auth (Password/ExternalBrowser)
-        else:
-            try:
-                return Session.builder.configs(config).create()
-            except Exception as e:
-                st.error(f"Standard Login failed: {e}")
-                return None
-    
+
+        try:
+            return instrument(_manager.get(config))
+        except Exception as e:
+            # A. Key Pair Auth (The "Senior" Way), B. Standard Auth (Password/ExternalBrowser)
+            auth = "Key Pair" if "private_key_path" in config else "Standard"
+            st.error(f"{auth} Login failed: {e}")
+            return None
+
     st.error("No active session and no secrets found.")
-    return None
\ No newline at end of file
+    return None
+
+
+#open/idle counts of the local pool (SiS sessions are not pooled, they're owned by Snowflake)
+def get_session_stats():
+    return _manager.stats()
@@ -0,0 +1,67 @@
+"""
+Bounded look at a source object's data for the view/dynamic table editors, without leaving the app.
+The rows come through Snowpark's Arrow batches (to_pandas_batches), so the panel fills batch by batch and stops
+at a row and a byte cap: a wide or huge source never lands in memory whole.
+The transformed preview runs the editor grid's select list (the same SQL the view/DT would deploy) over the
+same bounded rows: the expressions are checked on real data, never on a full table scan.
+"""
+
+
+DEFAULT_ROWS = 100
+MAX_ROWS = 1000
+MAX_BYTES = 8 * 1024 * 1024 #per preview, a few wide VARIANT columns reach this long before MAX_ROWS
+PREVIEW_TTL = 300 #seconds, the data changes more often than the metadata but nobody needs a live feed here
+PREVIEW_CACHE_ENTRIES = 32 #whole DataFrames, kept out of the metadata cache on purpose
+
+
+def sample_sql(source_object, rows, sample=False):
+    #LIMIT stops after the first micro-partitions, SAMPLE (n ROWS) is random but can read the whole table
+    if sample:
+        return f"SELECT * FROM {source_object} SAMPLE ({int(rows)} ROWS)"
+    return f"SELECT * FROM {source_object} LIMIT {int(rows)}"
+
+
+def preview_select_sql(columns):
+    #The model's select list (ColumnSpec.select_sql), every column aliased to its new name: 'ID::NUMBER' would be named 'ID::NUMBER'
+    items = []
+    for column in columns:
+        sql = column.select_sql()
+        items.append(sql if sql.endswith(f" AS {column.name}") else f"{sql} AS {column.name}")
+    return ",\n\t".join(items)
+
+
+def transformed_sql(source_object, columns, rows, sample=False):
+    #With LIMIT both previews usually show the same rows, with SAMPLE each query draws its own
+    return f"SELECT\n\t{preview_select_sql(columns)}\nFROM ({sample_sql(source_object, rows, sample)})"
+
+
+def stream_frames(dataframe, max_rows=MAX_ROWS, max_bytes=MAX_BYTES):
+    """
+    Reads a Snowpark DataFrame batch by batch, yields (frame so far, capped) after every batch.
+    Stops at max_rows rows or max_bytes of pandas memory, capped=True when the byte cap cut the rows short.
+    The last frame yielded is the complete preview.
+    """
+    import pandas as pd #lazy: the data provider imports this module, the startup path shouldn't pay for pandas
+
+    batches = dataframe.to_pandas_batches()
+    frames, rows, size = [], 0, 0
+    frame = None
+    try:
+        for batch in batches:
+            batch = batch.iloc[:max_rows - rows]
+            frames.append(batch)
+            rows += len(batch)
+            size += int(batch.memory_usage(deep=True).sum())
+            frame = pd.concat(frames, ignore_index=True) if len(frames) > 1 else batch.reset_index(drop=True)
+            capped = size >= max_bytes and rows < max_rows
+            yield frame, capped
+            if rows >= max_rows or size >= max_bytes:
+                break
+    finally:
+        close = getattr(batches, "close", None)
+        if close is not None:
+            close() #stop fetching the result batches nobody will read
+
+    if frame is None:
+        #Empty source: still one (column-less) frame, so the panel can say so
+        yield pd.DataFrame(), False
@@ -0,0 +1,187 @@
+"""
+Headless DDL compiler: a directory of object specs (YAML/JSON, see utils/ddl_builder.py::build_object) -> .sql files.
+No Streamlit, no Snowflake: the source columns come from MockDataProvider or a saved catalog snapshot.
+
+Run from the repo root:
+    python -m utils.spec_compiler specs/ --out build/ [--catalog catalog.json] [--jobs 8]
+    python -m utils.spec_compiler --dump-catalog catalog.json     (needs the [snowflake] secrets, saves the snapshot for offline runs)
+
+The output follows the Git layout (snowflake_objects/schema/type/name.sql), so CI can diff it against the repo.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.ddl_builder import build_object, object_file_path, object_type_of
+
+
+SPEC_EXTENSIONS = (".json", ".yml", ".yaml")
+
+#Set once per worker process by _init_worker, every spec of that worker shares it
+_worker_provider = None
+
+
+def find_specs(paths):
+    #Spec files under the given files/directories, sorted so the output order is stable
+    found = []
+    for path in paths:
+        if os.path.isfile(path):
+            found.append(path)
+            continue
+        for root, _, files in os.walk(path):
+            found += [os.path.join(root, name) for name in files if name.lower().endswith(SPEC_EXTENSIONS)]
+    return sorted(found)
+
+
+def load_spec(path):
+    #One object per file, or a list of objects
+    with open(path, encoding="utf-8") as f:
+        if path.lower().endswith(".json"):
+            data = json.load(f)
+        else:
+            try:
+                import yaml
+            except ImportError:
+                raise RuntimeError("YAML specs need PyYAML (pip install pyyaml)")
+            data = yaml.safe_load(f)
+    return data if isinstance(data, list) else [data]
+
+
+def make_provider(catalog_path=None):
+    from utils.data_provider import MockDataProvider, CatalogDataProvider
+    if catalog_path:
+        return CatalogDataProvider.from_file(catalog_path)
+    return MockDataProvider()
+
+
+def compile_spec_file(path, provider):
+    """
+    Returns one result per object in the file: {'spec', 'schema', 'name', 'type', 'path', 'ddl', 'error'}
+    A broken object doesn't stop the others.
+    """
+    try:
+        specs = load_spec(path)
+    except Exception as e:
+        return [_result(path, {}, error=f"Can't read spec: {e}")]
+
+    results = []
+    for spec in specs:
+        try:
+            obj = build_object(spec, provider)
+            object_type = object_type_of(spec["type"])
+            results.append(_result(path, spec, object_type, object_file_path(obj.schema, object_type, obj.name), obj.create_ddl().strip()))
+        except Exception as e:
+            results.append(_result(path, spec, error=f"{type(e).__name__}: {e}"))
+    return results
+
+
+def _result(path, spec, object_type=None, file_path=None, ddl=None, error=None):
+    return {
+        "spec": path, "schema": spec.get("schema"), "name": spec.get("name"), "type": object_type,
+        "path": file_path, "ddl": ddl, "error": error,
+    }
+
+
+def _init_worker(catalog_path):
+    global _worker_provider
+    _worker_provider = make_provider(catalog_path)
+
+
+def _compile_in_worker(path):
+    return compile_spec_file(path, _worker_provider)
+
+
+def compile_specs(paths, catalog_path=None, jobs=None):
+    """
+    Yields the results file by file as they are compiled (in spec order), so the caller can write them right away.
+    jobs=1 compiles in this process, otherwise a process pool (the work is pure Python, threads wouldn't run in parallel).
+    """
+    spec_paths = find_specs(paths)
+    jobs = jobs or os.cpu_count() or 1
+
+    if jobs == 1 or len(spec_paths) < 2:
+        provider = make_provider(catalog_path)
+        for path in spec_paths:
+            yield from compile_spec_file(path, provider)
+        return
+
+    chunksize = max(1, len(spec_paths) // (jobs * 8))
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(catalog_path,)) as pool:
+        for results in pool.map(_compile_in_worker, spec_paths, chunksize=chunksize):
+            yield from results
+
+
+def write_result(result, out_dir):
+    #Returns True if the file was written, an unchanged file is left alone (keeps mtimes, make/CI caches stay valid)
+    target = os.path.join(out_dir, result["path"])
+    content = result["ddl"] + "\n"
+    if os.path.exists(target):
+        with open(target, encoding="utf-8") as f:
+            if f.read() == content:
+                return False
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with open(target, "w", encoding="utf-8") as f:
+        f.write(content)
+    return True
+
+
+def dump_catalog(path):
+    #Snapshot of the current database through the usual [snowflake] secrets, for offline compiles
+    from utils.snowflake_connector import get_session
+    from utils.catalog import CatalogSnapshot
+
+    session = get_session()
+    if session is None:
+        raise RuntimeError("No Snowflake connection")
+    snapshot = CatalogSnapshot(session.get_current_database().strip('"'))
+    snapshot.load(session)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(snapshot.to_dict(), f)
+    return snapshot.stats()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile object specs (YAML/JSON) into DDL files")
+    parser.add_argument("specs", nargs="*", help="spec files or directories")
+    parser.add_argument("--out", default="build", help="output root (default: build)")
+    parser.add_argument("--catalog", help="catalog snapshot JSON for the source columns (default: MockDataProvider)")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--dump-catalog", metavar="PATH", help="save a catalog snapshot of the current database and exit")
+    parser.add_argument("--json", help="write the per-object report to this file")
+    args = parser.parse_args(argv)
+
+    if args.dump_catalog:
+        print(json.dumps(dump_catalog(args.dump_catalog)))
+        return 0
+    if not args.specs:
+        parser.error("no spec files or directories given")
+
+    started = time.perf_counter()
+    report = []
+    written = unchanged = failed = 0
+    for result in compile_specs(args.specs, catalog_path=args.catalog, jobs=args.jobs):
+        if result["error"]:
+            failed += 1
+            print(f"ERROR {result['spec']} {result['schema']}.{result['name']}: {result['error']}", file=sys.stderr)
+        elif write_result(result, args.out):
+            written += 1
+        else:
+            unchanged += 1
+        report.append({key: value for key, value in result.items() if key != "ddl"})
+
+    summary = {
+        "objects": len(report), "written": written, "unchanged": unchanged, "failed": failed,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+    print(json.dumps(summary))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"summary": summary, "objects": report}, f, indent=2)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+import sys
+import time
+from contextlib import contextmanager
+
+
+#Cold start budget (seconds) from the first script run to the first fully rendered page
+COLD_START_BUDGET = 3.0
+
+#This module is imported first by streamlit_app.py, so this is ~ the start of the first script run in the process
+_PROCESS_START = time.perf_counter()
+
+_imports = {} #module name -> seconds it took to import it the first time
+_marks = {} #label -> seconds since _PROCESS_START (first occurrence only, e.g. 'first paint')
+_last_rerun = {"started": None, "duration": None}
+
+
+@contextmanager
+def track_import(module_name):
+    #Wrap an import statement with this, records how long the first (real) import took
+    #If the module is already in sys.modules the import is free, nothing to record
+    already_loaded = module_name in sys.modules
+    started = time.perf_counter()
+    yield
+    if not already_loaded and module_name not in _imports:
+        _imports[module_name] = time.perf_counter() - started
+
+
+def mark(label):
+    #Only the first occurrence counts, reruns of the script shouldn't overwrite the cold start numbers
+    if label not in _marks:
+        _marks[label] = time.perf_counter() - _PROCESS_START
+
+
+def start_rerun():
+    _last_rerun["started"] = time.perf_counter()
+
+
+def end_rerun():
+    if _last_rerun["started"] is not None:
+        _last_rerun["duration"] = time.perf_counter() - _last_rerun["started"]
+
+
+def report():
+    first_paint = _marks.get("first paint")
+    return {
+        "imports": sorted(
+            ({"module": name, "seconds": round(seconds, 4)} for name, seconds in _imports.items()),
+            key=lambda item: item["seconds"],
+            reverse=True,
+        ),
+        "marks": {label: round(seconds, 4) for label, seconds in _marks.items()},
+        "last_rerun_seconds": round(_last_rerun["duration"], 4) if _last_rerun["duration"] is not None else None,
+        "budget_seconds": COLD_START_BUDGET,
+        "over_budget": first_paint is not None and first_paint > COLD_START_BUDGET,
+    }
@@ -0,0 +1,168 @@
+from utils.ddl_parser import identifier_key
+from utils.change_detection import normalize_type
+
+
+#Suffix of the work table of a rebuild, it only exists while the migration runs
+REBUILD_SUFFIX = "__IGLOO_MIGRATION"
+
+
+class MigrationPlan:
+    """
+    Statements that turn the deployed object into the edited one.
+    mode: 'none' (nothing changed), 'alter' (in place, metadata only), 'rebuild' (tables: copy into a work table + swap,
+    rewrites the data) or 'replace' (dynamic tables, models/dynamic_table.py: the query changed, the CREATE OR REPLACE
+    itself is what runs and statements stays empty)
+    reasons: why a rebuild/replace was needed, warnings: things that may fail or get lost at deploy time
+    """
+
+    def __init__(self, schema_name, table_name):
+        self.schema_name = schema_name
+        self.table_name = table_name
+        self.mode = "none"
+        self.statements = []
+        self.reasons = []
+        self.warnings = []
+
+    def sql(self):
+        return "".join(f"{statement};\n" for statement in self.statements)
+
+    def __repr__(self):
+        return f"MigrationPlan({self.schema_name}.{self.table_name}, {self.mode}, {len(self.statements)} statements)"
+
+
+def plan_table_migration(schema_name, table_name, current_columns, desired_columns):
+    """
+    current_columns: get_columns() rows, (name, type, nullable 'Y'/'N')
+    desired_columns: the edited grid, dicts {'source': current name or None for a new column, 'name', 'type', 'nullable': bool}
+    Returns a MigrationPlan: ALTER TABLE statements when every change can be done in place, a copy + swap rebuild otherwise.
+    """
+    plan = MigrationPlan(schema_name, table_name)
+    table = f"{schema_name}.{table_name}"
+
+    names = [identifier_key(column["name"]) for column in desired_columns]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate column names: {', '.join(duplicates)}")
+
+    current = {identifier_key(name): (name, data_type, nullable != "N") for name, data_type, nullable in current_columns}
+    kept = {identifier_key(column["source"]) for column in desired_columns if column["source"] and identifier_key(column["source"]) in current}
+
+    drops = [name for key, (name, _, _) in current.items() if key not in kept]
+    renames = []
+    alters = []
+    adds = []
+
+    for column in desired_columns:
+        source_key = identifier_key(column["source"]) if column["source"] else None
+        if source_key not in current:
+            adds.append(column)
+            if not column["nullable"]:
+                plan.warnings.append(f"{column['name']} is added as NOT NULL, this fails if the table has rows.")
+            continue
+
+        old_name, old_type, old_nullable = current[source_key]
+        if identifier_key(column["name"]) != source_key:
+            renames.append((old_name, column["name"]))
+
+        old_normalized, new_normalized = normalize_type(old_type), normalize_type(column["type"])
+        if old_normalized != new_normalized:
+            if _can_alter_type(old_normalized, new_normalized):
+                alters.append(f"ALTER TABLE {table} ALTER COLUMN {column['name']} SET DATA TYPE {column['type']}")
+            else:
+                plan.reasons.append(f"{old_name}: {old_type} -> {column['type']} can't be changed in place")
+
+        if old_nullable != column["nullable"]:
+            action = "DROP NOT NULL" if column["nullable"] else "SET NOT NULL"
+            alters.append(f"ALTER TABLE {table} ALTER COLUMN {column['name']} {action}")
+
+    #ALTER can't reorder: kept columns stay where they are, new ones are appended at the end
+    kept_order = [identifier_key(column["source"]) for column in desired_columns if column not in adds]
+    first_new = next((k for k, column in enumerate(desired_columns) if column in adds), len(desired_columns))
+    if kept_order != [key for key in current if key in kept] or first_new < len(kept_order):
+        plan.reasons.append("Column order changed")
+
+    #A rename onto a name that is still in use (A -> B while B is kept) needs a temporary name, rebuild instead
+    for old_name, new_name in renames:
+        if identifier_key(new_name) in kept:
+            plan.reasons.append(f"{old_name} -> {new_name}: the new name is still in use")
+
+    if plan.reasons:
+        _plan_rebuild(plan, table, current, desired_columns)
+        return plan
+
+    plan.statements += [f"ALTER TABLE {table} DROP COLUMN {name}" for name in drops]
+    plan.statements += [f"ALTER TABLE {table} RENAME COLUMN {old} TO {new}" for old, new in renames]
+    plan.statements += alters
+    plan.statements += [f"ALTER TABLE {table} ADD COLUMN {_column_definition(column)}" for column in adds]
+    if plan.statements:
+        plan.mode = "alter"
+    return plan
+
+
+def _can_alter_type(old_type, new_type):
+    #What ALTER COLUMN ... SET DATA TYPE accepts: a longer VARCHAR, a higher NUMBER precision with the same scale
+    old_base, old_params = _split_type(old_type)
+    new_base, new_params = _split_type(new_type)
+    if old_base != new_base or len(old_params) != len(new_params):
+        return False
+    if old_base == "VARCHAR":
+        return int(new_params[0]) >= int(old_params[0])
+    if old_base == "NUMBER":
+        return int(new_params[0]) >= int(old_params[0]) and new_params[1] == old_params[1]
+    return False
+
+
+def _split_type(normalized_type):
+    #'NUMBER ( 38 , 0 )' -> ('NUMBER', ['38', '0'])
+    base, _, params = normalized_type.partition("(")
+    return base.strip(), [param.strip() for param in params.rstrip(") ").split(",") if param.strip()]
+
+
+def _column_definition(column):
+    definition = f"{column['name']} {column['type']}"
+    if not column["nullable"]:
+        definition += " NOT NULL"
+    return definition
+
+
+def _plan_rebuild(plan, table, current, desired_columns):
+    """
+    CTAS into a work table, SWAP it with the original, drop the old data (now under the work name).
+    The table keeps its name and grants: the clone only carries the grants over (CREATE TABLE ... CLONE ... COPY GRANTS),
+    the CTAS replaces it and COPY GRANTS copies them from the table it replaces, the SWAP moves them with the new data.
+    One EXECUTE IMMEDIATE block: a failure at any step drops the work table, the original is only touched by the SWAP.
+    """
+    work_table = f"{table}{REBUILD_SUFFIX}"
+
+    select_items = []
+    for column in desired_columns:
+        source_key = identifier_key(column["source"]) if column["source"] else None
+        if source_key not in current:
+            select_items.append(f"CAST(NULL AS {column['type']})")
+            continue
+        old_name, old_type, _ = current[source_key]
+        if normalize_type(old_type) != normalize_type(column["type"]):
+            select_items.append(f"CAST({old_name} AS {column['type']})")
+        else:
+            select_items.append(old_name)
+
+    definitions = ",\n\t\t".join(_column_definition(column) for column in desired_columns)
+    select_list = ",\n\t\t".join(select_items)
+
+    plan.mode = "rebuild"
+    plan.statements = [
+        "EXECUTE IMMEDIATE $$\nBEGIN\n"
+        f"\tCREATE OR REPLACE TABLE {work_table} CLONE {table} COPY GRANTS;\n"
+        f"\tCREATE OR REPLACE TABLE {work_table} (\n\t\t{definitions}\n\t) COPY GRANTS AS SELECT\n"
+        f"\t\t{select_list}\n\tFROM {table};\n"
+        f"\tALTER TABLE {table} SWAP WITH {work_table};\n"
+        f"\tDROP TABLE {work_table};\n"
+        "EXCEPTION\n"
+        f"\tWHEN OTHER THEN\n\t\tDROP TABLE IF EXISTS {work_table};\n\t\tRAISE;\n"
+        "END;\n$$",
+    ]
+    plan.warnings.append("Rebuild: every row is rewritten, clustering keys are not carried over.")
+    plan.warnings.append(
+        "Time Travel history stays with the old data: the rebuilt table starts a new history, the old one is dropped "
+        f"as {work_table} (restorable with UNDROP within the retention period)."
+    )